@@ -14,8 +14,13 @@
 
 import json
 import logging
+import functools
+import multiprocessing.util
 import os
 import sys
+import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 from yaml import Dumper, dump
 from argparse import Namespace
@@ -23,15 +28,21 @@ from typing import List
 from data_validation import (
     cli_tools,
     clients,
+    combiner,
     consts,
     exceptions,
+    metadata_cache,
     state_manager,
     util,
 )
+from data_validation.run_manifest import RunManifest
+from data_validation.work_queue import WorkQueue
 from data_validation.config_manager import ConfigManager
 from data_validation.data_validation import DataValidation
 from data_validation.find_tables import find_tables_using_string_matching
 from data_validation.partition_builder import PartitionBuilder
+from data_validation.result_handlers import bigquery as bigquery_result_handler
+from data_validation.result_handlers import parquet as parquet_result_handler
 
 # by default yaml dumps lists as pointers. This disables that feature
 Dumper.ignore_aliases = lambda *args: True
@@ -360,6 +371,71 @@ def build_config_managers_from_args(
 
 
 def config_runner(args):
+    """Run validations from one or more config files, see _config_runner for details.
+
+    Clients opened from the process wide client registry are disposed, and
+    shared resources released, once all config files have been run.
+    """
+    try:
+        with _releasing_shared_resources():
+            _config_runner(args)
+    finally:
+        clients.dispose_shared_data_clients()
+
+
+def _release_shared_resources(raise_errors: bool = True):
+    """Release the resources shared by all validations of a command.
+
+    Results buffered by BigQuery result handlers are written by a load job and
+    the files of shared Parquet result handlers are closed, then the processes
+    combining results are stopped. Errors are logged, and the first one raised
+    only when raise_errors is set.
+    """
+    errors = []
+    releases = [
+        (
+            "writing buffered BigQuery results",
+            bigquery_result_handler.flush_buffered_handlers,
+        ),
+        ("closing Parquet results", parquet_result_handler.close_shared_handlers),
+        ("stopping the combiner processes", combiner.shutdown_process_pool),
+    ]
+    for description, release in releases:
+        try:
+            release()
+        except Exception as e:
+            errors.append(e)
+            logging.error("Error '%s' occurred while %s.", str(e), description)
+    if errors and raise_errors:
+        raise errors[0]
+
+
+@contextmanager
+def _releasing_shared_resources():
+    """Release the shared resources once the enclosed command ends.
+
+    When the command raised, release errors are only logged so that they do not
+    mask the exception of the command.
+    """
+    try:
+        yield
+    except BaseException:
+        _release_shared_resources(raise_errors=False)
+        raise
+    _release_shared_resources()
+
+
+def _init_worker_process():
+    """Release the shared resources of a worker process when the process exits."""
+    multiprocessing.util.Finalize(
+        None,
+        _release_shared_resources,
+        kwargs={"raise_errors": False},
+        exitpriority=10,
+    )
+
+
+def _config_runner(args):
     """Config Runner is where the decision is made to run validations from one or more files.
     One file can produce multiple validations - for example when more than one set of tables are being validated
     between the source and target. If multiple files are to be run and if the associated configuration files
@@ -371,17 +447,19 @@ def config_runner(args):
     variable. This environment variable is set by the Kubernetes/Cloud Run container orchestrator.
     The orchestrator spins up containers to complete each validation, one at a time.
     """
-    if args.config_dir:
-        if args.kube_completions and (
-            ("JOB_COMPLETION_INDEX" in os.environ.keys())
-            or ("CLOUD_RUN_TASK_INDEX" in os.environ.keys())
-        ):
-            # Running in Kubernetes in Job completions - only run the yaml file corresponding to index
-            job_index = (
-                int(os.environ.get("JOB_COMPLETION_INDEX"))
-                if "JOB_COMPLETION_INDEX" in os.environ.keys()
-                else int(os.environ.get("CLOUD_RUN_TASK_INDEX"))
+    if args.config_dir and getattr(args, "work_queue", None):
+        if args.kube_completions:
+            raise ValueError("--work-queue can not be combined with --kube-completions")
+        if run_config_files_from_work_queue(args):
+            raise exceptions.ValidationException(
+                "Some of the validations raised an exception"
             )
+    elif args.config_dir:
+        if args.kube_completions and getattr(args, "shard", None):
+            raise ValueError("--shard can not be combined with --kube-completions")
+        if args.kube_completions and util.get_job_index() is not None:
+            # Running in Kubernetes in Job completions - only run the yaml file corresponding to index
+            job_index = util.get_job_index()
             config_file_path = (
                 f"{args.config_dir}{job_index:04d}.yaml"
                 if args.config_dir.endswith("/")
@@ -397,23 +475,42 @@ def config_runner(args):
                     "--kube-completions or -kc specified, however not running in Kubernetes Job completion, check your command line."
                 )
             config_file_names = cli_tools.list_validations(config_dir=args.config_dir)
-            config_managers = []
-            errors = False
-            for file in config_file_names:
-                config_managers = build_config_managers_from_yaml(args, file)
-                try:
-                    logging.info(
-                        "Currently running the validation for YAML file: %s",
-                        file,
-                    )
-                    run_validations(args, config_managers)
-                except Exception as e:
-                    errors = True
-                    logging.error(
-                        "Error '%s' occurred while running config file %s. Skipping it for now.",
-                        str(e),
-                        file,
-                    )
+            manifest = RunManifest(
+                args.config_dir,
+                resume=getattr(args, "resume", False),
+                run_args=_get_run_manifest_args(args),
+            )
+            config_file_names = manifest.pending(config_file_names)
+            processes = getattr(args, "processes", None) or 1
+            if processes > 1 and len(config_file_names) > 1:
+                errors = run_config_files_in_processes(
+                    args,
+                    config_file_names,
+                    min(processes, len(config_file_names)),
+                    manifest,
+                )
+            else:
+                config_managers = []
+                errors = False
+                for file in config_file_names:
+                    config_managers = build_config_managers_from_yaml(args, file)
+                    t0 = time.time()
+                    error = None
+                    try:
+                        logging.info(
+                            "Currently running the validation for YAML file: %s",
+                            file,
+                        )
+                        run_validations(args, config_managers)
+                    except Exception as e:
+                        errors = True
+                        error = e
+                        logging.error(
+                            "Error '%s' occurred while running config file %s. Skipping it for now.",
+                            str(e),
+                            file,
+                        )
+                    manifest.record(file, elapsed=time.time() - t0, error=error)
             if errors:
                 raise exceptions.ValidationException(
                     "Some of the validations raised an exception"
@@ -428,8 +525,116 @@ def config_runner(args):
         run_validations(args, config_managers)
 
 
+def _get_run_manifest_args(args) -> dict:
+    """Return the arguments telling runs of a config directory apart, when set."""
+    shard = getattr(args, "shard", None)
+    if shard and "/" not in shard:
+        # The index of a shard given by its count is the index of the job task.
+        shard = f"{util.get_job_index()}/{shard}"
+    run_args = {"shard": shard, "dry_run": getattr(args, "dry_run", False)}
+    return {name: value for name, value in run_args.items() if value}
+
+
+def _run_config_file_in_worker(args, config_file_path: str):
+    """Build and run the validations of a single YAML file inside a worker process.
+
+    Data clients are taken from the process wide client registry, so each worker
+    process keeps its connections open for all of the files it runs. Shared
+    resources are released when the worker process exits.
+
+    Returns:
+        The seconds taken to run the validations.
+    """
+    logging.info(
+        "Currently running the validation for YAML file: %s",
+        config_file_path,
+    )
+    t0 = time.time()
+    config_managers = build_config_managers_from_yaml(args, config_file_path)
+    run_validations(args, config_managers)
+    return time.time() - t0
+
+
+def run_config_files_in_processes(
+    args, config_file_names: list, processes: int, manifest: RunManifest = None
+):
+    """Run the YAML files of a config directory on a pool of worker processes.
+
+    Each worker process keeps its data clients open for all files it picks up.
+    Per file status is logged as files complete, exceptions are logged and the file
+    skipped in the same way as the serial directory runner. The status of each
+    file is recorded in the run manifest, if any, by this process only.
+
+    Returns:
+        True if any of the files raised an exception.
+    """
+    errors = False
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=_init_worker_process
+    ) as executor:
+        futures = {
+            executor.submit(_run_config_file_in_worker, args, file): file
+            for file in config_file_names
+        }
+        for future in as_completed(futures):
+            file = futures[future]
+            elapsed, error = None, None
+            try:
+                elapsed = future.result()
+                logging.info("Completed the validation for YAML file: %s", file)
+            except Exception as e:
+                errors = True
+                error = e
+                logging.error(
+                    "Error '%s' occurred while running config file %s. Skipping it for now.",
+                    str(e),
+                    file,
+                )
+            if manifest:
+                manifest.record(file, elapsed=elapsed, error=error)
+    return errors
+
+
+def _run_work_queue_worker(args, config_file_names: list) -> bool:
+    """Run the YAML files claimed from the work queue of a config directory."""
+    work_queue = WorkQueue(args.config_dir, args.work_queue, args.lease_seconds)
+    return work_queue.run(
+        config_file_names, functools.partial(_run_config_file_in_worker, args)
+    )
+
+
+def run_config_files_from_work_queue(args) -> bool:
+    """Run the YAML files of a config directory as one of many work queue workers.
+
+    Each worker claims the next file not claimed by another worker, so workers
+    which get short files run more of them. With --processes, each worker
+    process claims files from the queue on its own.
+
+    Returns:
+        True if any of the files run by these workers raised an exception.
+    """
+    config_file_names = sorted(cli_tools.list_validations(config_dir=args.config_dir))
+    processes = getattr(args, "processes", None) or 1
+    if processes == 1:
+        return _run_work_queue_worker(args, config_file_names)
+
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=_init_worker_process
+    ) as executor:
+        futures = [
+            executor.submit(_run_work_queue_worker, args, config_file_names)
+            for _ in range(processes)
+        ]
+        return any([future.result() for future in futures])
+
+
 def build_config_managers_from_yaml(args, config_file_path):
-    """Returns List[ConfigManager] instances ready to be executed."""
+    """Returns List[ConfigManager] instances ready to be executed.
+
+    Data clients are taken from the process wide client registry, so a connection
+    used by many YAML files is only opened once per process. The references are
+    returned by ConfigManager.close_client_connections().
+    """
     if args.config_dir:
         yaml_configs = cli_tools.get_validation(config_file_path, args.config_dir)
     else:
@@ -439,14 +644,15 @@ def build_config_managers_from_yaml(args, config_file_path):
     source_conn = mgr.get_connection_config(yaml_configs[consts.YAML_SOURCE])
     target_conn = mgr.get_connection_config(yaml_configs[consts.YAML_TARGET])
 
-    source_client = clients.get_data_client(source_conn)
-    target_client = clients.get_data_client(target_conn)
-
     config_managers = []
     for config in yaml_configs[consts.YAML_VALIDATIONS]:
+        source_client = clients.get_shared_data_client(source_conn)
+        target_client = clients.get_shared_data_client(target_conn)
         config[consts.CONFIG_SOURCE_CONN] = source_conn
         config[consts.CONFIG_TARGET_CONN] = target_conn
         config[consts.CONFIG_RESULT_HANDLER] = yaml_configs[consts.YAML_RESULT_HANDLER]
+        if getattr(args, "shard", None):
+            config[consts.CONFIG_SHARD] = args.shard
         config_manager = ConfigManager(
             config, source_client, target_client, verbose=args.verbose
         )
@@ -509,33 +715,45 @@ def convert_config_to_json(config_managers: list) -> dict:
     return json_config
 
 
-def run_validation(config_manager: ConfigManager, dry_run=False, verbose=False):
-    """Run a single validation.
+def _get_data_validation(
+    config_manager: ConfigManager, verbose=False, thread_safe_only=False
+):
+    """Return a DataValidation object for a single validation.
+
+    The clients of the config manager are reused and stay owned by it, they are
+    released by ConfigManager.close_client_connections().
 
     Args:
         config_manager (ConfigManager): Validation config manager instance.
-        dry_run (bool): Print source and target SQL to stdout in lieu of validation.
         verbose (bool): Validation setting to log queries run.
+        thread_safe_only (bool): Only reuse clients which can be shared between
+            threads, the DataValidation opens and closes its own other clients.
     """
-    # Only use cached connection for SQLAlchemy backends that manage reconnects for us.
-    source_client = (
-        config_manager.source_client
-        if clients.is_sqlalchemy_backend(config_manager.source_client)
+    source_client, target_client = (
+        client
+        if not thread_safe_only or clients.is_thread_safe_client(client)
         else None
+        for client in (config_manager.source_client, config_manager.target_client)
     )
-    target_client = (
-        config_manager.target_client
-        if clients.is_sqlalchemy_backend(config_manager.target_client)
-        else None
-    )
-    with DataValidation(
+    return DataValidation(
         config_manager.config,
         validation_builder=None,
         result_handler=None,
         verbose=verbose,
         source_client=source_client,
         target_client=target_client,
-    ) as validator:
+    )
+
+
+def run_validation(config_manager: ConfigManager, dry_run=False, verbose=False):
+    """Run a single validation.
+
+    Args:
+        config_manager (ConfigManager): Validation config manager instance.
+        dry_run (bool): Print source and target SQL to stdout in lieu of validation.
+        verbose (bool): Validation setting to log queries run.
+    """
+    with _get_data_validation(config_manager, verbose=verbose) as validator:
 
         if dry_run:
             sql_alchemy_clients = [
@@ -575,15 +793,78 @@ def run_validation(config_manager: ConfigManager, dry_run=False, verbose=False):
             validator.execute()
 
 
+def _validate_without_result_handler(config_manager: ConfigManager, verbose=False):
+    """Run a single validation and return the validator and its report DataFrame.
+
+    The result handler is not invoked so that the caller can write results in
+    order, then store the watermark of the validator.
+    """
+    with _get_data_validation(
+        config_manager, verbose=verbose, thread_safe_only=True
+    ) as validator:
+        return validator, validator.validate()
+
+
+def run_validations_in_parallel(args, config_managers, parallelism: int):
+    """Run a series of validations on a bounded pool of worker threads.
+
+    Source and target queries for each validation are executed concurrently by the
+    workers. SQLAlchemy and BigQuery clients are shared between workers, they are
+    thread safe. Result handlers are only invoked from the calling thread,
+    in the same order as config_managers, so the output matches a serial run.
+
+    Args:
+        config_managers (list[ConfigManager]): List of config manager instances.
+        parallelism (int): Maximum number of validations to run at the same time.
+    """
+    errors = False
+    with ThreadPoolExecutor(max_workers=parallelism) as executor:
+        futures = [
+            executor.submit(
+                _validate_without_result_handler,
+                config_manager,
+                verbose=args.verbose,
+            )
+            for config_manager in config_managers
+        ]
+        for config_manager, future in zip(config_managers, futures):
+            try:
+                validator, result_df = future.result()
+                validator.result_handler.execute(result_df)
+                validator.save_watermark()
+            except Exception as e:
+                errors = True
+                logging.error(
+                    "Error '%s' occurred while running validation of table %s.",
+                    str(e),
+                    config_manager.full_source_table,
+                )
+    if errors:
+        raise exceptions.ValidationException(
+            "Some of the validations raised an exception"
+        )
+
+
 def run_validations(args, config_managers):
     """Run and manage a series of validations.
 
     Args:
         config_managers (list[ConfigManager]): List of config manager instances.
     """
-    # TODO(issue/31): Add parallel execution logic
-    for config_manager in config_managers:
-        run_validation(config_manager, dry_run=args.dry_run, verbose=args.verbose)
+    parallelism = getattr(args, "parallelism", None) or 1
+    try:
+        if parallelism > 1 and len(config_managers) > 1 and not args.dry_run:
+            run_validations_in_parallel(
+                args, config_managers, min(parallelism, len(config_managers))
+            )
+        else:
+            for config_manager in config_managers:
+                run_validation(
+                    config_manager, dry_run=args.dry_run, verbose=args.verbose
+                )
+    finally:
+        for config_manager in config_managers:
+            config_manager.close_client_connections()
 
 
 def store_yaml_config_file(args, config_managers):
@@ -644,7 +925,8 @@ def run(args) -> None:
     elif args.config_file_json:
         store_json_config_file(args, config_managers)
     else:
-        run_validations(args, config_managers)
+        with _releasing_shared_resources():
+            run_validations(args, config_managers)
 
 
 def run_connections(args):
@@ -683,6 +965,23 @@ def validate(args):
         raise ValueError(f"Validation Argument '{args.validate_cmd}' is not supported")
 
 
+def profile_startup(limit: int = 25):
+    """Print the import time of the modules which are slowest to import, to stderr.
+
+    Backends are only imported when a connection of their source type is used,
+    so their import time is not included.
+    """
+    import_times = util.get_import_times("data_validation.__main__")
+    total = import_times[0][2] if import_times else 0
+    print(
+        f"Imported {len(import_times)} modules in {total:.3f}s, slowest first:",
+        file=sys.stderr,
+    )
+    print(f"{'self [s]':>10} {'cumulative [s]':>15}  module", file=sys.stderr)
+    for name, self_time, cumulative_time in import_times[:limit]:
+        print(f"{self_time:>10.3f} {cumulative_time:>15.3f}  {name}", file=sys.stderr)
+
+
 def main():
     # Create Parser and Get Deployment Info
     args = cli_tools.get_parsed_args()
@@ -691,6 +990,12 @@ def main():
         format="%(asctime)s-%(levelname)s: %(message)s",
         datefmt="%m/%d/%Y %I:%M:%S %p",
     )
+    if getattr(args, "metadata_cache_ttl", None):
+        metadata_cache.set_ttl(args.metadata_cache_ttl)
+    if getattr(args, "combine_processes", None):
+        combiner.set_processes(args.combine_processes)
+    if getattr(args, "profile_startup", False):
+        profile_startup()
     if args.command == "connections":
         run_connections(args)
     elif args.command == "configs":
@@ -136,7 +136,7 @@ CONNECTION_SOURCE_FIELDS = {
     ],
     "FileSystem": [
         ["table_name", "Table name to use as reference for file data"],
-        ["file_path", "The local, s3, or GCS file path to the data"],
+        ["file_path", "The local, s3, or GCS file path, glob or directory of the data"],
         ["file_type", "The file type of the file. 'csv', 'orc', 'parquet' or 'json'"],
     ],
     "Impala": [
@@ -239,6 +239,23 @@ def configure_arg_parser():
         choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
         help="Log Level to be assigned. This will print logs with level same or above",
     )
+    parser.add_argument(
+        "--metadata-cache-ttl",
+        "-mct",
+        type=_check_positive,
+        help="Store catalog listings, table schemas and primary keys and reuse them for this many seconds",
+    )
+    parser.add_argument(
+        "--combine-processes",
+        "-cp",
+        type=_check_positive,
+        help="Compare large in-memory results in up to this many worker processes",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report the modules which take the longest to import when DVT starts",
+    )
 
     subparsers = parser.add_subparsers(dest="command")
     _configure_validate_parser(subparsers)
@@ -273,6 +290,15 @@ def _configure_partition_parser(subparsers):
         default=1,
         help="Number of partitions to be validated in a single yaml file.",
     )
+    optional_arguments.add_argument(
+        "--partition-sample-size",
+        "-pss",
+        type=_check_positive,
+        help=(
+            "Estimate partition boundaries from a random sample of this many "
+            "primary keys instead of numbering every source row."
+        ),
+    )
 
     required_arguments.add_argument(
         "--config-dir",
@@ -424,6 +450,50 @@ def _configure_validation_config_parser(subparsers):
         action="store_true",
         help="When validating multiple table partitions generated by generate-table-partitions, using DVT in Kubernetes in index completion mode use this flag so that all the validations are completed",
     )
+    run_parser.add_argument(
+        "--parallelism",
+        "-par",
+        type=_check_positive,
+        default=1,
+        help="Number of validations within a config file to run concurrently (default 1).",
+    )
+    run_parser.add_argument(
+        "--processes",
+        "-proc",
+        type=_check_positive,
+        default=1,
+        help="Number of worker processes used to run the config files in --config-dir (default 1).",
+    )
+    run_parser.add_argument(
+        "--resume",
+        "-rs",
+        action="store_true",
+        help=(
+            "Only run the YAML files of --config-dir which did not succeed in "
+            "the previous run of the directory, as recorded in its run manifest."
+        ),
+    )
+    run_parser.add_argument(
+        "--work-queue",
+        "-wq",
+        help=(
+            "Name of a run in which workers claim the YAML files of --config-dir "
+            "through lease files in the directory, until all files are done. "
+            "Workers of the same run share the files."
+        ),
+    )
+    run_parser.add_argument(
+        "--lease-seconds",
+        "-ls",
+        type=_check_positive,
+        default=consts.DEFAULT_LEASE_SECONDS,
+        help=(
+            "Seconds a --work-queue lease lasts without being renewed, before "
+            "the file is claimed by another worker "
+            f"(default {consts.DEFAULT_LEASE_SECONDS})."
+        ),
+    )
+    _add_shard_argument(run_parser)
 
     get_parser = configs_subparsers.add_parser(
         "get", help="Get and print a validation config"
@@ -494,6 +564,14 @@ def _configure_validate_parser(subparsers):
         help="Prints source and target SQL to stdout in lieu of performing a validation.",
     )
 
+    validate_parser.add_argument(
+        "--parallelism",
+        "-par",
+        type=_check_positive,
+        default=1,
+        help="Number of table validations to run concurrently (default 1).",
+    )
+
     validate_subparsers = validate_parser.add_subparsers(dest="validate_cmd")
 
     column_parser = validate_subparsers.add_parser(
@@ -595,6 +673,56 @@ def _configure_row_parser(
             "-rbs",
             help="Row batch size used for random row filters (default 10,000).",
         )
+        optional_arguments.add_argument(
+            "--page-size",
+            "-ps",
+            type=_check_positive,
+            help=(
+                "Stream the validation in pages of this many rows, read in primary "
+                "key order, instead of reading whole tables into memory."
+            ),
+        )
+        optional_arguments.add_argument(
+            "--spill-memory-mb",
+            "-smb",
+            type=_check_positive,
+            help=(
+                "Spill source and target rows to local disk, partitioned by primary "
+                "key, and compare them a partition at a time using about this many "
+                "MB of memory."
+            ),
+        )
+        optional_arguments.add_argument(
+            "--hash-buckets",
+            "-hb",
+            type=int,
+            choices=[16, 256, 4096],
+            help=(
+                "Compare row hashes per bucket of primary key hashes, splitting "
+                "each mismatched bucket into this many buckets until the "
+                "differing rows are small enough to fetch. Requires --hash."
+            ),
+        )
+        optional_arguments.add_argument(
+            "--presence-first",
+            "-pf",
+            action="store_true",
+            help=(
+                "Compare primary keys first and read rows missing from either "
+                "side by key, before comparing the other rows."
+            ),
+        )
+        _add_shard_argument(optional_arguments)
+        optional_arguments.add_argument(
+            "--max-concurrent-queries",
+            "-mcq",
+            type=_check_positive,
+            help=(
+                "The max number of queries run at the same time on each "
+                "connection, by all validations sharing it (default 4)."
+            ),
+        )
+        _add_watermark_arguments(optional_arguments)
         # Generate table partitions follows a new argument spec where either the table names or queries can be provided, but not both.
         # that is specified in configure_partition_parser. If we use the same spec for row and column validation, the custom query commands
         # may get subsumed by validate and validate commands by specifying tables name or queries. Until this -tbls will be
@@ -726,6 +854,7 @@ def _configure_column_parser(column_parser):
         action="store_true",
         help="Cast any int32 fields to int64 for large aggregations.",
     )
+    _add_watermark_arguments(optional_arguments)
 
     # Group required arguments
     required_arguments = column_parser.add_argument_group("required arguments")
@@ -978,6 +1107,24 @@ def _add_common_arguments(
         "-sa",
         help="Path to SA key file for result handler output",
     )
+    optional_arguments.add_argument(
+        "--parquet-result-handler",
+        "-pqrh",
+        help="Local directory of a partitioned Parquet dataset for result handler output",
+    )
+    optional_arguments.add_argument(
+        "--parquet-partition-by",
+        "-pqpb",
+        choices=consts.PARTITION_BY_CHOICES,
+        default=consts.PARTITION_BY_DATE,
+        help="Partition Parquet results by run date or run id, and then by source table",
+    )
+    optional_arguments.add_argument(
+        "--bq-load-job-rows",
+        "-bqlr",
+        type=_check_positive,
+        help="Buffer BigQuery results and write them with Parquet load jobs of up to this many rows",
+    )
     if not is_generate_partitions:
         optional_arguments.add_argument(
             "--config-file",
@@ -1011,6 +1158,53 @@ def _add_common_arguments(
     )
 
 
+def _add_watermark_arguments(optional_arguments):
+    optional_arguments.add_argument(
+        "--watermark-column",
+        "-wc",
+        help=(
+            "Validate incrementally, only rows with a value in this column beyond the "
+            "watermark stored by the last successful validation are validated."
+        ),
+    )
+    optional_arguments.add_argument(
+        "--watermark-overlap",
+        "-wo",
+        type=_check_positive,
+        help=(
+            "Start incremental validations this far before the stored watermark, in "
+            "seconds for date and timestamp columns."
+        ),
+    )
+
+
+def _add_shard_argument(parser):
+    parser.add_argument(
+        "--shard",
+        "-sh",
+        type=_check_shard,
+        help=(
+            "Only validate one of COUNT shards of rows, by a hash of the primary "
+            "key, as INDEX/COUNT, e.g. 3/100. With only COUNT the index is read "
+            "from JOB_COMPLETION_INDEX or CLOUD_RUN_TASK_INDEX."
+        ),
+    )
+
+
+def _check_shard(value: str) -> str:
+    index, _, count = value.rpartition("/")
+    try:
+        count = int(count)
+        index = int(index) if index else 0
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "%s is an invalid shard, expected INDEX/COUNT or COUNT" % value
+        )
+    if count <= 0 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError("%s is an invalid shard" % value)
+    return value
+
+
 def _check_positive(value: int) -> int:
     ivalue = int(value)
     if ivalue <= 0:
@@ -1186,11 +1380,12 @@ def get_filters(filter_value: str) -> List[Dict]:
     return filter_config
 
 
-def get_result_handler(rc_value: str, sa_file=None) -> dict:
+def get_result_handler(rc_value: str, sa_file=None, load_job_rows=None) -> dict:
     """Returns dict of result handler config. Backwards compatible for JSON input.
 
     rc_value (str): Result config argument specified.
     sa_file (str): SA path argument specified.
+    load_job_rows (int): Rows buffered before results are written by a load job.
     """
     config = rc_value.split(".", 1)
     if len(config) != 2:
@@ -1218,10 +1413,25 @@ def get_result_handler(rc_value: str, sa_file=None) -> dict:
 
     if sa_file:
         result_handler[consts.GOOGLE_SERVICE_ACCOUNT_KEY_PATH] = sa_file
+    if load_job_rows:
+        result_handler[consts.LOAD_JOB_ROWS] = load_job_rows
 
     return result_handler
 
 
+def get_parquet_result_handler(directory: str, partition_by: str = None) -> dict:
+    """Returns dict of Parquet result handler config.
+
+    directory (str): Local directory of the Parquet dataset.
+    partition_by (str): Partition results by "date" or "run_id".
+    """
+    return {
+        "type": "Parquet",
+        consts.RESULT_HANDLER_DIRECTORY: directory,
+        consts.RESULT_HANDLER_PARTITION_BY: partition_by or consts.PARTITION_BY_DATE,
+    }
+
+
 def get_arg_list(arg_value, default_value=None):
     """Returns list of values from argument provided. Backwards compatible for JSON input.
 
@@ -1432,9 +1642,20 @@ def get_pre_build_configs(args: Namespace, validate_cmd: str) -> List[Dict]:
         raise ValueError(f"Unknown Validation Type: {validate_cmd}")
 
     # Get result handler config
+    if args.bq_result_handler and getattr(args, "parquet_result_handler", None):
+        raise ValueError(
+            "Only one of --bq-result-handler and --parquet-result-handler can be used"
+        )
     if args.bq_result_handler:
         result_handler_config = get_result_handler(
-            args.bq_result_handler, args.service_account
+            args.bq_result_handler,
+            args.service_account,
+            getattr(args, "bq_load_job_rows", None),
+        )
+    elif getattr(args, "parquet_result_handler", None):
+        result_handler_config = get_parquet_result_handler(
+            args.parquet_result_handler,
+            getattr(args, "parquet_partition_by", None),
         )
     else:
         result_handler_config = None
@@ -1502,6 +1723,24 @@ def get_pre_build_configs(args: Namespace, validate_cmd: str) -> List[Dict]:
             consts.CONFIG_FORMAT: format,
             consts.CONFIG_USE_RANDOM_ROWS: use_random_rows,
             consts.CONFIG_RANDOM_ROW_BATCH_SIZE: random_row_batch_size,
+            consts.CONFIG_PAGE_SIZE: getattr(args, consts.CONFIG_PAGE_SIZE, None),
+            consts.CONFIG_SPILL_MEMORY_MB: getattr(
+                args, consts.CONFIG_SPILL_MEMORY_MB, None
+            ),
+            consts.CONFIG_HASH_BUCKETS: getattr(args, consts.CONFIG_HASH_BUCKETS, None),
+            consts.CONFIG_PRESENCE_FIRST: getattr(
+                args, consts.CONFIG_PRESENCE_FIRST, None
+            ),
+            consts.CONFIG_SHARD: getattr(args, consts.CONFIG_SHARD, None),
+            consts.CONFIG_WATERMARK_COLUMN: getattr(
+                args, consts.CONFIG_WATERMARK_COLUMN, None
+            ),
+            consts.CONFIG_MAX_CONCURRENT_QUERIES: getattr(
+                args, consts.CONFIG_MAX_CONCURRENT_QUERIES, None
+            ),
+            consts.CONFIG_WATERMARK_OVERLAP: getattr(
+                args, consts.CONFIG_WATERMARK_OVERLAP, None
+            ),
             "source_client": source_client,
             "target_client": target_client,
             "result_handler_config": result_handler_config,
@@ -14,26 +14,29 @@
 
 
 import copy
+import glob
+import hashlib
+import importlib
+import itertools
+import json
 import logging
+import operator
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 import warnings
 
-import google.oauth2.service_account
-from google.cloud import bigquery
-from google.api_core import client_options
 import ibis
 import pandas
 
-from data_validation import client_info, consts, exceptions
+from data_validation import client_info, consts, exceptions, metadata_cache
 from data_validation.secret_manager import SecretManagerBuilder
-from third_party.ibis.ibis_cloud_spanner.api import spanner_connect
-from third_party.ibis.ibis_impala.api import impala_connect
-from third_party.ibis.ibis_mssql.api import mssql_connect
-from third_party.ibis.ibis_redshift.api import redshift_connect
 
 if TYPE_CHECKING:
+    import fsspec
     import ibis.expr.schema as sch
     import ibis.expr.types as ir
+    import pyarrow.dataset
 
 
 ibis.options.sql.default_limit = None
@@ -55,45 +58,73 @@ IBIS_ALCHEMY_BACKENDS = [
     "snowflake",
 ]
 
+# Maximum number of schemas whose tables are listed at the same time.
+LIST_TABLES_MAX_WORKERS = 8
 
-def _raise_missing_client_error(msg):
-    def get_client_call(*args, **kwargs):
-        raise Exception(msg)
+# Backends whose list_tables() ignores the schema and lists the tables of all schemas.
+_SCHEMALESS_LIST_TABLES_BACKENDS = ["db2", "mssql", "redshift", "snowflake"]
+
+
+def _lazy_connect(module_name: str, function_name: str, missing_msg: str = None):
+    """Return a connect function which imports its backend when first called.
+
+    Backends are only imported for the source types which are used, rather than
+    all at once when this module is imported. When a backend requiring optional
+    drivers cannot be imported, calling the function raises missing_msg.
+    """
+
+    def connect(*args, **kwargs):
+        try:
+            module = importlib.import_module(module_name)
+        except Exception:
+            if missing_msg is None:
+                raise
+            raise Exception(missing_msg)
+        return operator.attrgetter(function_name)(module)(*args, **kwargs)
+
+    return connect
 
-    return get_client_call
 
+impala_connect = _lazy_connect("third_party.ibis.ibis_impala.api", "impala_connect")
+mssql_connect = _lazy_connect("third_party.ibis.ibis_mssql.api", "mssql_connect")
+redshift_connect = _lazy_connect(
+    "third_party.ibis.ibis_redshift.api", "redshift_connect"
+)
+spanner_connect = _lazy_connect(
+    "third_party.ibis.ibis_cloud_spanner.api", "spanner_connect"
+)
 
 # Teradata requires teradatasql and licensing
-try:
-    from third_party.ibis.ibis_teradata.api import teradata_connect
-except Exception:
-    msg = "pip install teradatasql (requires Teradata licensing)"
-    teradata_connect = _raise_missing_client_error(msg)
+teradata_connect = _lazy_connect(
+    "third_party.ibis.ibis_teradata.api",
+    "teradata_connect",
+    "pip install teradatasql (requires Teradata licensing)",
+)
 
 # Oracle requires cx_Oracle driver
-try:
-    from third_party.ibis.ibis_oracle.api import oracle_connect
-except Exception:
-    oracle_connect = _raise_missing_client_error("pip install cx_Oracle")
+oracle_connect = _lazy_connect(
+    "third_party.ibis.ibis_oracle.api", "oracle_connect", "pip install cx_Oracle"
+)
 
 # Snowflake requires snowflake-connector-python and snowflake-sqlalchemy
-try:
-    from third_party.ibis.ibis_snowflake.api import snowflake_connect
-except Exception:
-    snowflake_connect = _raise_missing_client_error(
-        "pip install snowflake-connector-python && pip install snowflake-sqlalchemy"
-    )
+snowflake_connect = _lazy_connect(
+    "third_party.ibis.ibis_snowflake.api",
+    "snowflake_connect",
+    "pip install snowflake-connector-python && pip install snowflake-sqlalchemy",
+)
 
 # DB2 requires ibm_db_sa
-try:
-    from third_party.ibis.ibis_db2.api import db2_connect
-except Exception:
-    db2_connect = _raise_missing_client_error("pip install ibm_db_sa")
+db2_connect = _lazy_connect(
+    "third_party.ibis.ibis_db2.api", "db2_connect", "pip install ibm_db_sa"
+)
 
 
 def get_google_bigquery_client(
     project_id: str, credentials=None, api_endpoint: str = None
 ):
+    from google.api_core import client_options
+    from google.cloud import bigquery
+
     info = client_info.get_http_client_info()
     job_config = bigquery.QueryJobConfig(
         connection_properties=[bigquery.ConnectionProperty("time_zone", "UTC")]
@@ -132,24 +163,73 @@ def get_bigquery_client(
 def get_pandas_client(table_name, file_path, file_type):
     """Return pandas client and env with file loaded into DataFrame
 
+    ORC and Parquet files, and globs or directories of files of any type, are
+    opened as a pyarrow dataset and only read when an expression is executed, see
+    third_party.ibis.ibis_filesystem.
+
     table_name (str): Table name to use as reference for file data
-    file_path (str): The local, s3, or GCS file path to the data
+    file_path (str): The local, s3, or GCS file path, glob or directory of the data
     file_type (str): The file type of the file (csv, json, orc or parquet)
     """
-    if file_type == "csv":
-        df = pandas.read_csv(file_path)
-    elif file_type == "json":
-        df = pandas.read_json(file_path)
-    elif file_type == "orc":
-        df = pandas.read_orc(file_path)
-    elif file_type == "parquet":
-        df = pandas.read_parquet(file_path)
-    else:
+    if file_type not in ("csv", "json", "orc", "parquet"):
         raise ValueError(f"Unknown Pandas File Type: {file_type}")
 
-    pandas_client = ibis.pandas.connect({table_name: df})
+    import fsspec
 
-    return pandas_client
+    from third_party.ibis.ibis_filesystem.api import filesystem_connect
+
+    filesystem, path = fsspec.core.url_to_fs(file_path)
+    if (
+        file_type in ("orc", "parquet")
+        or glob.has_magic(path)
+        or filesystem.isdir(path)
+    ):
+        data = get_file_dataset(filesystem, path, file_type)
+    elif file_type == "csv":
+        data = pandas.read_csv(file_path)
+    else:
+        data = pandas.read_json(file_path)
+
+    return filesystem_connect({table_name: data})
+
+
+def get_file_dataset(
+    filesystem: "fsspec.AbstractFileSystem", path: str, file_type: str
+) -> "pyarrow.dataset.Dataset":
+    """Return a pyarrow dataset of a file, glob or directory of files, no data is read.
+
+    Directories are searched recursively and Hive style directory names below
+    the directory or glob, for example dt=2024-01-31/, are exposed as partition
+    columns. A single file has no partition columns, whatever its path. JSON
+    files of a dataset must hold one JSON object per line.
+    """
+    import pyarrow.dataset
+
+    source, base_dir, partitioning = path, None, "hive"
+    if glob.has_magic(path):
+        source = sorted(
+            name
+            for name, info in filesystem.glob(path, detail=True).items()
+            if info["type"] == "file"
+        )
+        if not source:
+            raise ValueError(f"No files match: {path}")
+        # Partitions are only parsed from the directories below the glob.
+        base_dir = "/".join(
+            itertools.takewhile(lambda p: not glob.has_magic(p), path.split("/"))
+        )
+    elif filesystem.isdir(path):
+        # Partitions are only parsed from the directories below path.
+        base_dir = path
+    else:
+        partitioning = None
+    return pyarrow.dataset.dataset(
+        source,
+        format=file_type,
+        filesystem=filesystem,
+        partitioning=partitioning,
+        partition_base_dir=base_dir,
+    )
 
 
 def is_sqlalchemy_backend(client):
@@ -159,6 +239,11 @@ def is_sqlalchemy_backend(client):
         return False
 
 
+def is_thread_safe_client(client):
+    """Return True if the client can run queries from many threads at the same time."""
+    return is_sqlalchemy_backend(client) or getattr(client, "name", None) == "bigquery"
+
+
 def is_oracle_client(client):
     try:
         return client.name == "oracle"
@@ -175,18 +260,24 @@ def get_ibis_table(client, schema_name, table_name, database_name=None):
     table_name (str): Table name of table object
     database_name (str): Database name (generally default is used)
     """
-    if client.name in [
-        "oracle",
-        "postgres",
-        "db2",
-        "mssql",
-        "redshift",
-    ]:
-        return client.table(table_name, database=database_name, schema=schema_name)
-    elif client.name == "pandas":
-        return client.table(table_name, schema=schema_name)
-    else:
-        return client.table(table_name, database=schema_name)
+
+    def load_table():
+        if client.name in [
+            "oracle",
+            "postgres",
+            "db2",
+            "mssql",
+            "redshift",
+        ]:
+            return client.table(table_name, database=database_name, schema=schema_name)
+        elif client.name == "pandas":
+            return client.table(table_name, schema=schema_name)
+        else:
+            return client.table(table_name, database=schema_name)
+
+    return metadata_cache.get_table(
+        client, schema_name, table_name, load_table, database_name=database_name
+    )
 
 
 def get_ibis_query(client, query) -> "ir.Table":
@@ -206,10 +297,24 @@ def get_ibis_table_schema(client, schema_name: str, table_name: str) -> "sch.Sch
     table_name (str): Table name of table object
     database_name (str): Database name (generally default is used)
     """
-    if is_sqlalchemy_backend(client):
-        return client.table(table_name, schema=schema_name).schema()
-    else:
-        return client.get_schema(table_name, schema_name)
+
+    def load_schema():
+        if is_sqlalchemy_backend(client):
+            return client.table(table_name, schema=schema_name).schema()
+        else:
+            return client.get_schema(table_name, schema_name)
+
+    return metadata_cache.get_table_schema(client, schema_name, table_name, load_schema)
+
+
+def list_primary_key_columns(client, schema_name: str, table_name: str) -> list:
+    """Return the primary key columns of a table, or [] if it has none."""
+    return metadata_cache.get_primary_keys(
+        client,
+        schema_name,
+        table_name,
+        lambda: client.list_primary_key_columns(schema_name, table_name),
+    )
 
 
 def get_ibis_query_schema(client, query_str) -> "sch.Schema":
@@ -224,39 +329,65 @@ def get_ibis_query_schema(client, query_str) -> "sch.Schema":
 
 def list_schemas(client):
     """Return a list of schemas in the DB."""
-    if hasattr(client, "list_databases"):
-        try:
-            return client.list_databases()
-        except NotImplementedError:
+
+    def load_schemas():
+        if hasattr(client, "list_databases"):
+            try:
+                return client.list_databases()
+            except NotImplementedError:
+                return [None]
+        else:
             return [None]
-    else:
-        return [None]
+
+    return metadata_cache.get_schema_names(client, load_schemas)
 
 
 def list_tables(client, schema_name):
     """Return a list of tables in the DB schema."""
-    if client.name in ["db2", "mssql", "redshift", "snowflake"]:
-        return client.list_tables()
-    return client.list_tables(database=schema_name)
+
+    if client.name in _SCHEMALESS_LIST_TABLES_BACKENDS:
+        # The same tables are returned for every schema, so they are listed once.
+        return metadata_cache.get_table_names(client, None, client.list_tables)
+    return metadata_cache.get_table_names(
+        client, schema_name, lambda: client.list_tables(database=schema_name)
+    )
 
 
 def get_all_tables(client, allowed_schemas=None):
     """Return a list of tuples with database and table names.
 
+    Tables of each schema are listed concurrently for thread safe clients.
+
     client (IbisClient): Client to use for tables
     allowed_schemas (List[str]): List of schemas to pull.
     """
-    table_objs = []
-    schemas = list_schemas(client)
-    for schema_name in schemas:
-        if allowed_schemas and schema_name not in allowed_schemas:
-            continue
+    schemas = [
+        schema_name
+        for schema_name in list_schemas(client)
+        if not allowed_schemas or schema_name in allowed_schemas
+    ]
+
+    def list_schema_tables(schema_name):
         try:
-            tables = list_tables(client, schema_name)
+            return list_tables(client, schema_name)
         except Exception as e:
             logging.warning(f"List Tables Error: {schema_name} -> {e}")
-            continue
+            return []
+
+    if (
+        len(schemas) > 1
+        and is_thread_safe_client(client)
+        and client.name not in _SCHEMALESS_LIST_TABLES_BACKENDS
+    ):
+        with ThreadPoolExecutor(
+            max_workers=min(len(schemas), LIST_TABLES_MAX_WORKERS)
+        ) as executor:
+            schema_tables = list(executor.map(list_schema_tables, schemas))
+    else:
+        schema_tables = [list_schema_tables(schema_name) for schema_name in schemas]
 
+    table_objs = []
+    for schema_name, tables in zip(schemas, schema_tables):
         for table_name in tables:
             table_objs.append((schema_name, table_name))
 
@@ -288,6 +419,8 @@ def get_data_client(connection_config):
             consts.GOOGLE_SERVICE_ACCOUNT_KEY_PATH
         )
         if key_path:
+            import google.oauth2.service_account
+
             decrypted_connection_config[
                 "credentials"
             ] = google.oauth2.service_account.Credentials.from_service_account_file(
@@ -303,6 +436,7 @@ def get_data_client(connection_config):
     try:
         data_client = CLIENT_LOOKUP[source_type](**decrypted_connection_config)
         data_client._source_type = source_type
+        data_client._connection_key = _connection_config_key(connection_config)
     except Exception as e:
         msg = 'Connection Type "{source_type}" could not connect: {error}'.format(
             source_type=source_type, error=str(e)
@@ -312,6 +446,96 @@ def get_data_client(connection_config):
     return data_client
 
 
+def _connection_config_key(connection_config: dict) -> str:
+    """Return a stable hash of a connection config for use as a registry key."""
+    return hashlib.sha256(
+        json.dumps(connection_config, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def get_shared_data_client(connection_config):
+    """Return a DataClient from the process wide client registry.
+
+    The first request for a connection config builds the client, later requests for
+    an identical config return the same client. Each call takes a reference which
+    should be returned with release_shared_data_client(), usually via
+    ConfigManager.close_client_connections().
+    """
+    client_key = _connection_config_key(connection_config)
+    with _CLIENT_REGISTRY_LOCK:
+        if client_key in _CLIENT_REGISTRY:
+            _CLIENT_REGISTRY[client_key][1] += 1
+            return _CLIENT_REGISTRY[client_key][0]
+
+    # Connect without holding the lock so other connections are not held up.
+    data_client = get_data_client(connection_config)
+    data_client._registry_key = client_key
+    with _CLIENT_REGISTRY_LOCK:
+        entry = _CLIENT_REGISTRY.setdefault(client_key, [data_client, 0])
+        entry[1] += 1
+    if entry[0] is not data_client:
+        # Another thread connected first, use its client.
+        dispose_data_client(data_client)
+    return entry[0]
+
+
+def is_shared_data_client(client) -> bool:
+    """Return True if the client is managed by the process wide client registry."""
+    return bool(getattr(client, "_registry_key", None))
+
+
+def release_shared_data_client(client):
+    """Return a reference taken by get_shared_data_client().
+
+    The client stays in the registry, even when no references remain, so that it can
+    be reused by later validations. Use dispose_shared_data_clients() to close it.
+    """
+    with _CLIENT_REGISTRY_LOCK:
+        entry = _CLIENT_REGISTRY.get(getattr(client, "_registry_key", None))
+        if entry and entry[1] > 0:
+            entry[1] -= 1
+
+
+def get_query_slots(client, max_concurrent_queries: int) -> threading.BoundedSemaphore:
+    """Return the semaphore capping the number of queries run at the same time on a client.
+
+    The semaphore is shared by all validations using the client, e.g. validations
+    run in parallel on a shared client, and is sized by the first of them.
+    """
+    with _QUERY_SLOTS_LOCK:
+        query_slots = getattr(client, "_query_slots", None)
+        if query_slots is None:
+            query_slots = threading.BoundedSemaphore(max_concurrent_queries)
+            client._query_slots = query_slots
+        return query_slots
+
+
+def dispose_data_client(client):
+    """Attempt to clean up connections held by a client, based on the client type.
+
+    Not all clients are covered here, we at least have Oracle and PostgreSQL for which we
+    have seen connections being accumulated.
+    https://github.com/GoogleCloudPlatform/professional-services-data-validator/issues/1195
+    """
+    if client and client.name in ("oracle", "postgres"):
+        client.con.dispose()
+
+
+def dispose_shared_data_clients():
+    """Dispose of and forget all registry clients which have no references left."""
+    with _CLIENT_REGISTRY_LOCK:
+        idle_clients = [
+            _CLIENT_REGISTRY.pop(client_key)[0]
+            for client_key, (_, ref_count) in list(_CLIENT_REGISTRY.items())
+            if ref_count == 0
+        ]
+    for data_client in idle_clients:
+        try:
+            dispose_data_client(data_client)
+        except Exception as exc:
+            logging.warning("Exception closing connections: %s", str(exc))
+
+
 def get_max_column_length(client):
     """Return the max column length supported by client.
 
@@ -344,13 +568,18 @@ def get_max_in_list_size(client, in_list_over_expressions=False):
         return None
 
 
+# Process wide registry of data clients: {connection config hash: [client, reference count]}
+_CLIENT_REGISTRY = {}
+_CLIENT_REGISTRY_LOCK = threading.Lock()
+_QUERY_SLOTS_LOCK = threading.Lock()
+
 CLIENT_LOOKUP = {
     "BigQuery": get_bigquery_client,
     "Impala": impala_connect,
-    "MySQL": ibis.mysql.connect,
+    "MySQL": _lazy_connect("ibis", "mysql.connect"),
     "Oracle": oracle_connect,
     "FileSystem": get_pandas_client,
-    "Postgres": ibis.postgres.connect,
+    "Postgres": _lazy_connect("ibis", "postgres.connect"),
     "Redshift": redshift_connect,
     "Teradata": teradata_connect,
     "MSSQL": mssql_connect,
@@ -18,18 +18,63 @@ To avoid data precision loss, a BigQuery data type as closely matching the
 original data type is used.
 """
 
+import atexit
+import concurrent.futures
 import datetime
 import functools
 import json
 import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+
 import ibis
 import ibis.expr.datatypes as dt
+import ibis.expr.schema as sch
+import numpy
+import pandas
+import pyarrow
+import pyarrow.ipc
+from ibis.backends.pandas import BasePandasBackend as PandasBackend
 
-from data_validation import consts
+from data_validation import consts, spill
 
 DEFAULT_SOURCE = "source"
 DEFAULT_TARGET = "target"
 
+# Column names used while aligning source and target rows in memory.
+_ROW_KEY = "__dvt_row_key__"
+_SOURCE_ROW = "__dvt_source_row__"
+_TARGET_ROW = "__dvt_target_row__"
+
+# Results with fewer rows than this are combined in the calling process.
+PARALLEL_MIN_ROWS = 200_000
+
+# Worker processes combining hash shards of large results, see set_processes().
+_PROCESSES = 1
+_PROCESS_POOL = None
+_PROCESS_POOL_LOCK = threading.Lock()
+
+_REPORT_COLUMNS = (
+    "validation_name",
+    "validation_type",
+    "aggregation_type",
+    "source_table_name",
+    "source_column_name",
+    "source_agg_value",
+    "target_table_name",
+    "target_column_name",
+    "target_agg_value",
+    "group_by_columns",
+    "primary_keys",
+    "num_random_rows",
+    "difference",
+    "pct_difference",
+    "pct_threshold",
+    "validation_status",
+)
+
 
 def generate_report(
     client,
@@ -39,6 +84,7 @@ def generate_report(
     join_on_fields=(),
     is_value_comparison=False,
     verbose=False,
+    filter_status=None,
 ):
     """Combine results into a report.
 
@@ -55,6 +101,8 @@ def generate_report(
         is_value_comparison (boolean): Boolean representing if source and
             target agg values should be compared with 'equals to' rather than
             a 'difference' comparison.
+        filter_status (Sequence[str]): When set, only rows with one of these
+            validation statuses are built into the report.
 
     Returns:
         pandas.DataFrame:
@@ -71,6 +119,140 @@ def generate_report(
             "Expected source and target to have same schema, got "
             f"source: {source_names} target: {target_names}"
         )
+    if isinstance(client, PandasBackend):
+        # Results are already in memory, so skip the ibis-pandas plans.
+        return generate_report_from_dataframes(
+            run_metadata,
+            client.execute(source),
+            client.execute(target),
+            join_on_fields=join_on_fields,
+            is_value_comparison=is_value_comparison,
+            verbose=verbose,
+            filter_status=filter_status,
+        )
+    return _generate_report_ibis(
+        client,
+        run_metadata,
+        source,
+        target,
+        join_on_fields,
+        is_value_comparison,
+        verbose,
+        filter_status,
+    )
+
+
+def generate_report_from_dataframes(
+    run_metadata,
+    source_df,
+    target_df,
+    join_on_fields=(),
+    is_value_comparison=False,
+    verbose=False,
+    filter_status=None,
+):
+    """Combine in-memory results into a report.
+
+    Source and target rows are aligned with a single keyed merge and the
+    comparison is computed column by column on whole arrays, before the
+    results are stacked into the long report format.
+
+    Args:
+        run_metadata (data_validation.metadata.RunMetadata):
+            Metadata about the run and validations.
+        source_df (pandas.DataFrame): Results of the source query.
+        target_df (pandas.DataFrame): Results of the target query.
+        join_on_fields (Sequence[str]):
+            A collection of column names to use to join source and target.
+        is_value_comparison (boolean): Boolean representing if source and
+            target agg values should be compared with 'equals to' rather than
+            a 'difference' comparison.
+        filter_status (Sequence[str]): When set, only rows with one of these
+            validation statuses are built into the report.
+
+    Returns:
+        pandas.DataFrame:
+            A pandas DataFrame with the results of the validation in the same
+            schema as the report table.
+    """
+    join_on_fields = tuple(join_on_fields)
+
+    source_names = list(source_df.columns)
+    target_names = list(target_df.columns)
+    if source_names != target_names:
+        raise ValueError(
+            "Expected source and target to have same schema, got "
+            f"source: {source_names} target: {target_names}"
+        )
+
+    if not _can_combine_in_memory(
+        source_df, target_df, join_on_fields, run_metadata.validations
+    ):
+        # Duplicate join keys produce a cartesian report and validated join
+        # keys are only partially pivoted, keep the ibis semantics for those.
+        client = ibis.pandas.connect(
+            {DEFAULT_SOURCE: source_df, DEFAULT_TARGET: target_df}
+        )
+        return _generate_report_ibis(
+            client,
+            run_metadata,
+            client.table(DEFAULT_SOURCE),
+            client.table(DEFAULT_TARGET),
+            join_on_fields,
+            is_value_comparison,
+            verbose,
+            filter_status,
+        )
+
+    combined = None
+    if _PROCESSES > 1 and len(source_df) + len(target_df) >= PARALLEL_MIN_ROWS:
+        combined = _combine_dataframes_in_processes(
+            source_df,
+            target_df,
+            join_on_fields,
+            run_metadata.validations,
+            is_value_comparison,
+            filter_status,
+        )
+    if combined is None:
+        combined = _combine_dataframes(
+            source_df,
+            target_df,
+            join_on_fields,
+            run_metadata.validations,
+            is_value_comparison,
+            filter_status,
+        )
+    if verbose:
+        logging.debug("-- ** Combiner ** --")
+        logging.debug(
+            "Combined %s source rows and %s target rows into %s report rows",
+            len(source_df),
+            len(target_df),
+            len(combined),
+        )
+
+    run_metadata.end_time = datetime.datetime.now(datetime.timezone.utc)
+    combined["run_id"] = run_metadata.run_id
+    combined["labels"] = pandas.Series(
+        [run_metadata.labels] * len(combined), dtype=object
+    )
+    combined["start_time"] = run_metadata.start_time
+    combined["end_time"] = run_metadata.end_time
+    return _fill_report_defaults(combined, run_metadata)
+
+
+def _generate_report_ibis(
+    client,
+    run_metadata,
+    source,
+    target,
+    join_on_fields,
+    is_value_comparison,
+    verbose,
+    filter_status=None,
+):
+    """Combine results into a report by executing ibis expressions on client."""
     differences_pivot = _calculate_differences(
         source, target, join_on_fields, run_metadata.validations, is_value_comparison
     )
@@ -92,6 +274,12 @@ def generate_report(
     joined = _join_pivots(
         con.tables.source, con.tables.target, con.tables.differences, join_on_fields
     )
+    if filter_status is not None:
+        # Rows without a reported status are dropped before metadata is added.
+        status_filter = joined.validation_status.isin(filter_status)
+        if consts.VALIDATION_STATUS_FAIL in filter_status:
+            status_filter |= joined.validation_status.isnull()
+        joined = joined.filter(status_filter)
 
     documented = _add_metadata(joined, run_metadata)
 
@@ -100,6 +288,10 @@ def generate_report(
         logging.debug(documented.compile())
 
     result_df = client.execute(documented)
+    return _fill_report_defaults(result_df, run_metadata)
+
+
+def _fill_report_defaults(result_df, run_metadata):
     result_df.validation_status.fillna(consts.VALIDATION_STATUS_FAIL, inplace=True)
 
     # get the first validation metadata object to fill source and/or target empty table names
@@ -401,3 +593,482 @@ def _add_metadata(joined, run_metadata):
     ]
 
     return joined
+
+
+def _can_combine_in_memory(source_df, target_df, join_on_fields, validations):
+    """Return True if each join key identifies at most one row per side."""
+    if any(field in validations and field != "hash__all" for field in join_on_fields):
+        return False
+    if not join_on_fields:
+        return len(source_df) <= 1 and len(target_df) <= 1
+    return not (
+        source_df.duplicated(list(join_on_fields)).any()
+        or target_df.duplicated(list(join_on_fields)).any()
+    )
+
+
+def _combine_dataframes(
+    source_df,
+    target_df,
+    join_on_fields,
+    validations,
+    is_value_comparison,
+    filter_status=None,
+    source_schema=None,
+    target_schema=None,
+):
+    return pandas.concat(
+        _combine_dataframe_reports(
+            source_df,
+            target_df,
+            join_on_fields,
+            validations,
+            is_value_comparison,
+            filter_status,
+            source_schema,
+            target_schema,
+        ),
+        ignore_index=True,
+    )
+
+
+def _combine_dataframe_reports(
+    source_df,
+    target_df,
+    join_on_fields,
+    validations,
+    is_value_comparison,
+    filter_status=None,
+    source_schema=None,
+    target_schema=None,
+):
+    """Return the report of each validated column, in the order of the columns."""
+    source_df = source_df.reset_index(drop=True)
+    target_df = target_df.reset_index(drop=True)
+    if source_schema is None:
+        source_schema = sch.infer(source_df)
+    if target_schema is None:
+        target_schema = sch.infer(target_df)
+
+    # Merge only the keys and carry row positions, so values keep their
+    # original types until they are compared.
+    merge_on = list(join_on_fields) or [_ROW_KEY]
+    source_keys = _row_keys(source_df, join_on_fields, _SOURCE_ROW)
+    target_keys = _row_keys(target_df, join_on_fields, _TARGET_ROW)
+    keys = source_keys.merge(target_keys, how="outer", on=merge_on)
+    source_rows = keys[_SOURCE_ROW].fillna(-1).to_numpy(dtype=numpy.int64)
+    target_rows = keys[_TARGET_ROW].fillna(-1).to_numpy(dtype=numpy.int64)
+    in_source = source_rows >= 0
+    in_target = target_rows >= 0
+    in_both = numpy.flatnonzero(in_source & in_target)
+    num_rows = len(keys)
+
+    group_by_columns = None
+    filtered_rows = 0
+    reports = []
+    for field, field_type in source_schema.items():
+        if field not in validations:
+            continue
+        validation = validations[field]
+        target_type = target_schema.get(field, None)
+        difference, pct_difference, pct_threshold, validation_status = (
+            _reindex(values, in_both, num_rows)
+            for values in _compare_values(
+                source_df[field].take(source_rows[in_both]).reset_index(drop=True),
+                target_df[field].take(target_rows[in_both]).reset_index(drop=True),
+                field_type,
+                target_type,
+                validation,
+                is_value_comparison,
+            )
+        )
+
+        if filter_status is None:
+            rows = slice(None)
+            if group_by_columns is None:
+                group_by_columns = _get_group_by_columns(
+                    keys, join_on_fields, target_schema
+                )
+            field_group_by_columns = group_by_columns
+        else:
+            # Only rows with a reported status are stringified and documented,
+            # other rows are just counted.
+            rows = numpy.flatnonzero(
+                _status_in(validation_status, filter_status).to_numpy()
+            )
+            filtered_rows += num_rows - len(rows)
+            difference, pct_difference, pct_threshold, validation_status = (
+                values.take(rows).reset_index(drop=True)
+                for values in (
+                    difference,
+                    pct_difference,
+                    pct_threshold,
+                    validation_status,
+                )
+            )
+            field_group_by_columns = _get_group_by_columns(
+                keys.take(rows), join_on_fields, target_schema
+            )
+
+        if validation.primary_keys:
+            primary_keys = "{" + ", ".join(validation.primary_keys) + "}"
+        else:
+            primary_keys = None
+        reports.append(
+            pandas.DataFrame(
+                {
+                    "validation_name": field,
+                    "validation_type": validation.validation_type,
+                    "aggregation_type": validation.aggregation_type,
+                    "source_table_name": _where(
+                        in_source[rows],
+                        validation.get_table_name(consts.RESULT_TYPE_SOURCE),
+                    ),
+                    "source_column_name": _where(
+                        in_source[rows],
+                        validation.get_column_name(consts.RESULT_TYPE_SOURCE),
+                    ),
+                    "source_agg_value": _take_as_string(
+                        source_df[field], source_rows[rows], field_type
+                    ),
+                    "target_table_name": _where(
+                        in_target[rows],
+                        validation.get_table_name(consts.RESULT_TYPE_TARGET),
+                    ),
+                    "target_column_name": _where(
+                        in_target[rows],
+                        validation.get_column_name(consts.RESULT_TYPE_TARGET),
+                    ),
+                    "target_agg_value": _take_as_string(
+                        target_df[field], target_rows[rows], target_type
+                    ),
+                    "group_by_columns": field_group_by_columns,
+                    "primary_keys": _where(in_source[rows], primary_keys),
+                    "num_random_rows": _where(
+                        in_source[rows], validation.num_random_rows
+                    ),
+                    "difference": difference,
+                    "pct_difference": pct_difference,
+                    "pct_threshold": pct_threshold,
+                    "validation_status": validation_status,
+                },
+                columns=_REPORT_COLUMNS,
+            )
+        )
+    if filtered_rows:
+        logging.debug(
+            "Filtered out %s report rows without status %s",
+            filtered_rows,
+            filter_status,
+        )
+    return reports
+
+
+def set_processes(processes: int):
+    """Combine large in-memory results in up to this many worker processes."""
+    global _PROCESSES
+    _PROCESSES = processes
+
+
+def shutdown_process_pool():
+    """Stop the worker processes, if any were started."""
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is not None:
+            _PROCESS_POOL.shutdown()
+            _PROCESS_POOL = None
+
+
+# Commands stop the workers when they end, this also stops them otherwise.
+atexit.register(shutdown_process_pool)
+
+
+def _get_process_pool():
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is None:
+            # Workers are spawned rather than forked, as results may be
+            # combined while other threads hold locks, e.g. in --parallelism.
+            _PROCESS_POOL = concurrent.futures.ProcessPoolExecutor(
+                max_workers=_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _PROCESS_POOL
+
+
+def _combine_dataframes_in_processes(
+    source_df,
+    target_df,
+    join_on_fields,
+    validations,
+    is_value_comparison,
+    filter_status=None,
+):
+    """Combine hash shards of the results in worker processes.
+
+    Rows are sharded by a hash of their join keys, so matching rows are in the
+    same shard. Shards are passed to the workers as memory mapped Arrow IPC
+    files rather than pickled. Returns None if the results do not convert to
+    Arrow and back unchanged, or a worker dies, for the caller to combine them
+    in process.
+    """
+    source_table = _to_arrow(source_df)
+    target_table = _to_arrow(target_df)
+    if source_table is None or target_table is None:
+        logging.debug("Results do not convert to Arrow, combining in process")
+        return None
+
+    # Shards are compared with the types of the whole results, rather than the
+    # types inferred from the values of each shard.
+    schemas = (sch.infer(source_df), sch.infer(target_df))
+    shards = _PROCESSES
+    source_ids, target_ids = _shard_ids(source_df, target_df, join_on_fields, shards)
+    # Shared memory is used for the shard files where available.
+    shm_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    with tempfile.TemporaryDirectory(prefix="dvt-combine-", dir=shm_dir) as tmp:
+        futures = []
+        for shard in range(shards):
+            source_rows = numpy.flatnonzero(source_ids == shard)
+            target_rows = numpy.flatnonzero(target_ids == shard)
+            if not len(source_rows) and not len(target_rows):
+                continue
+            paths = []
+            for side, table, rows in (
+                (spill.SOURCE, source_table, source_rows),
+                (spill.TARGET, target_table, target_rows),
+            ):
+                path = os.path.join(tmp, f"{side}-{shard}.arrow")
+                with pyarrow.ipc.new_file(path, table.schema) as writer:
+                    writer.write_table(table.take(rows))
+                paths.append(path)
+            futures.append(
+                _get_process_pool().submit(
+                    _combine_shard,
+                    *paths,
+                    join_on_fields,
+                    validations,
+                    is_value_comparison,
+                    filter_status,
+                    schemas,
+                )
+            )
+        if not futures:
+            return None
+        try:
+            reports = [future.result() for future in futures]
+        except concurrent.futures.process.BrokenProcessPool as e:
+            logging.warning("Worker process failed, combining in process: %s", e)
+            shutdown_process_pool()
+            return None
+
+    # Keep the report rows of each validation together, as in one process.
+    return pandas.concat(
+        [report for field_reports in zip(*reports) for report in field_reports],
+        ignore_index=True,
+    )
+
+
+def _shard_ids(source_df, target_df, join_on_fields, shards):
+    """Return the shard of each source and target row, by a hash of its keys."""
+    keys = list(join_on_fields)
+    source_types = list(source_df[keys].dtypes)
+    if source_types != list(target_df[keys].dtypes) or any(
+        dtype == object for dtype in source_types
+    ):
+        # Equal keys of different types, e.g. 1 and Decimal("1"), must be in
+        # the same shard, so keys are normalized before hashing.
+        return tuple(
+            spill.partition_ids(df, keys, shards) for df in (source_df, target_df)
+        )
+
+    def shard_ids(df):
+        # Adding 0.0 turns -0.0 into 0.0, which are equal when joined.
+        key_values = df[keys].apply(
+            lambda values: values + 0.0
+            if pandas.api.types.is_float_dtype(values)
+            else values
+        )
+        hashes = pandas.util.hash_pandas_object(key_values, index=False).to_numpy()
+        return (hashes % numpy.uint64(shards)).astype(numpy.int64)
+
+    return shard_ids(source_df), shard_ids(target_df)
+
+
+def _to_arrow(df):
+    """Return df as an Arrow table, or None if it would not read back as is."""
+    try:
+        table = pyarrow.Table.from_pandas(df, preserve_index=False)
+    except (pyarrow.ArrowException, TypeError, ValueError):
+        return None
+    # For example, integers with None in an object column would be read back
+    # as floats.
+    read_back_types = table.schema.empty_table().to_pandas().dtypes
+    if list(read_back_types) != list(df.dtypes):
+        return None
+    return table
+
+
+def _combine_shard(
+    source_path,
+    target_path,
+    join_on_fields,
+    validations,
+    is_value_comparison,
+    filter_status,
+    schemas,
+):
+    """Return the reports of one shard of the results, run in a worker process."""
+    source_df, target_df = (
+        pyarrow.ipc.open_file(pyarrow.memory_map(path)).read_all().to_pandas()
+        for path in (source_path, target_path)
+    )
+    return _combine_dataframe_reports(
+        source_df,
+        target_df,
+        join_on_fields,
+        validations,
+        is_value_comparison,
+        filter_status,
+        *schemas,
+    )
+
+
+def _status_in(validation_status, filter_status):
+    """Return a mask of statuses in filter_status, a missing status is a failure."""
+    mask = validation_status.isin(filter_status)
+    if consts.VALIDATION_STATUS_FAIL in filter_status:
+        mask |= validation_status.isna()
+    return mask
+
+
+def _get_group_by_columns(keys, join_on_fields, target_schema):
+    if join_on_fields:
+        return _group_by_columns(keys, join_on_fields, target_schema)
+    return pandas.Series([None] * len(keys), dtype=object)
+
+
+def _row_keys(df, join_on_fields, row_column):
+    if join_on_fields:
+        keys = df[list(join_on_fields)].copy()
+    else:
+        keys = pandas.DataFrame({_ROW_KEY: numpy.zeros(len(df), dtype=numpy.int64)})
+    keys[row_column] = numpy.arange(len(df))
+    return keys
+
+
+def _take_as_string(values, rows, datatype):
+    """Take values by row position as strings, with missing rows (-1) as NaN.
+
+    Only the values taken are cast, rather than the whole column.
+    """
+    present = numpy.flatnonzero(rows >= 0)
+    taken = _as_string(
+        values.take(rows[present]).reset_index(drop=True), datatype
+    ).reset_index(drop=True)
+    return _reindex(taken, present, len(rows))
+
+
+def _reindex(values, positions, num_rows):
+    """Spread values computed for matched rows over all report rows."""
+    values.index = positions
+    return values.reindex(pandas.RangeIndex(num_rows))
+
+
+def _where(mask, value):
+    """Repeat a literal on rows where mask is set, like a side of an outer join."""
+    values = pandas.Series(
+        value,
+        index=pandas.RangeIndex(len(mask)),
+        dtype=ibis.literal(value).type().to_pandas(),
+    )
+    return values.where(mask)
+
+
+def _cast(values, from_type, to_type, numpy_type):
+    """Cast values the same way the ibis pandas backend would."""
+    if from_type == to_type:
+        return values
+    return values.astype(numpy_type)
+
+
+def _as_string(values, datatype):
+    return _cast(values, datatype, dt.string, str)
+
+
+def _epoch_seconds(values):
+    convert = getattr(values, "view", values.astype)
+    return (convert(numpy.int64) // 1_000_000_000).astype(numpy.int32)
+
+
+def _compare_values(
+    source_value, target_value, datatype, target_type, validation, is_value_comparison
+):
+    """Vectorized equivalent of _calculate_difference for matched rows."""
+    pct_threshold = pandas.Series(
+        validation.threshold,
+        index=source_value.index,
+        dtype=ibis.literal(validation.threshold).type().to_pandas(),
+    )
+    is_null_value = False
+    if datatype.is_timestamp() or datatype.is_date():
+        source_value = _epoch_seconds(source_value)
+        target_value = _epoch_seconds(target_value)
+    elif datatype.is_boolean() or (target_type and target_type.is_boolean()):
+        source_value = _cast(source_value, datatype, dt.boolean, numpy.bool_)
+        target_value = _cast(target_value, target_type, dt.boolean, numpy.bool_)
+    elif datatype.is_decimal() or datatype.is_float64():
+        source_value = _cast(source_value, datatype, dt.float32, numpy.float32).round(4)
+        target_value = _cast(
+            target_value, target_type, dt.float32, numpy.float32
+        ).round(4)
+    else:
+        is_null_value = datatype.is_null() or (target_type and target_type.is_null())
+
+    both_null = (source_value.isnull() & target_value.isnull()).to_numpy()
+    if is_value_comparison or datatype.is_string() or is_null_value:
+        if is_value_comparison:
+            difference = pandas.Series([None] * len(source_value), dtype=object)
+        else:
+            difference = pandas.Series(numpy.nan, index=source_value.index)
+        pct_difference = difference.copy()
+        is_success = both_null | (target_value == source_value).to_numpy()
+    else:
+        difference = (target_value - source_value).astype(numpy.float64)
+        denominator = numpy.where(source_value == 0, target_value, source_value)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            pct_difference_nonzero = (
+                100.0 * difference.to_numpy(dtype=numpy.float32)
+            ) / denominator.astype(numpy.float64)
+        pct_difference = pandas.Series(
+            numpy.where(difference == 0, 0.0, pct_difference_nonzero),
+            dtype=numpy.float64,
+        )
+        th_diff = numpy.abs(pct_difference.to_numpy()) - pct_threshold.to_numpy(
+            dtype=numpy.float64
+        )
+        is_success = both_null | ~(numpy.isnan(th_diff) | (th_diff > 0.0))
+
+    validation_status = pandas.Series(
+        numpy.where(
+            is_success, consts.VALIDATION_STATUS_SUCCESS, consts.VALIDATION_STATUS_FAIL
+        ),
+        dtype=object,
+    )
+    return difference, pct_difference, pct_threshold, validation_status
+
+
+def _group_by_columns(keys, join_on_fields, target_schema):
+    """Vectorized equivalent of the group_by_columns JSON built in _join_pivots."""
+    group_by_columns = None
+    for field in join_on_fields:
+        value = (
+            _as_string(keys[field], target_schema[field])
+            .fillna("null")
+            .str.replace(r"\\", r"\\\\", regex=True)
+            .str.replace('"', '\\"', regex=True)
+        )
+        entry = json.dumps(field) + ': "' + value + '"'
+        group_by_columns = (
+            entry if group_by_columns is None else group_by_columns + ", " + entry
+        )
+    return ("{" + group_by_columns + "}").reset_index(drop=True)
@@ -14,6 +14,7 @@
 
 import copy
 import logging
+import re
 import string
 import random
 from typing import TYPE_CHECKING, Optional, Union, List, Dict
@@ -22,8 +23,9 @@ import google.oauth2.service_account
 import ibis.expr.datatypes as dt
 import yaml
 
-from data_validation import clients, consts, gcs_helper, state_manager
+from data_validation import clients, consts, gcs_helper, state_manager, util
 from data_validation.result_handlers.bigquery import BigQueryResultHandler
+from data_validation.result_handlers.parquet import ParquetResultHandler
 from data_validation.result_handlers.text import TextResultHandler
 from data_validation.validation_builder import ValidationBuilder
 
@@ -97,15 +99,16 @@ class ConfigManager(object):
     def close_client_connections(self):
         """Attempt to clean up any source/target connections, based on the client types.
 
-        Not all clients are covered here, we at least have Oracle and PostgreSQL for which we
-        have seen connections being accumulated.
-        https://github.com/GoogleCloudPlatform/professional-services-data-validator/issues/1195
+        Clients taken from the process wide client registry are released rather than
+        disposed, they are disposed by clients.dispose_shared_data_clients() once
+        no config manager holds a reference to them.
         """
         try:
-            if self.source_client and self.source_client.name in ("oracle", "postgres"):
-                self.source_client.con.dispose()
-            if self.target_client and self.target_client.name in ("oracle", "postgres"):
-                self.target_client.con.dispose()
+            for client in (self.source_client, self.target_client):
+                if clients.is_shared_data_client(client):
+                    clients.release_shared_data_client(client)
+                else:
+                    clients.dispose_data_client(client)
         except Exception as exc:
             # No need to reraise, we can silently fail if exiting throws up an issue.
             logging.warning("Exception closing connections: %s", str(exc))
@@ -130,6 +133,79 @@ class ConfigManager(object):
         """Return number of random rows or None."""
         return self.random_row_batch_size() if self.use_random_rows() else None
 
+    def page_size(self):
+        """Return the number of rows per keyset page for row validations or None."""
+        page_size = self._config.get(consts.CONFIG_PAGE_SIZE)
+        return int(page_size) if page_size else None
+
+    def spill_memory_mb(self):
+        """Return the memory budget, in MB, of row validations spilled to disk or None."""
+        spill_memory_mb = self._config.get(consts.CONFIG_SPILL_MEMORY_MB)
+        return int(spill_memory_mb) if spill_memory_mb else None
+
+    def hash_buckets(self):
+        """Return the number of child buckets per hash bucket drill-down level or None."""
+        hash_buckets = self._config.get(consts.CONFIG_HASH_BUCKETS)
+        return int(hash_buckets) if hash_buckets else None
+
+    def shard(self):
+        """Return the (index, count) of the shard of rows to validate or None.
+
+        Without an index, i.e. only a count, the index of the Kubernetes or
+        Cloud Run job task is used.
+        """
+        shard = self._config.get(consts.CONFIG_SHARD)
+        if not shard:
+            return None
+        index, _, count = str(shard).rpartition("/")
+        if not index:
+            index = util.get_job_index()
+            if index is None:
+                raise ValueError(
+                    f"Shard {shard} has no index and neither JOB_COMPLETION_INDEX "
+                    "nor CLOUD_RUN_TASK_INDEX is set"
+                )
+        index, count = int(index), int(count)
+        if not 0 <= index < count:
+            raise ValueError(f"Shard index {index} is out of range for {count} shards")
+        return index, count
+
+    def presence_first(self):
+        """Return whether row validations find missing rows by primary key first."""
+        return bool(self._config.get(consts.CONFIG_PRESENCE_FIRST))
+
+    def watermark_column(self):
+        """Return the column incremental validations are filtered on or None."""
+        return self._config.get(consts.CONFIG_WATERMARK_COLUMN)
+
+    def watermark_overlap(self):
+        """Return how far before the stored watermark an incremental validation starts."""
+        return int(self._config.get(consts.CONFIG_WATERMARK_OVERLAP) or 0)
+
+    def watermark_name(self):
+        """Return the name the watermark of this table pair and column is stored as."""
+        name = "__".join(
+            [
+                str(self._config.get(consts.CONFIG_SOURCE_CONN_NAME)),
+                self.full_source_table,
+                str(self._config.get(consts.CONFIG_TARGET_CONN_NAME)),
+                self.full_target_table,
+                self.watermark_column(),
+            ]
+        )
+        if self.shard():
+            # Each shard only validates part of the rows, so keeps its own watermark.
+            name += "__shard_{}_of_{}".format(*self.shard())
+        return re.sub(r"[^\w.-]", "_", name)
+
+    def get_watermark(self):
+        """Return the stored watermark of an incremental validation or None."""
+        return self._state_manager.get_watermark(self.watermark_name())
+
+    def save_watermark(self, watermark):
+        """Store the watermark of an incremental validation."""
+        self._state_manager.create_watermark(self.watermark_name(), watermark)
+
     def trim_string_pks(self):
         """Return if the validation should trim string primary keys."""
         return self._config.get(consts.CONFIG_TRIM_STRING_PKS) or False
@@ -147,6 +223,13 @@ class ConfigManager(object):
         """Return Aggregates from Config"""
         return self._config.get(consts.CONFIG_MAX_RECURSIVE_QUERY_SIZE, 50000)
 
+    def max_concurrent_queries(self):
+        """Return the max number of queries run at the same time per connection."""
+        return int(
+            self._config.get(consts.CONFIG_MAX_CONCURRENT_QUERIES)
+            or consts.DEFAULT_MAX_CONCURRENT_QUERIES
+        )
+
     @property
     def aggregates(self):
         """Return Aggregates from Config"""
@@ -480,6 +563,19 @@ class ConfigManager(object):
             else:
                 credentials = None
             api_endpoint = self.result_handler_config.get(consts.API_ENDPOINT)
+            load_job_rows = self.result_handler_config.get(consts.LOAD_JOB_ROWS)
+            if load_job_rows:
+                # Buffered handlers are shared so a run writes results with few load jobs.
+                return BigQueryResultHandler.get_buffered_handler(
+                    project_id,
+                    key_path=key_path,
+                    status_list=self.filter_status,
+                    table_id=table_id,
+                    credentials=credentials,
+                    api_endpoint=api_endpoint,
+                    text_format=self._config.get(consts.CONFIG_FORMAT, "table"),
+                    load_job_rows=load_job_rows,
+                )
             return BigQueryResultHandler.get_handler_for_project(
                 project_id,
                 self.filter_status,
@@ -488,6 +584,16 @@ class ConfigManager(object):
                 api_endpoint=api_endpoint,
                 text_format=self._config.get(consts.CONFIG_FORMAT, "table"),
             )
+        elif result_type == "Parquet":
+            # Shared so all validations of a run append to the same files.
+            return ParquetResultHandler.get_shared_handler(
+                self.result_handler_config[consts.RESULT_HANDLER_DIRECTORY],
+                status_list=self.filter_status,
+                partition_by=self.result_handler_config.get(
+                    consts.RESULT_HANDLER_PARTITION_BY, consts.PARTITION_BY_DATE
+                ),
+                text_format=self._config.get(consts.CONFIG_FORMAT, "table"),
+            )
         else:
             raise ValueError(f"Unknown ResultHandler Class: {result_type}")
 
@@ -502,6 +608,14 @@ class ConfigManager(object):
         format,
         use_random_rows=None,
         random_row_batch_size=None,
+        page_size=None,
+        spill_memory_mb=None,
+        hash_buckets=None,
+        presence_first=None,
+        shard=None,
+        watermark_column=None,
+        watermark_overlap=None,
+        max_concurrent_queries=None,
         source_client=None,
         target_client=None,
         result_handler_config=None,
@@ -539,6 +653,14 @@ class ConfigManager(object):
             consts.CONFIG_FILTERS: filter_config,
             consts.CONFIG_USE_RANDOM_ROWS: use_random_rows,
             consts.CONFIG_RANDOM_ROW_BATCH_SIZE: random_row_batch_size,
+            consts.CONFIG_PAGE_SIZE: page_size,
+            consts.CONFIG_SPILL_MEMORY_MB: spill_memory_mb,
+            consts.CONFIG_HASH_BUCKETS: hash_buckets,
+            consts.CONFIG_PRESENCE_FIRST: presence_first,
+            consts.CONFIG_SHARD: shard,
+            consts.CONFIG_WATERMARK_COLUMN: watermark_column,
+            consts.CONFIG_WATERMARK_OVERLAP: watermark_overlap,
+            consts.CONFIG_MAX_CONCURRENT_QUERIES: max_concurrent_queries,
             consts.CONFIG_FILTER_STATUS: filter_status,
             consts.CONFIG_TRIM_STRING_PKS: trim_string_pks,
             consts.CONFIG_CASE_INSENSITIVE_MATCH: case_insensitive_match,
@@ -1188,11 +1310,11 @@ class ConfigManager(object):
         assert (
             self.validation_type != consts.CUSTOM_QUERY
         ), "Custom query validations should not be able to reach this method"
-        primary_keys = self.source_client.list_primary_key_columns(
-            self.source_schema, self.source_table
+        primary_keys = clients.list_primary_key_columns(
+            self.source_client, self.source_schema, self.source_table
         )
         if not primary_keys:
-            primary_keys = self.target_client.list_primary_key_columns(
-                self.target_schema, self.target_table
+            primary_keys = clients.list_primary_key_columns(
+                self.target_client, self.target_schema, self.target_table
             )
         return primary_keys or []
@@ -50,6 +50,13 @@ CONFIG_CALCULATED_SOURCE_COLUMNS = "source_calculated_columns"
 CONFIG_CALCULATED_TARGET_COLUMNS = "target_calculated_columns"
 CONFIG_USE_RANDOM_ROWS = "use_random_rows"
 CONFIG_RANDOM_ROW_BATCH_SIZE = "random_row_batch_size"
+CONFIG_PAGE_SIZE = "page_size"
+CONFIG_SPILL_MEMORY_MB = "spill_memory_mb"
+CONFIG_HASH_BUCKETS = "hash_buckets"
+CONFIG_PRESENCE_FIRST = "presence_first"
+CONFIG_SHARD = "shard"
+CONFIG_WATERMARK_COLUMN = "watermark_column"
+CONFIG_WATERMARK_OVERLAP = "watermark_overlap"
 CONFIG_PRIMARY_KEYS = "primary_keys"
 CONFIG_TRIM_STRING_PKS = "trim_string_pks"
 CONFIG_CASE_INSENSITIVE_MATCH = "case_insensitive_match"
@@ -68,6 +75,7 @@ CONFIG_FILTERS = "filters"
 CONFIG_FILTER_SOURCE = "source"
 CONFIG_FILTER_TARGET = "target"
 CONFIG_MAX_RECURSIVE_QUERY_SIZE = "max_recursive_query_size"
+CONFIG_MAX_CONCURRENT_QUERIES = "max_concurrent_queries"
 CONFIG_SOURCE_QUERY = "source_query"
 CONFIG_SOURCE_QUERY_FILE = "source_query_file"
 CONFIG_TARGET_QUERY = "target_query"
@@ -88,11 +96,15 @@ CONFIG_TYPE_SUM = "sum"
 
 # Default values
 DEFAULT_NUM_RANDOM_ROWS = 10000
+DEFAULT_MAX_CONCURRENT_QUERIES = 4
+DEFAULT_LEASE_SECONDS = 300
 
 # Filter Type Options
 FILTER_TYPE_CUSTOM = "custom"
 FILTER_TYPE_EQUALS = "equals"
 FILTER_TYPE_ISIN = "isin"
+FILTER_TYPE_GREATER_THAN = "greater_than"
+FILTER_TYPE_LESS_THAN_OR_EQUAL_TO = "less_than_or_equal_to"
 
 # Validation Types
 COLUMN_VALIDATION = "Column"
@@ -124,6 +136,14 @@ PROJECT_ID = "project_id"
 TABLE_ID = "table_id"
 GOOGLE_SERVICE_ACCOUNT_KEY_PATH = "google_service_account_key_path"
 API_ENDPOINT = "api_endpoint"
+LOAD_JOB_ROWS = "load_job_rows"
+
+# Parquet Result Handler Configs
+RESULT_HANDLER_DIRECTORY = "directory"
+RESULT_HANDLER_PARTITION_BY = "partition_by"
+PARTITION_BY_DATE = "date"
+PARTITION_BY_RUN_ID = "run_id"
+PARTITION_BY_CHOICES = [PARTITION_BY_DATE, PARTITION_BY_RUN_ID]
 
 # BigQuery Output Table Fields
 VALIDATION_TYPE = "validation_type"
@@ -12,19 +12,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+import datetime
+import decimal
+import functools
 import json
 import logging
+import math
 import warnings
 from concurrent.futures import ThreadPoolExecutor
 import ibis.backends.pandas
 import pandas
 import uuid
 
-from data_validation import combiner, consts, metadata, util
+from data_validation import clients, combiner, consts, metadata, spill, util
 from data_validation.config_manager import ConfigManager
+from data_validation.query_builder.hash_bucket_builder import (
+    BUCKET_COUNT_COLUMN,
+    HASH_BUCKET_COLUMN,
+    MAX_MISMATCHED_BUCKETS,
+    HashBucketBuilder,
+)
+from data_validation.query_builder.keyset_page_builder import KeysetPageBuilder
+from data_validation.query_builder.presence_builder import PresenceBuilder
 from data_validation.query_builder.random_row_builder import RandomRowBuilder
 from data_validation.schema_validation import SchemaValidation
-from data_validation.validation_builder import ValidationBuilder
+from data_validation.validation_builder import ValidationBuilder, list_to_sublists
 
 """ The DataValidation class is where the code becomes source/target aware
 
@@ -58,7 +71,6 @@ class DataValidation(object):
             target_client: Optional client to avoid unnecessary connections,
         """
         self.verbose = verbose
-        self._fresh_connections = not bool(source_client and target_client)
 
         # Data Client Management
         self.config = config
@@ -70,6 +82,16 @@ class DataValidation(object):
             verbose=self.verbose,
         )
 
+        # Only clients opened here are closed on exit, passed clients stay with the caller.
+        self._fresh_clients = [
+            client
+            for client, passed_client in (
+                (self.config_manager.source_client, source_client),
+                (self.config_manager.target_client, target_client),
+            )
+            if passed_client is None
+        ]
+
         self.run_metadata = metadata.RunMetadata()
         self.run_metadata.labels = self.config_manager.labels
 
@@ -88,23 +110,88 @@ class DataValidation(object):
         # Initialize the default Result Handler if None was supplied
         self.result_handler = result_handler or self.config_manager.get_result_handler()
 
+        # The watermark stored once an incremental validation succeeds
+        self._watermark = None
+
+        # Cap the number of queries running at the same time on each connection,
+        # across all the validations sharing it.
+        max_concurrent_queries = self.config_manager.max_concurrent_queries()
+        self._source_query_slots = clients.get_query_slots(
+            self.config_manager.source_client, max_concurrent_queries
+        )
+        self._target_query_slots = clients.get_query_slots(
+            self.config_manager.target_client, max_concurrent_queries
+        )
+
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
-        if self._fresh_connections and hasattr(self, "config_manager"):
-            self.config_manager.close_client_connections()
+        for client in getattr(self, "_fresh_clients", []):
+            try:
+                clients.dispose_data_client(client)
+            except Exception as exc:
+                logging.warning("Exception closing connections: %s", str(exc))
 
     # TODO(dhercher) we planned on shifting this to use an Execution Handler.
     # Leaving to to swast on the design of how this should look.
     def execute(self):
         """Execute Queries and Store Results"""
+        if self._is_paged_row_validation():
+            # Store each page as soon as it is compared to bound memory usage.
+            for result_df in self.validate_pages():
+                self.result_handler.execute(result_df)
+            self.save_watermark()
+            return None
+        if self._is_spilled_row_validation():
+            # Store each group of partitions as soon as it is compared.
+            for result_df in self.validate_spilled():
+                self.result_handler.execute(result_df)
+            self.save_watermark()
+            return None
+        if self._is_presence_first_validation():
+            # Store missing rows as soon as they are found.
+            for result_df in self.validate_presence_first():
+                self.result_handler.execute(result_df)
+            self.save_watermark()
+            return None
+
+        result_df = self.validate()
+
+        # Call Result Handler to Manage Results
+        result_df = self.result_handler.execute(result_df)
+        self.save_watermark()
+        return result_df
+
+    def validate(self):
+        """Execute Queries and return the report DataFrame without storing it.
+
+        This allows callers running validations concurrently to control when,
+        and in which order, results are passed to the result handler. The
+        watermark of an incremental validation is stored by save_watermark()
+        once the results are stored.
+        """
+        if self._is_paged_row_validation():
+            return pandas.concat(self.validate_pages())
+        if self._is_spilled_row_validation():
+            return pandas.concat(self.validate_spilled())
+        if self._is_presence_first_validation():
+            return pandas.concat(self.validate_presence_first())
+
+        if self._is_incremental_validation():
+            util.timed_call("Watermark filter", self._add_watermark_filter)
+
         # Apply random row filter before validations run
         if self.config_manager.use_random_rows():
             util.timed_call("Random row filter", self._add_random_row_filter)
 
         # Run correct execution for the given validation type
-        if self.config_manager.validation_type == consts.ROW_VALIDATION:
+        if (
+            self.config_manager.validation_type == consts.ROW_VALIDATION
+            and self.config_manager.hash_buckets()
+        ):
+            result_df = self.execute_hash_bucket_validation()
+        elif self.config_manager.validation_type == consts.ROW_VALIDATION:
             grouped_fields = self.validation_builder.pop_grouped_fields()
             result_df = self.execute_recursive_validation(
                 self.validation_builder, grouped_fields
@@ -116,11 +203,359 @@ class DataValidation(object):
             )
         else:
             result_df = self._execute_validation(
-                self.validation_builder, process_in_memory=True
+                self.validation_builder,
+                process_in_memory=True,
+                filter_status=self._report_filter_status(),
             )
 
-        # Call Result Handler to Manage Results
-        return self.result_handler.execute(result_df)
+        self._discard_watermark_on_failures(result_df)
+        return result_df
+
+    def _is_paged_row_validation(self):
+        return bool(
+            self.config_manager.validation_type == consts.ROW_VALIDATION
+            and self.config_manager.page_size()
+            and not self.config_manager.hash_buckets()
+        )
+
+    def validate_pages(self):
+        """Execute a row validation page by page and yield a report per page.
+
+        Source and target rows are read in primary key order in pages of at
+        most page_size rows. Each page starts after the last key of the previous
+        page and ends at the smaller of the last keys of both sides, so it covers
+        the same key range on both sides and peak memory depends on the page
+        size rather than on the table size.
+        """
+        if not self.config_manager.primary_keys:
+            raise ValueError("Primary Keys are required for paged row validations")
+        if self.validation_builder.pop_grouped_fields():
+            raise ValueError("Grouped columns are not supported by paged validations")
+
+        if self._is_incremental_validation():
+            util.timed_call("Watermark filter", self._add_watermark_filter)
+
+        if self.config_manager.use_random_rows():
+            util.timed_call("Random row filter", self._add_random_row_filter)
+
+        self.run_metadata.validations = self.validation_builder.get_metadata()
+        source_query = self.validation_builder.get_source_query()
+        target_query = self.validation_builder.get_target_query()
+        join_on_fields = self.validation_builder.get_primary_keys()
+        page_builder = KeysetPageBuilder(
+            join_on_fields, self.config_manager.page_size()
+        )
+
+        after = None
+        while True:
+            source_df = self.config_manager.source_client.execute(
+                page_builder.compile(source_query, after=after)
+            )
+            if len(source_df) == page_builder.page_size:
+                # The target page covers the same key range as the source page.
+                upto = page_builder.last_key(source_df)
+                target_df = self.config_manager.target_client.execute(
+                    page_builder.compile(target_query, after=after, upto=upto)
+                )
+                if len(target_df) == page_builder.page_size:
+                    # The target page ends first, so both pages end at its last key.
+                    upto = page_builder.last_key(target_df)
+                    source_df = self.config_manager.source_client.execute(
+                        page_builder.compile(source_query, after=after, upto=upto)
+                    )
+            else:
+                # The source is exhausted, keep paging through the target.
+                target_df = self.config_manager.target_client.execute(
+                    page_builder.compile(target_query, after=after)
+                )
+                upto = None
+                if len(target_df) == page_builder.page_size:
+                    upto = page_builder.last_key(target_df)
+                    source_df = self.config_manager.source_client.execute(
+                        page_builder.compile(source_query, after=after, upto=upto)
+                    )
+
+            result_df = self._generate_report(
+                source_df,
+                target_df,
+                join_on_fields,
+                is_value_comparison=True,
+                filter_status=self._report_filter_status(),
+            )
+            self._discard_watermark_on_failures(result_df)
+            # Only an empty first page is reported, an empty last page adds nothing.
+            if after is None or not result_df.empty:
+                yield result_df
+            if upto is None:
+                break
+            after = upto
+
+    def _is_spilled_row_validation(self):
+        return bool(
+            self.config_manager.validation_type == consts.ROW_VALIDATION
+            and self.config_manager.spill_memory_mb()
+            and not self.config_manager.page_size()
+            and not self.config_manager.hash_buckets()
+        )
+
+    def validate_spilled(self):
+        """Execute a row validation larger than memory and yield a report per group of partitions.
+
+        Source and target rows are streamed to local disk, hash partitioned by
+        primary key, then compared a group of partitions at a time. Peak memory
+        depends on the spill memory budget rather than on the table size.
+        """
+        if not self.config_manager.primary_keys:
+            raise ValueError("Primary Keys are required for spilled row validations")
+        if self.validation_builder.pop_grouped_fields():
+            raise ValueError(
+                "Grouped columns are not supported by spilled row validations"
+            )
+
+        if self._is_incremental_validation():
+            util.timed_call("Watermark filter", self._add_watermark_filter)
+
+        if self.config_manager.use_random_rows():
+            util.timed_call("Random row filter", self._add_random_row_filter)
+
+        self.run_metadata.validations = self.validation_builder.get_metadata()
+        join_on_fields = self.validation_builder.get_primary_keys()
+        memory_budget = self.config_manager.spill_memory_mb() * 1024 * 1024
+
+        with spill.SpilledResults(join_on_fields, memory_budget) as spilled:
+            util.timed_call(
+                "Spill source rows",
+                self._spill_query,
+                spilled,
+                spill.SOURCE,
+                self._source_query_slots,
+                self.config_manager.source_client,
+                self.validation_builder.get_source_query(),
+            )
+            util.timed_call(
+                "Spill target rows",
+                self._spill_query,
+                spilled,
+                spill.TARGET,
+                self._target_query_slots,
+                self.config_manager.target_client,
+                self.validation_builder.get_target_query(),
+            )
+
+            first = True
+            for source_df, target_df in spilled.partitions():
+                result_df = self._generate_report(
+                    source_df,
+                    target_df,
+                    join_on_fields,
+                    is_value_comparison=True,
+                    filter_status=self._report_filter_status(),
+                )
+                self._discard_watermark_on_failures(result_df)
+                # Only the first report is yielded when empty, to give the columns.
+                if first or not result_df.empty:
+                    yield result_df
+                first = False
+
+    @staticmethod
+    def _spill_query(spilled, side, query_slots, client, query):
+        """Stream the rows of a query to disk once one of the query slots is free."""
+        with query_slots:
+            for df in spill.iter_query_batches(client, query):
+                spilled.add(side, df)
+
+    def _is_presence_first_validation(self):
+        return bool(
+            self.config_manager.validation_type == consts.ROW_VALIDATION
+            and self.config_manager.presence_first()
+            and not self.config_manager.page_size()
+            and not self.config_manager.spill_memory_mb()
+            and not self.config_manager.hash_buckets()
+        )
+
+    def validate_presence_first(self):
+        """Execute a row validation in two phases and yield a report per phase.
+
+        The first phase only reads the primary keys of both sides to find the
+        rows missing from either side, these rows are then read by key and
+        reported. The second phase compares the other rows, leaving the
+        missing rows out of the query where the list of keys is small enough.
+        Missing rows beyond max_recursive_query_size are left to the second phase.
+        """
+        if not self.config_manager.primary_keys:
+            raise ValueError(
+                "Primary Keys are required for presence first row validations"
+            )
+        if self.validation_builder.pop_grouped_fields():
+            raise ValueError(
+                "Grouped columns are not supported by presence first validations"
+            )
+
+        if self._is_incremental_validation():
+            util.timed_call("Watermark filter", self._add_watermark_filter)
+
+        if self.config_manager.use_random_rows():
+            util.timed_call("Random row filter", self._add_random_row_filter)
+
+        self.run_metadata.validations = self.validation_builder.get_metadata()
+        source_query = self.validation_builder.get_source_query()
+        target_query = self.validation_builder.get_target_query()
+        join_on_fields = self.validation_builder.get_primary_keys()
+        presence_builder = PresenceBuilder(join_on_fields)
+        source_in_list_size = clients.get_max_in_list_size(
+            self.config_manager.source_client
+        )
+        target_in_list_size = clients.get_max_in_list_size(
+            self.config_manager.target_client
+        )
+
+        source_keys, target_keys = self._execute_queries(
+            presence_builder.compile_keys(source_query),
+            presence_builder.compile_keys(target_query),
+        )
+        source_only, target_only = util.timed_call(
+            "Missing keys", presence_builder.missing_keys, source_keys, target_keys
+        )
+        del source_keys, target_keys
+        if len(source_only) > self.config_manager.max_recursive_query_size:
+            source_only = source_only.iloc[:0]
+        if len(target_only) > self.config_manager.max_recursive_query_size:
+            target_only = target_only.iloc[:0]
+
+        if not source_only.empty or not target_only.empty:
+            source_df, target_df = self._execute_queries(
+                presence_builder.compile_rows(
+                    source_query, source_only, source_in_list_size
+                ),
+                presence_builder.compile_rows(
+                    target_query, target_only, target_in_list_size
+                ),
+            )
+            # Composite keys are read column by column, drop the extra rows.
+            source_df = source_df[presence_builder.contains(source_df, source_only)]
+            target_df = target_df[presence_builder.contains(target_df, target_only)]
+            result_df = self._generate_report(
+                source_df,
+                target_df,
+                join_on_fields,
+                is_value_comparison=True,
+                filter_status=self._report_filter_status(),
+            )
+            self._discard_watermark_on_failures(result_df)
+            yield result_df
+
+        source_df, target_df = self._execute_queries(
+            presence_builder.compile_excluding(
+                source_query, source_only, source_in_list_size
+            ),
+            presence_builder.compile_excluding(
+                target_query, target_only, target_in_list_size
+            ),
+        )
+        source_df = source_df[~presence_builder.contains(source_df, source_only)]
+        target_df = target_df[~presence_builder.contains(target_df, target_only)]
+        result_df = self._generate_report(
+            source_df,
+            target_df,
+            join_on_fields,
+            is_value_comparison=True,
+            filter_status=self._report_filter_status(),
+        )
+        self._discard_watermark_on_failures(result_df)
+        yield result_df
+
+    def _report_filter_status(self):
+        """Return the statuses built into final reports, None to build all rows.
+
+        Failures decide whether the watermark of an incremental validation is
+        saved, so the status filter is then only pushed into the combiner when
+        it keeps failures.
+        """
+        filter_status = self.config_manager.filter_status
+        if (
+            self._watermark is not None
+            and filter_status
+            and consts.VALIDATION_STATUS_FAIL not in filter_status
+        ):
+            return None
+        return filter_status or None
+
+    def _is_incremental_validation(self):
+        return bool(
+            self.config_manager.watermark_column()
+            and self.config_manager.validation_type
+            in (consts.COLUMN_VALIDATION, consts.ROW_VALIDATION)
+        )
+
+    def _add_watermark_filter(self):
+        """Add watermark filters to the validation builder.
+
+        Only rows beyond the watermark stored by the last successful run, less
+        the overlap, are validated. Rows are also limited to the current max
+        source value so rows added while the validation runs are left to the
+        next run, the max is stored as the new watermark on success.
+        """
+        column = self.config_manager.watermark_column()
+        table = self.config_manager.get_source_ibis_table()
+        filtered_table = self.validation_builder.source_builder.filter_table(table)
+        max_value = self.config_manager.source_client.execute(
+            filtered_table[column].max()
+        )
+        if max_value is None or pandas.isna(max_value):
+            return
+
+        watermark = self.config_manager.get_watermark()
+        if watermark:
+            value = _from_watermark(watermark["value"], table[column].type())
+            # The stored watermark only moves forward.
+            max_value = max(max_value, value)
+            value = _move_watermark_back(value, self.config_manager.watermark_overlap())
+            self.validation_builder.add_filter(
+                {
+                    consts.CONFIG_TYPE: consts.FILTER_TYPE_GREATER_THAN,
+                    consts.CONFIG_FILTER_SOURCE_COLUMN: column,
+                    consts.CONFIG_FILTER_SOURCE_VALUE: value,
+                    consts.CONFIG_FILTER_TARGET_COLUMN: column,
+                    consts.CONFIG_FILTER_TARGET_VALUE: value,
+                }
+            )
+
+        self.validation_builder.add_filter(
+            {
+                consts.CONFIG_TYPE: consts.FILTER_TYPE_LESS_THAN_OR_EQUAL_TO,
+                consts.CONFIG_FILTER_SOURCE_COLUMN: column,
+                consts.CONFIG_FILTER_SOURCE_VALUE: max_value,
+                consts.CONFIG_FILTER_TARGET_COLUMN: column,
+                consts.CONFIG_FILTER_TARGET_VALUE: max_value,
+            }
+        )
+        self._watermark = {"column": column, "value": _to_watermark(max_value)}
+
+    def _discard_watermark_on_failures(self, result_df):
+        """Leave the stored watermark unchanged when a report has failures."""
+        if self._watermark is not None and _has_failures(result_df):
+            logging.warning(
+                "Watermark not updated due to failed validations: %s",
+                self.config_manager.watermark_name(),
+            )
+            self._watermark = None
+
+    def save_watermark(self):
+        """Store the watermark of an incremental validation without failures.
+
+        Called once the results are passed to the result handler. Results
+        buffered by the handler are only stored when flushed, so the watermark
+        is then stored after the flush.
+        """
+        if self._watermark is None:
+            return
+        save = functools.partial(self.config_manager.save_watermark, self._watermark)
+        self._watermark = None
+        on_flushed = getattr(self.result_handler, "on_flushed", None)
+        if on_flushed:
+            on_flushed(save)
+        else:
+            save()
 
     def _add_random_row_filter(self):
         """Add random row filters to the validation builder."""
@@ -205,7 +640,7 @@ class DataValidation(object):
             count_df = rows_df[
                 rows_df[consts.AGGREGATION_TYPE] == consts.CONFIG_TYPE_COUNT
             ]
-            for row in count_df.to_dict(orient="row"):
+            for row in count_df.to_dict(orient="records"):
                 recursive_query_size = max(
                     float(row[consts.SOURCE_AGG_VALUE]),
                     float(row[consts.TARGET_AGG_VALUE]),
@@ -225,7 +660,10 @@ class DataValidation(object):
         This method executes aggregate queries, such as sum-of-hashes, on the
         source and target tables. Where they differ, add to the GROUP BY
         clause recursively until the individual row differences can be
-        identified.
+        identified. The failing groups of a level are validated together by a
+        query on each side, filtered to the failing group values. Where the
+        engines limit the size of in-lists, failing groups are split into
+        batches of that size, each batch being queried concurrently.
         """
         process_in_memory = self.config_manager.process_in_memory()
         past_results = []
@@ -235,6 +673,7 @@ class DataValidation(object):
                 validation_builder, process_in_memory=process_in_memory
             )
 
+            failed_groups = []
             for grouped_key in result_df[consts.GROUP_BY_COLUMNS].unique():
                 # Validations are viewed separtely, but queried together.
                 # We must treat them as a single item which failed or succeeded.
@@ -247,9 +686,14 @@ class DataValidation(object):
                     past_results.append(grouped_key_df)
                     continue
 
-                for row in grouped_key_df.to_dict(orient="row"):
+                for row in grouped_key_df.to_dict(orient="records"):
                     if row[consts.SOURCE_AGG_VALUE] == row[consts.TARGET_AGG_VALUE]:
                         continue
+                    elif pandas.isna(row[consts.SOURCE_AGG_VALUE]) and pandas.isna(
+                        row[consts.TARGET_AGG_VALUE]
+                    ):
+                        # The grouped column itself has no aggregate value.
+                        continue
                     else:
                         group_suceeded = False
                         break
@@ -257,19 +701,24 @@ class DataValidation(object):
                 if group_suceeded:
                     past_results.append(grouped_key_df)
                 else:
-                    recursive_validation_builder = validation_builder.clone()
-                    self._add_recursive_validation_filter(
-                        recursive_validation_builder, row
-                    )
-                    past_results.append(
-                        self.execute_recursive_validation(
-                            recursive_validation_builder, grouped_fields[1:]
-                        )
+                    failed_groups.append(json.loads(grouped_key))
+
+            if failed_groups:
+                past_results.extend(
+                    self._execute_failed_group_batches(
+                        validation_builder, grouped_fields[1:], failed_groups
                     )
+                )
         elif self.config_manager.primary_keys and len(grouped_fields) == 0:
+            if validation_builder.get_group_aliases():
+                # Compare the rows of a failing group rather than its aggregates.
+                validation_builder.pop_grouped_fields()
+                validation_builder.pop_aggregates()
             past_results.append(
                 self._execute_validation(
-                    validation_builder, process_in_memory=process_in_memory
+                    validation_builder,
+                    process_in_memory=process_in_memory,
+                    filter_status=self._report_filter_status(),
                 )
             )
 
@@ -285,41 +734,178 @@ class DataValidation(object):
 
         return pandas.concat(past_results)
 
-    def _add_recursive_validation_filter(self, validation_builder, row):
-        """Return ValidationBuilder Configured for Next Recursive Search"""
-        group_by_columns = json.loads(row[consts.GROUP_BY_COLUMNS])
-        for alias, value in group_by_columns.items():
-            filter_field = {
-                consts.CONFIG_TYPE: consts.FILTER_TYPE_EQUALS,
-                consts.CONFIG_FILTER_SOURCE_COLUMN: validation_builder.get_grouped_alias_source_column(
-                    alias
+    def _execute_failed_group_batches(
+        self, validation_builder, grouped_fields, failed_groups
+    ):
+        """Return the results of the next level of the failing groups, per batch.
+
+        Batches are independent queries, so are explored concurrently. The
+        number of queries running on each connection is capped by the query slots.
+        """
+        in_list_sizes = [
+            size
+            for size in (
+                clients.get_max_in_list_size(self.config_manager.source_client),
+                clients.get_max_in_list_size(self.config_manager.target_client),
+            )
+            if size
+        ]
+        batches = (
+            list_to_sublists(failed_groups, min(in_list_sizes))
+            if in_list_sizes
+            else [failed_groups]
+        )
+        builders = []
+        for batch in batches:
+            batch_validation_builder = validation_builder.clone()
+            batch_validation_builder.add_grouped_values_filter(batch)
+            builders.append(batch_validation_builder)
+        if len(builders) == 1:
+            return [self.execute_recursive_validation(builders[0], grouped_fields)]
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(builders), self.config_manager.max_concurrent_queries())
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self.execute_recursive_validation, builder, grouped_fields
+                )
+                for builder in builders
+            ]
+        return [future.result() for future in futures]
+
+    def execute_hash_bucket_validation(self):
+        """Hash bucket drill-down for Row validations.
+
+        Rows are bucketed by a hash of their primary key and each side returns
+        a row count and a fingerprint of hash__all per bucket. Only buckets
+        which differ are split into child buckets on the next level, until the
+        rows in the differing buckets are few enough to be compared row by row.
+        When a split leaves as many differing rows, or too many differing
+        buckets, the rows of the buckets split are compared straight away.
+        """
+        if not self.config_manager.primary_keys:
+            raise ValueError("Primary Keys are required for hash bucket validations")
+        if self.validation_builder.pop_grouped_fields():
+            raise ValueError(
+                "Grouped columns are not supported by hash bucket validations"
+            )
+        hash_field = "hash__all"
+        if hash_field not in self.validation_builder.get_metadata():
+            raise ValueError("Hash bucket validations require a --hash validation")
+
+        self.run_metadata.validations = self.validation_builder.get_metadata()
+        source_query = self.validation_builder.get_source_query()
+        target_query = self.validation_builder.get_target_query()
+        join_on_fields = self.validation_builder.get_primary_keys()
+        bucket_builder = HashBucketBuilder(
+            join_on_fields, hash_field, self.config_manager.hash_buckets()
+        )
+        source_in_list_size = clients.get_max_in_list_size(
+            self.config_manager.source_client
+        )
+        target_in_list_size = clients.get_max_in_list_size(
+            self.config_manager.target_client
+        )
+
+        def compare_rows(depth, prefixes):
+            source_df, target_df = self._execute_queries(
+                bucket_builder.compile_rows(
+                    source_query, depth, prefixes, source_in_list_size
                 ),
-                consts.CONFIG_FILTER_SOURCE_VALUE: value,
-                consts.CONFIG_FILTER_TARGET_COLUMN: validation_builder.get_grouped_alias_target_column(
-                    alias
+                bucket_builder.compile_rows(
+                    target_query, depth, prefixes, target_in_list_size
                 ),
-                consts.CONFIG_FILTER_TARGET_VALUE: value,
-            }
-            validation_builder.add_filter(filter_field)
+            )
+            return self._generate_report(
+                source_df,
+                target_df,
+                join_on_fields,
+                is_value_comparison=True,
+                filter_status=self._report_filter_status(),
+            )
+
+        past_results = []
+        parent_prefixes = None
+        parent_row_count = None
+        for depth in range(1, bucket_builder.max_depth + 1):
+            source_df, target_df = self._execute_queries(
+                bucket_builder.compile_buckets(
+                    source_query, depth, parent_prefixes, source_in_list_size
+                ),
+                bucket_builder.compile_buckets(
+                    target_query, depth, parent_prefixes, target_in_list_size
+                ),
+            )
+            buckets_df = source_df.merge(
+                target_df, how="outer", on=HASH_BUCKET_COLUMN, suffixes=("_s", "_t")
+            )
+            mismatched = (
+                buckets_df[BUCKET_COUNT_COLUMN + "_s"]
+                .ne(buckets_df[BUCKET_COUNT_COLUMN + "_t"])
+                .to_numpy()
+                | buckets_df[hash_field + "_s"]
+                .ne(buckets_df[hash_field + "_t"])
+                .to_numpy()
+            )
+            mismatched_df = buckets_df[mismatched]
+            prefixes = list(mismatched_df[HASH_BUCKET_COLUMN])
+            row_count = (
+                mismatched_df[[BUCKET_COUNT_COLUMN + "_s", BUCKET_COUNT_COLUMN + "_t"]]
+                .max(axis=1)
+                .sum()
+            )
+
+            if len(prefixes) > MAX_MISMATCHED_BUCKETS or (
+                prefixes and row_count == parent_row_count
+            ):
+                # Differences are spread over too many buckets, or the split did not
+                # narrow them down, so splitting further would only multiply the
+                # buckets. The rows of the parent buckets are compared instead.
+                past_results.append(compare_rows(depth - 1, parent_prefixes))
+                break
+
+            # Matching buckets are reported as a whole, with the bucket as the group.
+            bucket_columns = [HASH_BUCKET_COLUMN, hash_field]
+            past_results.append(
+                self._generate_report(
+                    source_df[~source_df[HASH_BUCKET_COLUMN].isin(prefixes)][
+                        bucket_columns
+                    ],
+                    target_df[~target_df[HASH_BUCKET_COLUMN].isin(prefixes)][
+                        bucket_columns
+                    ],
+                    [HASH_BUCKET_COLUMN],
+                    is_value_comparison=True,
+                    filter_status=self._report_filter_status(),
+                )
+            )
+            if not prefixes:
+                break
 
-    def _execute_validation(self, validation_builder, process_in_memory=True):
+            if (
+                row_count <= self.config_manager.max_recursive_query_size
+                or depth == bucket_builder.max_depth
+            ):
+                past_results.append(compare_rows(depth, prefixes))
+                break
+            parent_prefixes, parent_row_count = prefixes, row_count
+
+        return pandas.concat(past_results)
+
+    def _execute_validation(
+        self, validation_builder, process_in_memory=True, filter_status=None
+    ):
         """Execute Against a Supplied Validation Builder"""
 
-        self.run_metadata.validations = validation_builder.get_metadata()
+        # Failing groups are validated concurrently, each with its own metadata.
+        run_metadata = copy.copy(self.run_metadata)
+        run_metadata.validations = validation_builder.get_metadata()
+        self.run_metadata.validations = run_metadata.validations
 
         source_query = validation_builder.get_source_query()
         target_query = validation_builder.get_target_query()
 
-        join_on_fields = (
-            set(validation_builder.get_primary_keys())
-            if (self.config_manager.validation_type == consts.ROW_VALIDATION)
-            or (
-                self.config_manager.validation_type == consts.CUSTOM_QUERY
-                and self.config_manager.custom_query_type == "row"
-            )
-            else set(validation_builder.get_group_aliases())
-        )
-
         # If row validation from YAML, compare source and target agg values
         is_value_comparison = (
             self.config_manager.validation_type == consts.ROW_VALIDATION
@@ -329,66 +915,102 @@ class DataValidation(object):
             )
         )
 
-        if process_in_memory:
-            futures = []
-            with ThreadPoolExecutor() as executor:
-                # Submit the two query network calls concurrently
-                futures.append(
-                    executor.submit(
-                        util.timed_call,
-                        "Source query",
-                        self.config_manager.source_client.execute,
-                        source_query,
-                    )
-                )
-                futures.append(
-                    executor.submit(
-                        util.timed_call,
-                        "Target query",
-                        self.config_manager.target_client.execute,
-                        target_query,
-                    )
-                )
-                source_df = futures[0].result()
-                target_df = futures[1].result()
+        # Grouped row validations compare the aggregates of each group.
+        join_on_fields = (
+            set(validation_builder.get_primary_keys())
+            if is_value_comparison and not validation_builder.get_group_aliases()
+            else set(validation_builder.get_group_aliases())
+        )
 
-            pandas_client = ibis.pandas.connect(
-                {combiner.DEFAULT_SOURCE: source_df, combiner.DEFAULT_TARGET: target_df}
+        if process_in_memory:
+            source_df, target_df = self._execute_queries(source_query, target_query)
+            result_df = self._generate_report(
+                source_df,
+                target_df,
+                join_on_fields,
+                is_value_comparison,
+                run_metadata=run_metadata,
+                filter_status=filter_status,
             )
-
-            try:
-                result_df = util.timed_call(
-                    "Generate report",
-                    combiner.generate_report,
-                    pandas_client,
-                    self.run_metadata,
-                    pandas_client.table(combiner.DEFAULT_SOURCE),
-                    pandas_client.table(combiner.DEFAULT_TARGET),
+        else:
+            with self._source_query_slots:
+                result_df = combiner.generate_report(
+                    self.config_manager.source_client,
+                    run_metadata,
+                    source_query,
+                    target_query,
                     join_on_fields=join_on_fields,
                     is_value_comparison=is_value_comparison,
                     verbose=self.verbose,
+                    filter_status=filter_status,
                 )
-            except Exception as e:
-                if self.verbose:
-                    logging.error("-- ** Logging Source DF ** --")
-                    logging.error(source_df.dtypes)
-                    logging.error(source_df)
-                    logging.error("-- ** Logging Target DF ** --")
-                    logging.error(target_df.dtypes)
-                    logging.error(target_df)
-                raise e
-        else:
-            result_df = combiner.generate_report(
-                self.config_manager.source_client,
-                self.run_metadata,
-                source_query,
-                target_query,
+
+        return result_df
+
+    def _execute_queries(self, source_query, target_query):
+        """Return the source and target query results, queried concurrently."""
+        futures = []
+        with ThreadPoolExecutor() as executor:
+            # Submit the two query network calls concurrently
+            futures.append(
+                executor.submit(
+                    util.timed_call,
+                    "Source query",
+                    self._execute_query,
+                    self._source_query_slots,
+                    self.config_manager.source_client,
+                    source_query,
+                )
+            )
+            futures.append(
+                executor.submit(
+                    util.timed_call,
+                    "Target query",
+                    self._execute_query,
+                    self._target_query_slots,
+                    self.config_manager.target_client,
+                    target_query,
+                )
+            )
+            return futures[0].result(), futures[1].result()
+
+    @staticmethod
+    def _execute_query(query_slots, client, query):
+        """Execute a query once one of the query slots of its connection is free."""
+        with query_slots:
+            return client.execute(query)
+
+    def _generate_report(
+        self,
+        source_df,
+        target_df,
+        join_on_fields,
+        is_value_comparison,
+        run_metadata=None,
+        filter_status=None,
+    ):
+        """Combine source and target query results into a report DataFrame."""
+        try:
+            return util.timed_call(
+                "Generate report",
+                combiner.generate_report_from_dataframes,
+                run_metadata or self.run_metadata,
+                source_df,
+                target_df,
                 join_on_fields=join_on_fields,
                 is_value_comparison=is_value_comparison,
                 verbose=self.verbose,
+                filter_status=filter_status,
             )
-
-        return result_df
+        except Exception as e:
+            if self.verbose:
+                logging.error("-- ** Logging Source DF ** --")
+                logging.error(source_df.dtypes)
+                logging.error(source_df)
+                logging.error("-- ** Logging Target DF ** --")
+                logging.error(target_df.dtypes)
+                logging.error(target_df)
+            raise e
 
     def combine_data(self, source_df, target_df, join_on_fields):
         """TODO: Return List of Dictionaries"""
@@ -408,3 +1030,44 @@ class DataValidation(object):
                 rsuffix=consts.OUTPUT_SUFFIX,
             )
         return df
+
+
+def _has_failures(result_df):
+    return bool(
+        (result_df[consts.VALIDATION_STATUS] == consts.VALIDATION_STATUS_FAIL).any()
+    )
+
+
+def _to_watermark(value):
+    """Return a value which can be stored as JSON."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    elif isinstance(value, decimal.Decimal):
+        return str(value)
+    elif hasattr(value, "item"):
+        # Numpy scalars
+        return value.item()
+    return value
+
+
+def _move_watermark_back(value, overlap):
+    """Return a watermark less the overlap, in seconds for dates and timestamps."""
+    if not overlap:
+        return value
+    elif isinstance(value, datetime.datetime):
+        return value - datetime.timedelta(seconds=overlap)
+    elif isinstance(value, datetime.date):
+        # Dates only move by whole days, the overlap is rounded up to days.
+        return value - datetime.timedelta(days=math.ceil(overlap / 86400))
+    return value - overlap
+
+
+def _from_watermark(value, data_type):
+    """Return a stored watermark as a value of the watermark column type."""
+    if data_type.is_timestamp():
+        return pandas.Timestamp(value)
+    elif data_type.is_date():
+        return datetime.date.fromisoformat(value)
+    elif data_type.is_decimal():
+        return decimal.Decimal(value)
+    return value
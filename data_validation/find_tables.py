@@ -33,10 +33,11 @@ def _compare_match_tables(source_table_map, target_table_map, score_cutoff=0.8)
     # TODO(dhercher): evaluate if improved comparison and score cutoffs should be used.
     table_configs = []
 
-    target_keys = target_table_map.keys()
+    # The index only scores the target keys which can be the closest match.
+    target_index = jellyfish_distance.ClosestMatchIndex(target_table_map.keys())
     for source_key in source_table_map:
-        target_key = jellyfish_distance.extract_closest_match(
-            source_key, target_keys, score_cutoff=score_cutoff
+        target_key = target_index.extract_closest_match(
+            source_key, score_cutoff=score_cutoff
         )
         if target_key is None:
             continue
@@ -12,13 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
 import logging
 import os
-from typing import List
+import uuid
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
-from google.cloud import storage
+from google.api_core import exceptions
 from data_validation import client_info
 
+if TYPE_CHECKING:
+    from google.cloud import storage
+
 
 WRITE_SUCCESS_STRING = "Success! Config output written to"
 
@@ -34,8 +40,10 @@ def get_validation_path(name: str) -> str:
     return os.path.join("./", name)
 
 
-def get_gcs_bucket(gcs_file_path: str) -> storage.Bucket:
+def get_gcs_bucket(gcs_file_path: str) -> "storage.Bucket":
     """Returns storage.Bucket given GCS file path with prefix."""
+    from google.cloud import storage
+
     bucket_name = gcs_file_path[5:].split("/")[0]
     info = client_info.get_http_client_info()
     storage_client = storage.Client(client_info=info)
@@ -95,3 +103,149 @@ def list_gcs_directory(directory_path: str) -> List[str]:
         for f in gcs_bucket.list_blobs(prefix=gcs_prefix, delimiter="/")
     ]
     return blobs
+
+
+def create_file(file_path: str, data: str) -> bool:
+    """Write a file only if it does not exist yet, atomically.
+
+    Returns:
+        True if the file was created, False if it already existed.
+    """
+    if _is_gcs_path(file_path):
+        gcs_bucket = get_gcs_bucket(file_path)
+        blob = gcs_bucket.blob(_get_gcs_file_path(file_path))
+        try:
+            blob.upload_from_string(data, if_generation_match=0)
+        except exceptions.PreconditionFailed:
+            return False
+        return True
+
+    # Link a fully written temporary file, so readers never see a partial file.
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    temp_path = _write_local_temp_file(file_path, data)
+    try:
+        os.link(temp_path, file_path)
+    except FileExistsError:
+        return False
+    finally:
+        os.remove(temp_path)
+    return True
+
+
+def read_file_generation(file_path: str) -> Tuple[Optional[str], object]:
+    """Return the content of a file with its generation, or (None, None) if missing.
+
+    The generation changes each time the file is written and is passed to
+    replace_file to only replace the file if it was not written since.
+    """
+    if _is_gcs_path(file_path):
+        gcs_bucket = get_gcs_bucket(file_path)
+        blob = gcs_bucket.get_blob(_get_gcs_file_path(file_path))
+        if blob is None:
+            return None, None
+        try:
+            return blob.download_as_text(if_generation_match=blob.generation), (
+                blob.generation
+            )
+        except (exceptions.NotFound, exceptions.PreconditionFailed):
+            return None, None
+
+    try:
+        return _read_local_file_generation(file_path)
+    except FileNotFoundError:
+        return None, None
+
+
+def _read_local_file_generation(file_path: str) -> Tuple[str, str]:
+    # The modification time alone can be too coarse to tell writes apart.
+    with open(file_path, "r") as f:
+        mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+        data = f.read()
+    generation = hashlib.sha256(f"{mtime_ns}:{data}".encode("utf-8")).hexdigest()
+    return data, generation
+
+
+def replace_file(file_path: str, data: str, generation) -> bool:
+    """Replace a file only if it is still at the given generation.
+
+    Returns:
+        True if the file was replaced, False if it was written or deleted since.
+    """
+    if _is_gcs_path(file_path):
+        gcs_bucket = get_gcs_bucket(file_path)
+        blob = gcs_bucket.blob(_get_gcs_file_path(file_path))
+        try:
+            blob.upload_from_string(data, if_generation_match=generation)
+        except (exceptions.NotFound, exceptions.PreconditionFailed):
+            return False
+        return True
+
+    try:
+        with _local_file_lock(file_path):
+            if _read_local_file_generation(file_path)[1] != generation:
+                return False
+            # Replacing with a fully written temporary file keeps the file in place.
+            os.replace(_write_local_temp_file(file_path, data), file_path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def delete_file(file_path: str, generation=None) -> bool:
+    """Delete a file, only if it is still at the given generation when given.
+
+    Returns:
+        True if the file was deleted, False if it was missing or written since.
+    """
+    if _is_gcs_path(file_path):
+        gcs_bucket = get_gcs_bucket(file_path)
+        try:
+            gcs_bucket.blob(_get_gcs_file_path(file_path)).delete(
+                if_generation_match=generation
+            )
+        except (exceptions.NotFound, exceptions.PreconditionFailed):
+            return False
+        return True
+
+    try:
+        with _local_file_lock(file_path):
+            if (
+                generation is not None
+                and _read_local_file_generation(file_path)[1] != generation
+            ):
+                return False
+            os.remove(file_path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _write_local_temp_file(file_path: str, data: str) -> str:
+    temp_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+    with open(temp_path, "w") as file:
+        file.write(data)
+    return temp_path
+
+
+@contextmanager
+def _local_file_lock(file_path: str):
+    """Serialize the conditional writes of the files of a local directory."""
+    import fcntl
+
+    fd = os.open(os.path.dirname(file_path) or ".", os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def list_directory(directory_path: str) -> List[str]:
+    """Return the names of the files in a local or GCS directory, if any."""
+    if _is_gcs_path(directory_path):
+        if not directory_path.endswith("/"):
+            directory_path += "/"
+        return list_gcs_directory(directory_path)
+    if not os.path.isdir(directory_path):
+        return []
+    return os.listdir(directory_path)
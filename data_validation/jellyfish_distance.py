@@ -12,7 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import Counter
+
 import jellyfish
+import numpy
+
+# Allows for rounding when comparing upper bounds with Jaro scores.
+_BOUND_TOLERANCE = 1e-9
 
 
 def extract_closest_match(search_key, target_list, score_cutoff=0):
@@ -33,3 +39,82 @@ def extract_closest_match(search_key, target_list, score_cutoff=0):
             highest_value_key = target_key
 
     return highest_value_key
+
+
+class ClosestMatchIndex(object):
+    def __init__(self, target_list):
+        """Build an index of target strings to find closest matches without scoring every target.
+
+        Exact matches are found by hash lookup. Otherwise an upper bound of the
+        Jaro similarity of every target is computed at once from character
+        counts: Jaro can not exceed (c/len(s1) + c/len(s2) + 1) / 3, where c is
+        the number of characters both strings have in common. Only targets whose
+        bound can beat the best score so far are scored, so results are the
+        same as extract_closest_match.
+
+        Args:
+            target_list (list): A list of strings for comparison.
+        """
+        self.targets = list(target_list)
+        self._positions = {key: i for i, key in enumerate(self.targets)}
+        alphabet = sorted({char for key in self.targets for char in key})
+        self._columns = {char: i for i, char in enumerate(alphabet)}
+        self._counts = numpy.zeros(
+            (len(self.targets), len(alphabet)), dtype=numpy.int32
+        )
+        for row, key in enumerate(self.targets):
+            for char, count in Counter(key).items():
+                self._counts[row, self._columns[char]] = count
+        self._lengths = numpy.array([len(key) for key in self.targets])
+
+    def extract_closest_match(self, search_key, score_cutoff=0):
+        """Return str value from the targets with highest score using Jaro
+        for String distance, with the same ties as extract_closest_match.
+
+         search_key (str): A string used to search for closest match.
+         score_cutoff (float): A score cutoff (betwen 0 and 1) to be met.
+        """
+        if search_key in self._positions:
+            # Only an identical string has a score of 1.
+            return self.targets[self._positions[search_key]]
+        if not self.targets or score_cutoff >= 1:
+            return None
+
+        bounds = self._upper_bounds(search_key)
+        candidates = numpy.flatnonzero(bounds >= score_cutoff)
+        candidates = candidates[numpy.argsort(-bounds[candidates], kind="stable")]
+
+        highest_score = score_cutoff
+        highest_position = None
+        for position in candidates:
+            if bounds[position] < highest_score:
+                # No remaining target can reach the highest score.
+                break
+            score = jellyfish.jaro_similarity(search_key, self.targets[position])
+            if score > highest_score or (
+                score == highest_score
+                and (highest_position is None or position > highest_position)
+            ):
+                # Equal scores resolve to the last target, as in extract_closest_match.
+                highest_score = score
+                highest_position = position
+
+        if highest_position is None:
+            return None
+        return self.targets[highest_position]
+
+    def _upper_bounds(self, search_key):
+        """Return an upper bound of the Jaro similarity of each target."""
+        common = numpy.zeros(len(self.targets), dtype=numpy.int64)
+        for char, count in Counter(search_key).items():
+            column = self._columns.get(char)
+            if column is not None:
+                common += numpy.minimum(self._counts[:, column], count)
+        if not search_key:
+            return numpy.ones(len(self.targets))
+
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            bounds = (common / len(search_key) + common / self._lengths + 1) / 3
+        bounds[common == 0] = 0
+        bounds[self._lengths == 0] = 1
+        return bounds + _BOUND_TOLERANCE
@@ -0,0 +1,174 @@
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A cache of metadata: catalog listings, Ibis tables, their schemas and primary keys.
+
+Metadata is cached on each client for the life of the client, so building the
+configs of many tables of a connection lists the catalog and reflects each table
+once. When a TTL is set, listings, schemas and primary keys are also stored by
+the StateManager, keyed by the connection config, schema and table, and reused
+by later runs until they expire.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Callable, List
+
+import ibis
+import ibis.expr.datatypes as dt
+
+from data_validation import state_manager
+
+if TYPE_CHECKING:
+    import ibis.expr.schema as sch
+    import ibis.expr.types as ir
+
+_CACHE_ATTRIBUTE = "_metadata_cache"
+_TABLE = "table"
+_SCHEMA = "schema"
+_PRIMARY_KEYS = "primary_keys"
+_SCHEMA_NAMES = "schema_names"
+_TABLE_NAMES = "table_names"
+
+# Seconds stored metadata stays valid, None to only cache in process.
+_TTL_SECONDS = None
+
+
+def set_ttl(seconds: int):
+    """Store metadata with the StateManager and reuse it for the given seconds."""
+    global _TTL_SECONDS
+    _TTL_SECONDS = seconds
+
+
+def get_table(
+    client,
+    schema_name: str,
+    table_name: str,
+    loader: Callable[[], "ir.Table"],
+    database_name: str = None,
+) -> "ir.Table":
+    """Return the Ibis table of a client, loaded once per client."""
+    return _get_cached(client, (_TABLE, schema_name, table_name, database_name), loader)
+
+
+def get_table_schema(
+    client, schema_name: str, table_name: str, loader: Callable[[], "sch.Schema"]
+) -> "sch.Schema":
+    """Return the Ibis schema of a table, loaded once per client or TTL."""
+    cache = _get_client_cache(client)
+    table = cache.get((_TABLE, schema_name, table_name, None))
+    if table is not None:
+        # The table was already reflected, no need to ask the catalog again.
+        return table.schema()
+    return _get_cached(
+        client,
+        (_SCHEMA, schema_name, table_name),
+        loader,
+        serialize=lambda schema: [[name, str(t)] for name, t in schema.items()],
+        deserialize=lambda value: ibis.schema([(n, dt.dtype(t)) for n, t in value]),
+    )
+
+
+def get_primary_keys(
+    client, schema_name: str, table_name: str, loader: Callable[[], List[str]]
+) -> List[str]:
+    """Return the primary key columns of a table, loaded once per client or TTL."""
+    return _get_cached(
+        client,
+        (_PRIMARY_KEYS, schema_name, table_name),
+        lambda: list(loader() or []),
+        serialize=list,
+        deserialize=list,
+    )
+
+
+def get_schema_names(client, loader: Callable[[], List[str]]) -> List[str]:
+    """Return the schema names of a catalog, listed once per client or TTL."""
+    return _get_cached(
+        client,
+        (_SCHEMA_NAMES,),
+        lambda: list(loader()),
+        serialize=list,
+        deserialize=list,
+    )
+
+
+def get_table_names(
+    client, schema_name: str, loader: Callable[[], List[str]]
+) -> List[str]:
+    """Return the table names of a schema, listed once per client or TTL."""
+    return _get_cached(
+        client,
+        (_TABLE_NAMES, schema_name),
+        lambda: list(loader()),
+        serialize=list,
+        deserialize=list,
+    )
+
+
+def _get_client_cache(client) -> dict:
+    cache = getattr(client, _CACHE_ATTRIBUTE, None)
+    if cache is None:
+        cache = {}
+        setattr(client, _CACHE_ATTRIBUTE, cache)
+    return cache
+
+
+def _get_cached(client, key, loader, serialize=None, deserialize=None):
+    cache = _get_client_cache(client)
+    if key in cache:
+        return cache[key]
+
+    entry_name = _get_entry_name(client, key) if serialize else None
+    value = None
+    if entry_name:
+        value = _read_entry(entry_name, deserialize)
+    if value is None:
+        value = loader()
+        if entry_name:
+            _write_entry(entry_name, serialize(value))
+    cache[key] = value
+    return value
+
+
+def _get_entry_name(client, key):
+    """Return the name of the stored entry, None if metadata is not stored."""
+    connection_key = getattr(client, "_connection_key", None)
+    if not _TTL_SECONDS or not connection_key:
+        return None
+    return hashlib.sha256(
+        json.dumps([connection_key, *key]).encode("utf-8")
+    ).hexdigest()
+
+
+def _read_entry(entry_name, deserialize):
+    try:
+        entry = state_manager.StateManager().get_metadata_cache_entry(entry_name)
+    except Exception as e:
+        logging.warning("Unable to read cached metadata: %s", str(e))
+        return None
+    if entry is None or time.time() - entry["cached_at"] > _TTL_SECONDS:
+        return None
+    return deserialize(entry["value"])
+
+
+def _write_entry(entry_name, value):
+    try:
+        state_manager.StateManager().create_metadata_cache_entry(
+            entry_name, {"cached_at": time.time(), "value": value}
+        )
+    except Exception as e:
+        logging.warning("Unable to store cached metadata: %s", str(e))
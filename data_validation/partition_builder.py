@@ -23,6 +23,10 @@ from argparse import Namespace
 from data_validation import cli_tools, consts
 from data_validation.config_manager import ConfigManager
 from data_validation.query_builder.partition_row_builder import PartitionRowBuilder
+from data_validation.query_builder.random_row_builder import (
+    RANDOM_SORT_SUPPORTS,
+    RandomRowBuilder,
+)
 from data_validation.validation_builder import ValidationBuilder
 from data_validation.validation_builder import list_to_sublists
 
@@ -153,36 +157,6 @@ class PartitionBuilder:
             )
             target_table = target_partition_row_builder.query
 
-            # Get Source and Target row Count
-            source_count = source_partition_row_builder.get_count()
-            target_count = target_partition_row_builder.get_count()
-
-            # For some reason Teradata connector returns a dataframe with the count element,
-            # while the other connectors return a numpy.int64 value
-            if isinstance(source_count, pandas.DataFrame):
-                source_count = source_count.values[0][0]
-            if isinstance(target_count, pandas.DataFrame):
-                target_count = target_count.values[0][0]
-
-            if abs(source_count - target_count) > source_count * 0.1:
-                logging.warning(
-                    "Source and Target table row counts vary by more than 10%,"
-                    "partitioning may result in partitions with very different sizes"
-                )
-
-            # Decide on number of partitions after checking number requested is not > number of rows in source
-            number_of_part = (
-                self.args.partition_num
-                if self.args.partition_num < source_count
-                else source_count
-            )
-
-            # First we number each row in the source table. Using row_number instead of ntile since it is
-            # available on all platforms (Teradata does not support NTILE). For our purposes, it is likely
-            # more efficient
-            window1 = ibis.window(order_by=source_pks)
-            row_number = (ibis.row_number().over(window1) + 1).name(consts.DVT_POS_COL)
-
             if config_manager.trim_string_pks():
                 dvt_keys = []
                 for key in source_pks.copy():
@@ -194,49 +168,35 @@ class PartitionBuilder:
             else:
                 dvt_keys = source_pks.copy()
 
-            dvt_keys.append(row_number)
-            rownum_table = source_table.select(dvt_keys)
-            # Rownum table is just the primary key columns in the source table along with
-            # an additional column with the row number associated with each row.
-
-            # This rather complicated expression below is a filter (where) clause condition that filters the row numbers
-            # that correspond to the first element of the partition. The number of a partition is
-            # ceiling(row number * # of partitions / total number of rows). The first element of the partition is where
-            # the remainder, i.e. row number * # of partitions % total number of rows is > 0 and <= number of partitions.
-            # The remainder function does not work well with Teradata, hence writing that out explicitly.
-            cond = (
-                rownum_table
-                if source_count == number_of_part
-                else (
-                    (
-                        rownum_table[consts.DVT_POS_COL] * number_of_part
-                        - (
-                            rownum_table[consts.DVT_POS_COL]
-                            * number_of_part
-                            / source_count
-                        ).floor()
-                        * source_count
-                    )
-                    <= number_of_part
-                )
-                & (
-                    (
-                        rownum_table[consts.DVT_POS_COL] * number_of_part
-                        - (
-                            rownum_table[consts.DVT_POS_COL]
-                            * number_of_part
-                            / source_count
-                        ).floor()
-                        * source_count
-                    )
-                    > 0
+            sample_size = getattr(self.args, "partition_sample_size", None)
+            if (
+                sample_size
+                and config_manager.source_client.name not in RANDOM_SORT_SUPPORTS
+            ):
+                # Without a random sort the sample would be the first keys in
+                # storage order, which says little about the key distribution.
+                logging.warning(
+                    "Data Client %s does not support random sort, numbering every row "
+                    "instead of sampling keys",
+                    config_manager.source_client.name,
                 )
-            )
-            first_keys_table = rownum_table[cond].order_by(source_pks)
+                sample_size = None
 
-            # Up until this point, we have built the table expression, have not executed the query yet.
-            # The query is now executed to find the first element of each partition
-            first_elements = first_keys_table.execute().to_numpy()
+            if sample_size:
+                # Estimate the first element of each partition from a sample of keys, this
+                # avoids counting and numbering every row of the source table.
+                first_elements = self._get_sampled_first_keys(
+                    config_manager.source_client,
+                    source_table.select(dvt_keys),
+                    source_pks,
+                )
+            else:
+                first_elements = self._get_first_keys(
+                    source_partition_row_builder,
+                    target_partition_row_builder,
+                    source_table.select(dvt_keys + [self._row_number(source_pks)]),
+                    source_pks,
+                )
 
             # Once we have the first element of each partition, we can generate the where clause
             # i.e. greater than or equal to first element and less than first element of next partition
@@ -279,6 +239,33 @@ class PartitionBuilder:
                         (key_column == value) & geq_value(table, keys[1:], values[1:])
                     )
 
+            if len(first_elements) == 1:
+                # A single partition holds the rows on both sides of its first element.
+                filter_source_clause = less_than_value(
+                    source_table, source_pks, first_elements[0, : len(source_pks)]
+                ) | geq_value(
+                    source_table, source_pks, first_elements[0, : len(source_pks)]
+                )
+                filter_target_clause = less_than_value(
+                    target_table, target_pks, first_elements[0, : len(target_pks)]
+                ) | geq_value(
+                    target_table, target_pks, first_elements[0, : len(target_pks)]
+                )
+                source_where_list.append(
+                    self._extract_where(
+                        source_table.filter(filter_source_clause),
+                        config_manager.source_client,
+                    )
+                )
+                target_where_list.append(
+                    self._extract_where(
+                        target_table.filter(filter_target_clause),
+                        config_manager.target_client,
+                    )
+                )
+                master_filter_list.append([source_where_list, target_where_list])
+                continue
+
             filter_source_clause = less_than_value(
                 source_table,
                 source_pks,
@@ -358,6 +345,131 @@ class PartitionBuilder:
             master_filter_list.append([source_where_list, target_where_list])
         return master_filter_list
 
+    @staticmethod
+    def _row_number(source_pks: List[str]) -> ibis.Expr:
+        """Return the row number of each row in the primary key order."""
+        # Using row_number instead of ntile since it is available on all platforms (Teradata
+        # does not support NTILE). For our purposes, it is likely more efficient
+        window1 = ibis.window(order_by=source_pks)
+        return (ibis.row_number().over(window1) + 1).name(consts.DVT_POS_COL)
+
+    def _get_first_keys(
+        self,
+        source_partition_row_builder: PartitionRowBuilder,
+        target_partition_row_builder: PartitionRowBuilder,
+        rownum_table: ibis.Expr,
+        source_pks: List[str],
+    ):
+        """Return the first element of each partition, numbering every row of the source table.
+
+        Args:
+            source_partition_row_builder, target_partition_row_builder: Builders used to count rows.
+            rownum_table: The primary key columns in the source table along with an additional
+                column with the row number associated with each row.
+            source_pks: The source primary key columns.
+        Returns:
+            A numpy array of the primary key values of the first row of each partition.
+        """
+        # Get Source and Target row Count
+        source_count = source_partition_row_builder.get_count()
+        target_count = target_partition_row_builder.get_count()
+
+        # For some reason Teradata connector returns a dataframe with the count element,
+        # while the other connectors return a numpy.int64 value
+        if isinstance(source_count, pandas.DataFrame):
+            source_count = source_count.values[0][0]
+        if isinstance(target_count, pandas.DataFrame):
+            target_count = target_count.values[0][0]
+
+        if abs(source_count - target_count) > source_count * 0.1:
+            logging.warning(
+                "Source and Target table row counts vary by more than 10%,"
+                "partitioning may result in partitions with very different sizes"
+            )
+
+        # Decide on number of partitions after checking number requested is not > number of rows in source
+        number_of_part = (
+            self.args.partition_num
+            if self.args.partition_num < source_count
+            else source_count
+        )
+
+        # This rather complicated expression below is a filter (where) clause condition that filters the row numbers
+        # that correspond to the first element of the partition. The number of a partition is
+        # ceiling(row number * # of partitions / total number of rows). The first element of the partition is where
+        # the remainder, i.e. row number * # of partitions % total number of rows is > 0 and <= number of partitions.
+        # The remainder function does not work well with Teradata, hence writing that out explicitly.
+        cond = (
+            rownum_table
+            if source_count == number_of_part
+            else (
+                (
+                    rownum_table[consts.DVT_POS_COL] * number_of_part
+                    - (
+                        rownum_table[consts.DVT_POS_COL] * number_of_part / source_count
+                    ).floor()
+                    * source_count
+                )
+                <= number_of_part
+            )
+            & (
+                (
+                    rownum_table[consts.DVT_POS_COL] * number_of_part
+                    - (
+                        rownum_table[consts.DVT_POS_COL] * number_of_part / source_count
+                    ).floor()
+                    * source_count
+                )
+                > 0
+            )
+        )
+        first_keys_table = rownum_table[cond].order_by(source_pks)
+
+        # Up until this point, we have built the table expression, have not executed the query yet.
+        # The query is now executed to find the first element of each partition
+        return first_keys_table.execute().to_numpy()
+
+    def _get_sampled_first_keys(
+        self,
+        client: ibis.backends.base.BaseBackend,
+        keys_table: ibis.Expr,
+        source_pks: List[str],
+    ):
+        """Return the first element of each partition, estimated from a random sample of keys.
+
+        The sample is drawn with the random sort or sample clause of the engine, as for random
+        row filters, so the engine must be one of RANDOM_SORT_SUPPORTS. It is sorted in memory. The first elements are the quantiles of the sample,
+        so partitions are of approximately equal size without a window over the whole table.
+
+        Args:
+            client: The source client.
+            keys_table: The primary key columns in the source table.
+            source_pks: The source primary key columns.
+        Returns:
+            A numpy array of the primary key values of the first row of each partition.
+        """
+        sample_builder = RandomRowBuilder(source_pks, self.args.partition_sample_size)
+        sample = sample_builder.maybe_add_random_sort(client, keys_table).execute()
+        # NULL keys can not be used as partition boundaries.
+        sample = (
+            sample[source_pks]
+            .dropna()
+            .sort_values(source_pks)
+            .drop_duplicates(ignore_index=True)
+        )
+        if sample.empty:
+            raise ValueError("No primary key values found to partition the table")
+
+        number_of_part = min(self.args.partition_num, len(sample))
+        if number_of_part < self.args.partition_num:
+            logging.warning(
+                "Only %s distinct primary key values in the sample, generating %s partitions",
+                len(sample),
+                number_of_part,
+            )
+        positions = [i * len(sample) // number_of_part for i in range(number_of_part)]
+        return sample.iloc[positions].to_numpy()
+
     def _add_partition_filters(
         self,
         partition_filters: List[List[List[str]]],
@@ -0,0 +1,125 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List
+
+import ibis
+
+from data_validation.query_builder.query_builder import (
+    as_hex_string,
+    hash_key,
+    hex_to_int,
+)
+from data_validation.validation_builder import list_to_sublists
+
+HASH_BUCKET_COLUMN = "hash_bucket"
+BUCKET_COUNT_COLUMN = "bucket_count"
+
+# Longest primary key hash prefix used as a bucket, beyond this buckets hold
+# a single row in all practical cases.
+_MAX_PREFIX_LENGTH = 16
+# Most differing buckets split on the next level, more are compared row by row.
+MAX_MISMATCHED_BUCKETS = 10000
+_BUCKET_KEY = "__dvt_bucket_key__"
+_FINGERPRINT = "__dvt_fingerprint__"
+
+
+class HashBucketBuilder(object):
+    def __init__(self, primary_keys: List[str], hash_field: str, buckets: int):
+        """Build a HashBucketBuilder object which compares row hashes by primary key bucket.
+
+        Rows are assigned to buckets by the leading hex digits of a hash of
+        their primary key. Each level of the drill-down uses more digits, so
+        every bucket is split into `buckets` child buckets.
+
+        Args:
+            primary_keys: A list of primary key aliases used to bucket rows.
+            hash_field: The alias of the row hash column, i.e. hash__all.
+            buckets: The number of child buckets per level, 16, 256 or 4096.
+        """
+        self.primary_keys = primary_keys
+        self.hash_field = hash_field
+        self.digits_per_level = len(f"{buckets - 1:x}")
+        if 16**self.digits_per_level != buckets:
+            raise ValueError(
+                f"Hash buckets must be a power of 16, e.g. 16, 256 or 4096: {buckets}"
+            )
+        self.max_depth = _MAX_PREFIX_LENGTH // self.digits_per_level
+
+    def compile_buckets(
+        self,
+        query: ibis.Expr,
+        depth: int,
+        prefixes: List[str] = None,
+        max_in_list_size: int = None,
+    ) -> ibis.Expr:
+        """Return an Ibis query object with the row count and fingerprint per bucket.
+
+        Args:
+            query (IbisTable): The row validation query, with primary keys and hash_field.
+            depth (Int): The drill-down level, starting at 1.
+            prefixes (List[Str]): The parent buckets to split, None for all rows.
+            max_in_list_size (Int): The max number of values in a single IN list.
+        """
+        table = self._filter_buckets(query, depth - 1, prefixes, max_in_list_size)
+        table = table.mutate(
+            **{
+                HASH_BUCKET_COLUMN: table[_BUCKET_KEY].substr(
+                    0, depth * self.digits_per_level
+                ),
+                _FINGERPRINT: hex_to_int(as_hex_string(table[self.hash_field])),
+            }
+        )
+        return table.group_by(HASH_BUCKET_COLUMN).aggregate(
+            [
+                table.count().name(BUCKET_COUNT_COLUMN),
+                table[_FINGERPRINT].sum().name(self.hash_field),
+            ]
+        )
+
+    def compile_rows(
+        self,
+        query: ibis.Expr,
+        depth: int,
+        prefixes: List[str],
+        max_in_list_size: int = None,
+    ) -> ibis.Expr:
+        """Return an Ibis query object with the rows of the given buckets.
+
+        Args:
+            query (IbisTable): The row validation query, with primary keys and hash_field.
+            depth (Int): The drill-down level the buckets belong to.
+            prefixes (List[Str]): The buckets to read rows from.
+            max_in_list_size (Int): The max number of values in a single IN list.
+        """
+        table = self._filter_buckets(query, depth, prefixes, max_in_list_size)
+        return table[query.columns]
+
+    def _filter_buckets(self, query, depth, prefixes, max_in_list_size):
+        key_hash = hash_key([query[key] for key in self.primary_keys])
+        table = query.mutate(**{_BUCKET_KEY: as_hex_string(key_hash)})
+        if prefixes is None:
+            return table
+
+        bucket = table[_BUCKET_KEY].substr(0, depth * self.digits_per_level)
+        if max_in_list_size and len(prefixes) > max_in_list_size:
+            condition = ibis.or_(
+                *[
+                    bucket.isin(sublist)
+                    for sublist in list_to_sublists(prefixes, max_in_list_size)
+                ]
+            )
+        else:
+            condition = bucket.isin(prefixes)
+        return table.filter(condition)
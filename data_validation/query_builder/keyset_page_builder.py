@@ -0,0 +1,77 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List
+
+import ibis
+import pandas
+
+
+class KeysetPageBuilder(object):
+    def __init__(self, primary_keys: List[str], page_size: int):
+        """Build a KeysetPageBuilder object which pages through a row validation query.
+
+        Pages are read in primary key order and each page starts after the last
+        key of the previous one, so no page requires an OFFSET scan.
+
+        Args:
+            primary_keys: A list of primary key aliases used to order and page rows.
+            page_size: The max number of rows to read per page.
+        """
+        self.primary_keys = primary_keys
+        self.page_size = page_size
+
+    def compile(
+        self, query: ibis.Expr, after: tuple = None, upto: tuple = None, limit=True
+    ) -> ibis.Expr:
+        """Return an Ibis query object for a single page of the given query.
+
+        Args:
+            query (IbisTable): The row validation query to page through.
+            after (Tuple): Only return rows with keys greater than this key.
+            upto (Tuple): Only return rows with keys less than or equal to this key.
+            limit (Bool): Whether to limit the page to page_size rows.
+        """
+        if after is not None:
+            query = query.filter(self._greater_than(query, after))
+        if upto is not None:
+            query = query.filter(~self._greater_than(query, upto))
+        query = query.order_by(self.primary_keys)
+        if limit:
+            query = query.limit(self.page_size)
+        return query
+
+    def last_key(self, page_df: pandas.DataFrame) -> tuple:
+        """Return the key of the last row in an executed page."""
+        last_row = page_df.iloc[-1]
+        return tuple(_to_python(last_row[key]) for key in self.primary_keys)
+
+    def _greater_than(self, query: ibis.Expr, key: tuple) -> ibis.Expr:
+        """Return a row value comparison (k1, k2, ...) > (v1, v2, ...)."""
+        conditions = []
+        for position, key_name in enumerate(self.primary_keys):
+            condition = query[key_name] > key[position]
+            for previous_name, previous_value in zip(
+                self.primary_keys[:position], key[:position]
+            ):
+                condition = condition & (query[previous_name] == previous_value)
+            conditions.append(condition)
+        return ibis.or_(*conditions)
+
+
+def _to_python(value):
+    """Convert numpy scalars to Python values so they can be used as Ibis literals."""
+    if isinstance(value, pandas.Timestamp):
+        return value.to_pydatetime()
+    return value.item() if hasattr(value, "item") else value
@@ -62,9 +62,7 @@ class PartitionRowBuilder(object):
             table = clients.get_ibis_table(data_client, schema_name, table_name)
         else:
             table = clients.get_ibis_query(data_client, custom_query)
-        compiled_filters = query_builder.compile_filter_fields(table)
-        filtered_table = table.filter(compiled_filters) if compiled_filters else table
-        return filtered_table
+        return query_builder.filter_table(table)
 
     def get_count(self) -> int:
         """Return a count of rows of primary keys - they should be all distinct"""
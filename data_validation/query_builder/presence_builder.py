@@ -0,0 +1,129 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List, Tuple
+
+import ibis
+import numpy
+import pandas
+
+from data_validation.validation_builder import list_to_sublists
+
+
+class PresenceBuilder(object):
+    def __init__(self, primary_keys: List[str]):
+        """Build a PresenceBuilder object which finds rows missing from either side.
+
+        Only the primary keys of both sides are read to find the missing rows,
+        the rows themselves are then read by key.
+
+        Args:
+            primary_keys: A list of primary key aliases used to match rows.
+        """
+        self.primary_keys = primary_keys
+
+    def compile_keys(self, query: ibis.Expr) -> ibis.Expr:
+        """Return an Ibis query object with only the primary keys of the query."""
+        return query[self.primary_keys]
+
+    def missing_keys(
+        self, source_keys: pandas.DataFrame, target_keys: pandas.DataFrame
+    ) -> Tuple[pandas.DataFrame, pandas.DataFrame]:
+        """Return the keys only present in the source and only present in the target.
+
+        Keys with a NULL value can not be read back by key, they are never
+        returned as missing and are left to the comparison of the other rows.
+
+        Args:
+            source_keys (DataFrame): The primary keys of the source rows.
+            target_keys (DataFrame): The primary keys of the target rows.
+        """
+        source_codes, target_codes = self._key_codes(source_keys, target_keys)
+        source_only = ~numpy.isin(source_codes, target_codes, kind="sort")
+        target_only = ~numpy.isin(target_codes, source_codes, kind="sort")
+        source_only &= source_keys.notna().all(axis=1).to_numpy()
+        target_only &= target_keys.notna().all(axis=1).to_numpy()
+        return source_keys[source_only], target_keys[target_only]
+
+    def contains(self, rows: pandas.DataFrame, keys: pandas.DataFrame) -> numpy.ndarray:
+        """Return a boolean mask of the rows with one of the given keys."""
+        row_codes, key_codes = self._key_codes(rows, keys)
+        return numpy.isin(row_codes, key_codes, kind="sort")
+
+    def compile_rows(
+        self,
+        query: ibis.Expr,
+        keys: pandas.DataFrame,
+        max_in_list_size: int = None,
+    ) -> ibis.Expr:
+        """Return an Ibis query object with the rows of the given keys.
+
+        Composite keys are filtered column by column, which can return extra
+        rows to be removed with `contains`.
+
+        Args:
+            query (IbisTable): The row validation query, with the primary keys.
+            keys (DataFrame): The primary keys of the rows to read.
+            max_in_list_size (Int): The max number of values in a single IN list.
+        """
+        if keys.empty:
+            return query.limit(0)
+        return query.filter(
+            [
+                self._isin(query[key], keys[key], max_in_list_size)
+                for key in self.primary_keys
+            ]
+        )
+
+    def compile_excluding(
+        self,
+        query: ibis.Expr,
+        keys: pandas.DataFrame,
+        max_in_list_size: int = None,
+    ) -> ibis.Expr:
+        """Return an Ibis query object without the rows of the given keys.
+
+        Rows are only excluded in the query for a single primary key, rows of
+        composite keys must be removed with `contains`.
+
+        Args:
+            query (IbisTable): The row validation query, with the primary keys.
+            keys (DataFrame): The primary keys of the rows to exclude.
+            max_in_list_size (Int): The max number of values in a single IN list.
+        """
+        if keys.empty or len(self.primary_keys) > 1:
+            return query
+        key = self.primary_keys[0]
+        return query.filter(~self._isin(query[key], keys[key], max_in_list_size))
+
+    @staticmethod
+    def _isin(column, values, max_in_list_size):
+        values = values.drop_duplicates().tolist()
+        if max_in_list_size and len(values) > max_in_list_size:
+            return ibis.or_(
+                *[
+                    column.isin(sublist)
+                    for sublist in list_to_sublists(values, max_in_list_size)
+                ]
+            )
+        return column.isin(values)
+
+    def _key_codes(self, left: pandas.DataFrame, right: pandas.DataFrame):
+        """Return integer codes for the keys of both frames, equal keys share a code."""
+        codes = numpy.zeros(len(left) + len(right), dtype=numpy.int64)
+        for key in self.primary_keys:
+            values = pandas.concat([left[key], right[key]], ignore_index=True)
+            key_codes, uniques = pandas.factorize(values, use_na_sentinel=False)
+            codes, _ = pandas.factorize(codes * len(uniques) + key_codes)
+        return codes[: len(left)], codes[len(left) :]
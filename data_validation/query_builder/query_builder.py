@@ -18,6 +18,13 @@ from data_validation import consts
 from ibis.expr.types import StringScalar
 from third_party.ibis.ibis_addon import api, operations
 
+# Hex digits of a hash converted to an integer. Seven digits (28 bits) keep
+# the value inside a 32 bit integer on every engine.
+HASH_INT_DIGITS = 7
+_HEX_DIGITS = "0123456789abcdef"
+# Column holding the primary key hash of each row while shard filters are applied.
+_SHARD_HASH = "__dvt_shard_hash__"
+
 
 class AggregateField(object):
     def __init__(self, ibis_expr, field_name=None, alias=None, cast=None):
@@ -156,6 +163,13 @@ class FilterField(object):
             ibis.expr.types.ColumnExpr.__lt__, left_field=field_name, right=value
         )
 
+    @staticmethod
+    def less_than_or_equal_to(field_name, value):
+        # Build Left and Right Objects
+        return FilterField(
+            ibis.expr.types.ColumnExpr.__le__, left_field=field_name, right=value
+        )
+
     @staticmethod
     def equal_to(field_name, value):
         # Build Left and Right Objects
@@ -179,10 +193,28 @@ class FilterField(object):
         """
         return FilterField(None, left=expr)
 
+    @staticmethod
+    def shard(fields: list, index: int, count: int):
+        """Returns a FilterField instance for the rows of one of count shards.
+
+        Rows are assigned to shards by a SHA256 hash of their primary key, which
+        is computed the same way on every engine for integer and string keys.
+
+        Args:
+            fields (List[ComparisonField]): The primary key fields.
+            index (Int): The shard to keep, from 0 to count - 1.
+            count (Int): The number of shards.
+        """
+        return FilterField(_in_shard, left=fields, right=(index, count))
+
     @staticmethod
     def or_(field_list: list):
         return FilterField(ibis.or_, left=field_list)
 
+    @staticmethod
+    def and_(field_list: list):
+        return FilterField(ibis.and_, left=field_list)
+
     def compile(self, ibis_table):
         if self.expr is None:
             return operations.compile_raw_sql(ibis_table, self.left)
@@ -193,12 +225,63 @@ class FilterField(object):
         if self.right_field:
             self.right = ibis_table[self.right_field]
 
-        if self.expr == ibis.or_:
+        if self.expr in (ibis.or_, ibis.and_):
             return self.expr(*[_.compile(ibis_table) for _ in self.left])
+        elif self.expr is _in_shard:
+            return self.expr(ibis_table, self.left, *self.right)
         else:
             return self.expr(self.left, self.right)
 
 
+def _in_shard(ibis_table, fields, index, count):
+    if _SHARD_HASH in ibis_table.columns:
+        key_hash = ibis_table[_SHARD_HASH]
+    else:
+        key_hash = _shard_hash(ibis_table, fields)
+    return hex_to_int(key_hash) % count == index
+
+
+def _shard_hash(ibis_table, fields):
+    columns = [_.compile(ibis_table) for _ in fields]
+    for column in columns:
+        # Other types, e.g. timestamps, decimals and floats, are cast to strings
+        # differently by each engine so would not hash the same.
+        if not (column.type().is_integer() or column.type().is_string()):
+            raise ValueError(
+                f"Shards require integer or string primary keys, "
+                f"{column.get_name()} is {column.type()}"
+            )
+    return as_hex_string(hash_key(columns))
+
+
+def hash_key(columns: list) -> ibis.Expr:
+    """Return a SHA256 hash of the key columns joined as strings."""
+    key = ibis.literal("|").join([_.cast("string").fillna("") for _ in columns])
+    return key.hashbytes("sha256")
+
+
+def as_hex_string(hash_value: ibis.Expr) -> ibis.Expr:
+    """Return a hash as a string expression, hashes are typed as binary by Ibis."""
+    if hash_value.type().is_binary():
+        return hash_value.hash_string()
+    return hash_value
+
+
+def hex_to_int(hex_value: ibis.Expr, digits: int = HASH_INT_DIGITS) -> ibis.Expr:
+    """Return the integer value of the leading hex digits of a hash.
+
+    A CASE per digit is used rather than engine specific hex conversions.
+    """
+    value = None
+    for position in range(digits):
+        digit = hex_value.substr(position, 1).lower().case()
+        for digit_value, hex_digit in enumerate(_HEX_DIGITS):
+            digit = digit.when(hex_digit, digit_value)
+        digit = digit.else_(0).end().cast("int64")
+        value = digit if value is None else value * 16 + digit
+    return value
+
+
 class ComparisonField(object):
     def __init__(
         self, field_name: str, alias: str = None, cast: str = None, trim: bool = None
@@ -488,6 +571,23 @@ class QueryBuilder(object):
     def compile_filter_fields(self, table):
         return [field.compile(table) for field in self.filters]
 
+    def filter_table(self, table):
+        """Return the table filtered by the filter fields.
+
+        The primary key hash of a shard filter is projected once, in a subquery,
+        rather than being computed again for each of its hex digits.
+        """
+        shard_filters = [_ for _ in self.filters if _.expr is _in_shard]
+        if shard_filters:
+            hashed_table = table.mutate(
+                **{_SHARD_HASH: _shard_hash(table, shard_filters[0].left)}
+            )
+            return hashed_table.filter(self.compile_filter_fields(hashed_table))[
+                table.columns
+            ]
+        compiled_filters = self.compile_filter_fields(table)
+        return table.filter(compiled_filters) if compiled_filters else table
+
     def compile_group_fields(self, table):
         return [field.compile(table) for field in self.grouped_fields]
 
@@ -517,8 +617,7 @@ class QueryBuilder(object):
         """
 
         # Build Query Expressions
-        compiled_filters = self.compile_filter_fields(table)
-        filtered_table = table.filter(compiled_filters) if compiled_filters else table
+        filtered_table = self.filter_table(table)
 
         if self.calculated_fields:
             depth_limit = max(
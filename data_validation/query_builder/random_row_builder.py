@@ -62,8 +62,7 @@ class RandomRowBuilder(object):
             table_name (String): The name of the table to query.
         """
         table = clients.get_ibis_table(data_client, schema_name, table_name)
-        compiled_filters = query_builder.compile_filter_fields(table)
-        filtered_table = table.filter(compiled_filters) if compiled_filters else table
+        filtered_table = query_builder.filter_table(table)
         randomly_sorted_table = self.maybe_add_random_sort(data_client, filtered_table)
 
         return randomly_sorted_table
@@ -14,14 +14,25 @@
 
 """Output validation report to BigQuery tables"""
 
+import io
 import logging
+import threading
+
+import pandas
+import pyarrow
+import pyarrow.parquet
 
 from data_validation import clients
+from data_validation.result_handlers import parquet as parquet_handler
 from data_validation.result_handlers import text as text_handler
 
 
 BQRH_WRITE_MESSAGE = "Results written to BigQuery"
 
+# Buffered handlers shared by all validations of a process, see get_buffered_handler().
+_BUFFERED_HANDLERS = {}
+_BUFFERED_HANDLERS_LOCK = threading.Lock()
+
 
 class BigQueryResultHandler(object):
     """Write results of data validation to BigQuery.
@@ -32,6 +43,10 @@ class BigQueryResultHandler(object):
         table_id (str):
             Fully-qualified table ID (``project-id.dataset.table``) of
             destination table for results.
+        load_job_rows (int):
+            When set, results are buffered and written with a Parquet load job
+            once this many rows are buffered or when flush() is called, instead
+            of a streaming insert per validation.
     """
 
     def __init__(
@@ -40,11 +55,17 @@ class BigQueryResultHandler(object):
         status_list: list = None,
         table_id: str = "pso_data_validator.results",
         text_format: str = "table",
+        load_job_rows: int = None,
     ):
         self._bigquery_client = bigquery_client
         self._table_id = table_id
         self._status_list = status_list
         self._text_format = text_format
+        self._load_job_rows = load_job_rows
+        self._table = None
+        self._buffer = []
+        self._buffered_rows = 0
+        self._flushed_callbacks = []
 
     @staticmethod
     def get_handler_for_project(
@@ -54,6 +75,7 @@ class BigQueryResultHandler(object):
         credentials=None,
         api_endpoint: str = None,
         text_format: str = "table",
+        load_job_rows: int = None,
     ):
         """Return BigQueryResultHandler instance for given project.
 
@@ -68,6 +90,7 @@ class BigQueryResultHandler(object):
             text_format (str, optional):
                 This allows the user to influence the text results written via logger.debug.
                 See: https://github.com/GoogleCloudPlatform/professional-services-data-validator/issues/871
+            load_job_rows (int): Buffer results and write them with load jobs of this many rows.
         """
         client = clients.get_google_bigquery_client(
             project_id, credentials=credentials, api_endpoint=api_endpoint
@@ -77,41 +100,54 @@ class BigQueryResultHandler(object):
             status_list=status_list,
             table_id=table_id,
             text_format=text_format,
+            load_job_rows=load_job_rows,
         )
 
+    @staticmethod
+    def get_buffered_handler(project_id, key_path: str = None, **kwargs):
+        """Return a buffered BigQueryResultHandler shared by the validations of a run.
+
+        The first request builds the handler, later requests with the same
+        arguments return the same handler so results of all validations are
+        written by as few load jobs as possible. Buffered results are written by
+        flush_buffered_handlers().
+
+        Args:
+            project_id (str): Project ID used for validation results.
+            key_path (str): Path of the SA key file of the credentials, identifies the handler.
+            kwargs: Other arguments of get_handler_for_project().
+        """
+        handler_key = (project_id, key_path) + tuple(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in sorted(kwargs.items())
+            if name != "credentials"
+        )
+        with _BUFFERED_HANDLERS_LOCK:
+            if handler_key not in _BUFFERED_HANDLERS:
+                _BUFFERED_HANDLERS[
+                    handler_key
+                ] = BigQueryResultHandler.get_handler_for_project(project_id, **kwargs)
+            return _BUFFERED_HANDLERS[handler_key]
+
+    def _get_table(self):
+        """Return the results table, its metadata is only fetched once per handler."""
+        if self._table is None:
+            self._table = self._bigquery_client.get_table(self._table_id)
+        return self._table
+
     def execute(self, result_df):
         if self._status_list is not None:
             result_df = text_handler.filter_validation_status(
                 self._status_list, result_df
             )
 
-        table = self._bigquery_client.get_table(self._table_id)
-        chunk_errors = self._bigquery_client.insert_rows_from_dataframe(
-            table, result_df
-        )
-        if any(chunk_errors):
-            if (
-                chunk_errors[0][0]["errors"][0]["message"]
-                == "no such field: validation_status."
-            ):
-                raise RuntimeError(
-                    f"Please update your BigQuery results table schema using the script : samples/bq_utils/rename_column_schema.sh.\n"
-                    f"The latest release of DVT has updated the column name 'status' to 'validation_status': {chunk_errors}"
-                )
-            elif (
-                chunk_errors[0][0]["errors"][0]["message"]
-                == "no such field: primary_keys."
-            ):
-                raise RuntimeError(
-                    f"Please update your BigQuery results table schema using the script : samples/bq_utils/add_columns_schema.sh.\n"
-                    f"The latest release of DVT has added two fields 'primary_keys' and 'num_random_rows': {chunk_errors}"
-                )
-            raise RuntimeError(f"Could not write rows: {chunk_errors}")
-
-        if result_df.empty:
-            logging.info("No results to write to BigQuery")
+        if self._load_job_rows:
+            self._buffer.append(result_df)
+            self._buffered_rows += len(result_df)
+            if self._buffered_rows >= self._load_job_rows:
+                self.flush()
         else:
-            logging.info(f'{BQRH_WRITE_MESSAGE}, run id: {result_df.iloc[0]["run_id"]}')
+            self._insert_rows(result_df)
 
         # Handler also logs results after saving to BigQuery.
         logger = logging.getLogger()
@@ -122,3 +158,110 @@ class BigQueryResultHandler(object):
             )
 
         return result_df
+
+    def _insert_rows(self, result_df):
+        """Write results with a streaming insert."""
+        chunk_errors = self._bigquery_client.insert_rows_from_dataframe(
+            self._get_table(), result_df
+        )
+        if any(chunk_errors):
+            _raise_write_error(chunk_errors[0][0]["errors"][0]["message"], chunk_errors)
+        _log_written(result_df)
+
+    def on_flushed(self, callback):
+        """Call callback once the results passed to execute() so far are written.
+
+        Unbuffered results are written by execute(), so callback is called
+        right away unless results are buffered.
+        """
+        if self._buffer:
+            self._flushed_callbacks.append(callback)
+        else:
+            callback()
+
+    def flush(self):
+        """Write buffered results to BigQuery with a single Parquet load job."""
+        if not self._buffer:
+            return
+        result_df = pandas.concat(self._buffer, ignore_index=True)
+        callbacks = self._flushed_callbacks
+        self._buffer = []
+        self._buffered_rows = 0
+        self._flushed_callbacks = []
+        if result_df.empty:
+            _log_written(result_df)
+        else:
+            self._load_rows(result_df)
+        for callback in callbacks:
+            callback()
+
+    def _load_rows(self, result_df):
+        """Write results with a Parquet load job."""
+        from google.cloud import bigquery
+
+        table = self._get_table()
+        field_names = {field.name for field in table.schema}
+        for column in result_df.columns:
+            if column not in field_names:
+                _raise_write_error(f"no such field: {column}.", column)
+
+        # The Parquet types must match the table, e.g. labels are a repeated
+        # record and timestamps are in microseconds.
+        schema = pyarrow.schema(
+            [
+                field
+                for field in parquet_handler.RESULTS_SCHEMA
+                if field.name in field_names
+            ]
+        )
+        parquet_file = io.BytesIO()
+        pyarrow.parquet.write_table(
+            parquet_handler.results_to_arrow(result_df, schema), parquet_file
+        )
+        parquet_file.seek(0)
+        parquet_options = bigquery.ParquetOptions()
+        parquet_options.enable_list_inference = True
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+            parquet_options=parquet_options,
+        )
+        load_job = self._bigquery_client.load_table_from_file(
+            parquet_file, table, job_config=job_config
+        )
+        try:
+            load_job.result()
+        except Exception as e:
+            raise RuntimeError(f"Could not load rows: {e}") from e
+        _log_written(result_df)
+
+
+def _raise_write_error(message, errors):
+    if message == "no such field: validation_status.":
+        raise RuntimeError(
+            f"Please update your BigQuery results table schema using the script : samples/bq_utils/rename_column_schema.sh.\n"
+            f"The latest release of DVT has updated the column name 'status' to 'validation_status': {errors}"
+        )
+    elif message == "no such field: primary_keys.":
+        raise RuntimeError(
+            f"Please update your BigQuery results table schema using the script : samples/bq_utils/add_columns_schema.sh.\n"
+            f"The latest release of DVT has added two fields 'primary_keys' and 'num_random_rows': {errors}"
+        )
+    raise RuntimeError(f"Could not write rows: {errors}")
+
+
+def _log_written(result_df):
+    if result_df.empty:
+        logging.info("No results to write to BigQuery")
+    else:
+        for run_id in result_df["run_id"].unique():
+            logging.info(f"{BQRH_WRITE_MESSAGE}, run id: {run_id}")
+
+
+def flush_buffered_handlers():
+    """Write the results of all buffered handlers and forget the handlers."""
+    with _BUFFERED_HANDLERS_LOCK:
+        handlers = list(_BUFFERED_HANDLERS.values())
+        _BUFFERED_HANDLERS.clear()
+    for handler in handlers:
+        handler.flush()
@@ -0,0 +1,242 @@
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Output validation report to a partitioned Parquet dataset.
+
+Results are laid out in Hive style directories, by run id or date and then by
+source table, for example:
+
+    results/run_date=2024-01-31/source_table_name=my_schema.my_table/part-<uuid>.parquet
+
+Partition columns are stored in the directory names only, as expected by
+Hive partitioning. Each handler keeps one open Parquet writer per partition and
+appends every result frame as new row groups, so results are not accumulated
+in memory. The dataset can be read back with pyarrow.dataset or
+pandas.read_parquet.
+"""
+
+import logging
+import os
+import threading
+import urllib.parse
+import uuid
+
+import pyarrow
+import pyarrow.parquet
+
+from data_validation import consts
+from data_validation.result_handlers import text as text_handler
+
+PQRH_WRITE_MESSAGE = "Results written to Parquet"
+
+_DATE_PARTITION = "run_date"
+_TABLE_PARTITION = "source_table_name"
+
+# Columns of the BigQuery results table, see terraform/results_schema.json.
+RESULTS_SCHEMA = pyarrow.schema(
+    [
+        ("run_id", pyarrow.string()),
+        ("validation_name", pyarrow.string()),
+        ("validation_type", pyarrow.string()),
+        ("start_time", pyarrow.timestamp("us", tz="UTC")),
+        ("end_time", pyarrow.timestamp("us", tz="UTC")),
+        ("source_table_name", pyarrow.string()),
+        ("target_table_name", pyarrow.string()),
+        ("source_column_name", pyarrow.string()),
+        ("target_column_name", pyarrow.string()),
+        ("aggregation_type", pyarrow.string()),
+        ("group_by_columns", pyarrow.string()),
+        ("primary_keys", pyarrow.string()),
+        ("num_random_rows", pyarrow.int64()),
+        ("source_agg_value", pyarrow.string()),
+        ("target_agg_value", pyarrow.string()),
+        ("difference", pyarrow.float64()),
+        ("pct_difference", pyarrow.float64()),
+        ("pct_threshold", pyarrow.float64()),
+        ("validation_status", pyarrow.string()),
+        (
+            "labels",
+            pyarrow.list_(
+                pyarrow.struct([("key", pyarrow.string()), ("value", pyarrow.string())])
+            ),
+        ),
+    ]
+)
+
+# Handlers shared by all validations of a process, see get_shared_handler().
+_SHARED_HANDLERS = {}
+_SHARED_HANDLERS_LOCK = threading.Lock()
+
+
+class ParquetResultHandler(object):
+    """Write results of data validation to a partitioned Parquet dataset.
+
+    Arguments:
+        directory (str):
+            Local directory of the Parquet dataset, created if it does not exist.
+        status_list (list):
+            Provided status to filter the results with.
+        partition_by (str):
+            Partition results by "date" of the run or by "run_id", and then by source table.
+        text_format (str):
+            Format of the text results written via logger.debug.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        status_list: list = None,
+        partition_by: str = consts.PARTITION_BY_DATE,
+        text_format: str = "table",
+    ):
+        if partition_by not in consts.PARTITION_BY_CHOICES:
+            raise ValueError(
+                f"Unknown Parquet result partitioning: {partition_by}, "
+                f"supported values are {consts.PARTITION_BY_CHOICES}"
+            )
+        self._directory = directory
+        self._status_list = status_list
+        self._partition_by = partition_by
+        self._text_format = text_format
+        self._file_name = f"part-{uuid.uuid4().hex}.parquet"
+        partition_columns = [_TABLE_PARTITION]
+        if partition_by == consts.PARTITION_BY_RUN_ID:
+            partition_columns.append("run_id")
+        self._schema = pyarrow.schema(
+            [field for field in RESULTS_SCHEMA if field.name not in partition_columns]
+        )
+        self._writers = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_shared_handler(directory: str, **kwargs):
+        """Return a ParquetResultHandler shared by the validations of a run.
+
+        Sharing a handler lets all validations of a run append to the same
+        files. Writers are closed by close_shared_handlers().
+        """
+        handler_key = (directory,) + tuple(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in sorted(kwargs.items())
+        )
+        with _SHARED_HANDLERS_LOCK:
+            if handler_key not in _SHARED_HANDLERS:
+                _SHARED_HANDLERS[handler_key] = ParquetResultHandler(
+                    directory, **kwargs
+                )
+            return _SHARED_HANDLERS[handler_key]
+
+    def execute(self, result_df):
+        if self._status_list is not None:
+            result_df = text_handler.filter_validation_status(
+                self._status_list, result_df
+            )
+
+        if result_df.empty:
+            logging.info("No results to write to Parquet")
+        else:
+            self._write(result_df)
+            for run_id in result_df["run_id"].unique():
+                logging.info(
+                    f"{PQRH_WRITE_MESSAGE} in {self._directory}, run id: {run_id}"
+                )
+
+        # Handler also logs results after saving to Parquet.
+        logger = logging.getLogger()
+        if logger.isEnabledFor(logging.DEBUG):
+            # Checking log level to avoid evaluating a large Dataframe that will never be logged.
+            logging.debug(
+                text_handler.get_formatted(result_df, format=self._text_format)
+            )
+
+        return result_df
+
+    def _write(self, result_df):
+        """Append the results as new row groups of the file of each partition."""
+        if self._partition_by == consts.PARTITION_BY_DATE:
+            partition_values = result_df["start_time"].map(
+                lambda start_time: f"{_DATE_PARTITION}={start_time:%Y-%m-%d}"
+            )
+        else:
+            partition_values = "run_id=" + result_df["run_id"].map(
+                _escape_partition_value
+            )
+        partition_values = (
+            partition_values
+            + f"/{_TABLE_PARTITION}="
+            + result_df[_TABLE_PARTITION].map(_escape_partition_value)
+        )
+
+        with self._lock:
+            for partition, partition_df in result_df.groupby(
+                partition_values, sort=False
+            ):
+                self._get_writer(partition).write_table(
+                    results_to_arrow(partition_df, self._schema)
+                )
+
+    def _get_writer(self, partition: str):
+        if partition not in self._writers:
+            partition_dir = os.path.join(self._directory, *partition.split("/"))
+            os.makedirs(partition_dir, exist_ok=True)
+            self._writers[partition] = pyarrow.parquet.ParquetWriter(
+                os.path.join(partition_dir, self._file_name), self._schema
+            )
+        return self._writers[partition]
+
+    def close(self):
+        """Close the open Parquet files, which completes them for readers."""
+        with self._lock:
+            for writer in self._writers.values():
+                writer.close()
+            self._writers = {}
+
+
+def _escape_partition_value(value) -> str:
+    """Return a URI encoded partition value, as decoded by pyarrow Hive partitioning."""
+    if value is None or value != value:
+        return "__HIVE_DEFAULT_PARTITION__"
+    return urllib.parse.quote(str(value), safe="")
+
+
+def results_to_arrow(result_df, schema: pyarrow.Schema) -> pyarrow.Table:
+    """Return the results as a table of the schema, extra columns are dropped."""
+    arrays = []
+    for field in schema:
+        if field.name not in result_df:
+            arrays.append(pyarrow.nulls(len(result_df), type=field.type))
+            continue
+        values = result_df[field.name]
+        if field.name == "labels":
+            values = [
+                [{"key": key, "value": value} for key, value in labels]
+                if labels is not None
+                else None
+                for labels in values
+            ]
+        elif pyarrow.types.is_string(field.type):
+            values = values.map(
+                lambda value: None if value is None or value != value else str(value)
+            )
+        arrays.append(pyarrow.array(values, type=field.type, from_pandas=True))
+    return pyarrow.Table.from_arrays(arrays, schema=schema)
+
+
+def close_shared_handlers():
+    """Close the files of all shared handlers and forget the handlers."""
+    with _SHARED_HANDLERS_LOCK:
+        handlers = list(_SHARED_HANDLERS.values())
+        _SHARED_HANDLERS.clear()
+    for handler in handlers:
+        handler.close()
@@ -0,0 +1,98 @@
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import hashlib
+import json
+import logging
+import re
+import uuid
+from typing import Dict, List
+
+from data_validation import state_manager
+
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+
+
+class RunManifest(object):
+    def __init__(
+        self,
+        config_dir: str,
+        resume: bool = False,
+        mgr: state_manager.StateManager = None,
+        run_args: Dict = None,
+    ):
+        """Build a RunManifest which records the status of each file of a config directory run.
+
+        The entry of each file is stored by the StateManager once the file
+        completes, so a run which stopped part way can be resumed. Entries
+        are tagged with the id of their run, only the entries of the latest
+        run of the manifest are resumed.
+
+        Args:
+            config_dir (String): The local or GCS directory of the YAML files.
+            resume (Bool): Continue the latest run of the manifest.
+            mgr (StateManager): The StateManager storing the manifest.
+            run_args (Dict): Arguments telling runs of the directory apart, e.g. the
+                shard. Runs with other arguments have a manifest of their own.
+        """
+        self.mgr = mgr or state_manager.StateManager()
+        self.name = re.sub(r"[^\w.-]", "_", config_dir.rstrip("/"))
+        if run_args:
+            run_hash = hashlib.sha256(
+                json.dumps(run_args, sort_keys=True).encode("utf-8")
+            ).hexdigest()
+            self.name = f"{self.name}.{run_hash[:12]}"
+
+        latest_run = self.mgr.get_latest_run(self.name) if resume else None
+        if latest_run:
+            self.run_id = latest_run["run_id"]
+            self.files = {
+                file_name: entry
+                for file_name, entry in (
+                    self.mgr.get_run_manifest(self.name) or {}
+                ).items()
+                if entry.get("run_id") == self.run_id
+            }
+        else:
+            # Entries of earlier runs are left in place, they are told apart by run id.
+            self.run_id = str(uuid.uuid4())
+            self.mgr.create_latest_run(self.name, {"run_id": self.run_id})
+            self.files = {}
+
+    def pending(self, config_file_names: List[str]) -> List[str]:
+        """Return the files which did not succeed in a previous run."""
+        pending = [
+            file_name
+            for file_name in config_file_names
+            if self.files.get(file_name, {}).get("status") != STATUS_SUCCESS
+        ]
+        if len(pending) < len(config_file_names):
+            logging.info(
+                "Resuming run, skipping %s YAML files which already succeeded",
+                len(config_file_names) - len(pending),
+            )
+        return pending
+
+    def record(self, file_name: str, elapsed: float = None, error: Exception = None):
+        """Record the status of a file and store its manifest entry."""
+        self.files[file_name] = {
+            "status": STATUS_FAILED if error else STATUS_SUCCESS,
+            "run_id": self.run_id,
+            "end_time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "elapsed_seconds": round(elapsed, 2) if elapsed is not None else None,
+            "error": str(error) if error else None,
+        }
+        self.mgr.create_run_manifest_entry(self.name, file_name, self.files[file_name])
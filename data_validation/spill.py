@@ -0,0 +1,244 @@
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Spill row validation results to local disk to compare tables larger than memory.
+
+Source and target rows are streamed from the databases and hash partitioned by
+primary key into Arrow IPC files in a temporary directory. Rows with equal keys
+always land in the same partition, so partitions can be compared one at a time.
+Partitions are loaded a few at a time within a memory budget, and partitions
+larger than the budget, for example due to skewed keys, are partitioned again.
+"""
+
+import decimal
+import logging
+import os
+import tempfile
+from typing import TYPE_CHECKING, Iterator, List, Tuple
+
+import numpy
+import pandas
+import pyarrow
+import pyarrow.feather
+
+if TYPE_CHECKING:
+    import ibis.expr.types as ir
+
+SOURCE = "source"
+TARGET = "target"
+
+# Partitions per level and the number of times an oversized partition is split.
+PARTITIONS = 64
+MAX_PARTITION_LEVELS = 3
+# Rows fetched from the databases per batch.
+BATCH_ROWS = 100_000
+
+
+def iter_query_batches(
+    client, query: "ir.Table", batch_rows: int = BATCH_ROWS
+) -> Iterator[pandas.DataFrame]:
+    """Yield the results of a query in DataFrames of up to batch_rows rows.
+
+    Backends which cannot stream results have the whole result read first.
+    """
+    try:
+        reader = client.to_pyarrow_batches(query, chunk_size=batch_rows)
+        batches = iter(reader)
+        first_batch = next(batches, None)
+    except Exception as e:
+        logging.debug("Unable to stream results, reading them at once: %s", e)
+        df = client.execute(query)
+        for start in range(0, max(len(df), 1), batch_rows):
+            yield df.iloc[start : start + batch_rows]
+        return
+
+    if first_batch is None:
+        yield reader.schema.empty_table().to_pandas()
+        return
+    yield first_batch.to_pandas()
+    for batch in batches:
+        yield batch.to_pandas()
+
+
+def partition_ids(
+    df: pandas.DataFrame, key_columns: List[str], partitions: int, level: int = 0
+) -> numpy.ndarray:
+    """Return the partition of each row, by a hash of its primary key values.
+
+    Key values are normalized before hashing, numbers to floats and other values
+    to strings, so keys which are equal when joined, e.g. 1 and Decimal("1"), are
+    in the same partition whatever the column types of either side.
+    """
+    keys = pandas.DataFrame(
+        {column: _normalize_keys(df[column]) for column in key_columns},
+        index=df.index,
+    )
+    hashes = pandas.util.hash_pandas_object(
+        keys, index=False, hash_key=f"dvt-spill-lvl{level:03d}"
+    ).to_numpy()
+    return (hashes % numpy.uint64(partitions)).astype(numpy.int64)
+
+
+def _normalize_keys(values: pandas.Series) -> pandas.Series:
+    if pandas.api.types.is_numeric_dtype(values) and not pandas.api.types.is_bool_dtype(
+        values
+    ):
+        values = values.astype("float64").astype(object)
+        return values.where(values.notna(), None).map(str)
+    return values.map(_normalize_key)
+
+
+def _normalize_key(value) -> str:
+    if value is None or (not isinstance(value, str) and pandas.isna(value)):
+        return "None"
+    if isinstance(value, (bool, numpy.bool_)):
+        return str(float(value))
+    if isinstance(value, (int, float, decimal.Decimal, numpy.number)):
+        return str(float(value))
+    return str(value)
+
+
+class SpilledResults(object):
+    """Source and target rows hash partitioned by primary key on local disk.
+
+    Arguments:
+        key_columns (list): The primary key columns rows are partitioned by.
+        memory_budget (int): Approximate bytes of rows held in memory at once.
+        directory (str): Directory of the spilled files, a temporary directory
+            removed by close() by default.
+        level (int): How many times the rows were partitioned before.
+    """
+
+    def __init__(
+        self,
+        key_columns: List[str],
+        memory_budget: int,
+        directory: str = None,
+        level: int = 0,
+    ):
+        self._key_columns = list(key_columns)
+        self._memory_budget = memory_budget
+        self._level = level
+        self._temp_dir = None
+        if directory is None:
+            self._temp_dir = tempfile.TemporaryDirectory(prefix="dvt-spill-")
+            directory = self._temp_dir.name
+        self._directory = directory
+        # Empty frames with the columns and types of each side.
+        self._empty = {}
+        # Rows waiting to be written: {(side, partition): [DataFrame]}
+        self._buffers = {}
+        self._buffered_bytes = 0
+        # Spilled files and their in memory size: {partition: [(side, path, bytes)]}
+        self._files = {}
+        self._file_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def add(self, side: str, df: pandas.DataFrame):
+        """Partition the rows of one side, writing them once the budget is used."""
+        if side not in self._empty:
+            self._empty[side] = df.iloc[:0]
+        if df.empty:
+            return
+        ids = partition_ids(df, self._key_columns, PARTITIONS, self._level)
+        for partition, partition_df in df.groupby(ids, sort=False):
+            self._buffers.setdefault((side, partition), []).append(partition_df)
+        self._buffered_bytes += int(df.memory_usage(deep=True).sum())
+        if self._buffered_bytes >= self._memory_budget // 2:
+            self._flush()
+
+    def _flush(self):
+        """Write each buffered partition to a new Arrow IPC file."""
+        for (side, partition), frames in self._buffers.items():
+            df = pandas.concat(frames, ignore_index=True)
+            path = os.path.join(
+                self._directory, f"{side}-{partition}-{self._file_count}.arrow"
+            )
+            self._file_count += 1
+            pyarrow.feather.write_feather(df, path)
+            self._files.setdefault(partition, []).append(
+                (side, path, int(df.memory_usage(deep=True).sum()))
+            )
+        self._buffers = {}
+        self._buffered_bytes = 0
+
+    def partitions(self) -> Iterator[Tuple[pandas.DataFrame, pandas.DataFrame]]:
+        """Yield (source, target) DataFrames of one or more partitions at a time.
+
+        Partitions are grouped up to the memory budget. At least one, possibly
+        empty, pair of DataFrames is yielded.
+        """
+        self._flush()
+        group, group_bytes = [], 0
+        yielded = False
+        for partition in sorted(self._files):
+            partition_bytes = sum(size for _, _, size in self._files[partition])
+            if partition_bytes > self._memory_budget:
+                if self._level + 1 < MAX_PARTITION_LEVELS:
+                    yield from self._split(partition)
+                    yielded = True
+                    continue
+                logging.warning(
+                    "Spilled partition of %s bytes exceeds the memory budget, "
+                    "primary key values may be skewed",
+                    partition_bytes,
+                )
+            if group and group_bytes + partition_bytes > self._memory_budget:
+                yield self._load(group)
+                yielded = True
+                group, group_bytes = [], 0
+            group.append(partition)
+            group_bytes += partition_bytes
+        if group or not yielded:
+            yield self._load(group)
+
+    def _split(self, partition) -> Iterator[Tuple[pandas.DataFrame, pandas.DataFrame]]:
+        """Partition the rows of an oversized partition again, by another hash."""
+        directory = os.path.join(self._directory, f"split-{partition}")
+        os.makedirs(directory)
+        with SpilledResults(
+            self._key_columns,
+            self._memory_budget,
+            directory=directory,
+            level=self._level + 1,
+        ) as child:
+            for side in (SOURCE, TARGET):
+                child.add(side, self._empty.get(side, pandas.DataFrame()))
+            for side, path, _ in self._files.pop(partition):
+                child.add(side, pyarrow.feather.read_feather(path))
+                os.remove(path)
+            yield from child.partitions()
+
+    def _load(self, partitions: list) -> Tuple[pandas.DataFrame, pandas.DataFrame]:
+        frames = {SOURCE: [], TARGET: []}
+        for partition in partitions:
+            for side, path, _ in self._files[partition]:
+                frames[side].append(pyarrow.feather.read_feather(path))
+        return tuple(
+            pandas.concat(frames[side], ignore_index=True)
+            if frames[side]
+            else self._empty.get(side, pandas.DataFrame())
+            for side in (SOURCE, TARGET)
+        )
+
+    def close(self):
+        """Remove the spilled files, unless they are in a caller's directory."""
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+            self._temp_dir = None
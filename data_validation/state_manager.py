@@ -13,14 +13,15 @@
 # limitations under the License.
 """A utility to manage Data Validations long-lived configurations and state.
 
-The majority of this work is file system management of connections
-and validation files.
+The majority of this work is file system management of connections,
+validation files, the watermarks of incremental validations, the
+manifests of config directory runs and cached table metadata.
 """
 
 import enum
 import json
 import os
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from data_validation import consts, gcs_helper
 
@@ -81,6 +82,168 @@ class StateManager(object):
             if file_name.endswith(".connection.json")
         ]
 
+    def create_watermark(self, name: str, watermark: Dict[str, str]):
+        """Create a watermark file and store the given watermark as JSON.
+
+        Args:
+            name (String): The name of the watermark.
+            watermark (Dict): A dictionary with the watermark details.
+        """
+        watermark_path = self._get_watermark_path(name)
+        gcs_helper.write_file(watermark_path, json.dumps(watermark), include_log=False)
+
+    def get_watermark(self, name: str) -> Optional[Dict[str, str]]:
+        """Get a watermark from the expected file.
+
+        Args:
+            name: The name of the watermark.
+        Returns:
+            A dict of the watermark values from the file or None if no
+            watermark has been stored yet.
+        """
+        watermarks_directory = self._get_watermarks_directory()
+        if self.file_system == FileSystem.LOCAL and not os.path.exists(
+            watermarks_directory
+        ):
+            return None
+        if f"{name}.watermark.json" not in self._list_directory(watermarks_directory):
+            return None
+
+        watermark_str = gcs_helper.read_file(self._get_watermark_path(name))
+        return json.loads(watermark_str)
+
+    def create_run_manifest_entry(self, name: str, file_name: str, entry: Dict):
+        """Create the run manifest entry of a file and store the given entry as JSON.
+
+        Each file has its own entry, so recording a file does not rewrite the
+        entries of the other files.
+
+        Args:
+            name (String): The name of the run manifest.
+            file_name (String): The name of the YAML file the entry is about.
+            entry (Dict): A dictionary with the status of the file.
+        """
+        entry_path = self._get_run_manifest_entry_path(name, file_name)
+        gcs_helper.write_file(entry_path, json.dumps(entry), include_log=False)
+
+    def get_run_manifest(self, name: str) -> Optional[Dict[str, Dict]]:
+        """Get the entries of a run manifest from the expected files.
+
+        Args:
+            name: The name of the run manifest.
+        Returns:
+            A dict of the entry of each file of the run manifest or None if no
+            entry has been stored yet.
+        """
+        manifest = {}
+        for entry_name in gcs_helper.list_directory(self._get_run_manifest_path(name)):
+            if entry_name.endswith(".json"):
+                entry_str = gcs_helper.read_file(
+                    self._get_run_manifest_entry_path(name, entry_name[:-5])
+                )
+                manifest[entry_name[:-5]] = json.loads(entry_str)
+        return manifest or None
+
+    def create_latest_run(self, name: str, run: Dict):
+        """Create the latest run file of a run manifest and store the given run as JSON.
+
+        Args:
+            name (String): The name of the run manifest.
+            run (Dict): A dictionary with the id of the latest run.
+        """
+        run_path = self._get_latest_run_path(name)
+        gcs_helper.write_file(run_path, json.dumps(run), include_log=False)
+
+    def get_latest_run(self, name: str) -> Optional[Dict]:
+        """Get the latest run of a run manifest from the expected file.
+
+        Args:
+            name: The name of the run manifest.
+        Returns:
+            A dict of the latest run from the file or None if no run has been
+            stored yet.
+        """
+        runs_directory = self._get_runs_directory()
+        if f"{name}.latest_run.json" not in gcs_helper.list_directory(runs_directory):
+            return None
+        return json.loads(gcs_helper.read_file(self._get_latest_run_path(name)))
+
+    def create_metadata_cache_entry(self, name: str, entry: Dict):
+        """Create a metadata cache file and store the given entry as JSON.
+
+        Args:
+            name (String): The name of the cache entry.
+            entry (Dict): A dictionary with the cached metadata.
+        """
+        entry_path = self._get_metadata_cache_path(name)
+        gcs_helper.write_file(entry_path, json.dumps(entry), include_log=False)
+
+    def get_metadata_cache_entry(self, name: str) -> Optional[Dict]:
+        """Get a metadata cache entry from the expected file.
+
+        Args:
+            name: The name of the cache entry.
+        Returns:
+            A dict of the cached metadata from the file or None if no entry has
+            been stored yet.
+        """
+        # Read directly rather than listing, the cache can hold many entries.
+        entry_str, _ = gcs_helper.read_file_generation(
+            self._get_metadata_cache_path(name)
+        )
+        return json.loads(entry_str) if entry_str is not None else None
+
+    def _get_metadata_cache_path(self, name: str) -> str:
+        """Returns the full path to a metadata cache entry.
+
+        Args:
+            name: The name of the cache entry.
+        """
+        return os.path.join(
+            self.file_system_root_path, "metadata_cache/", f"{name}.metadata.json"
+        )
+
+    def _get_runs_directory(self) -> str:
+        """Returns the run manifests directory path."""
+        return os.path.join(self.file_system_root_path, "runs/")
+
+    def _get_run_manifest_path(self, name: str) -> str:
+        """Returns the full path to the directory of the entries of a run manifest.
+
+        Args:
+            name: The name of the run manifest.
+        """
+        return os.path.join(self._get_runs_directory(), f"{name}.manifest/")
+
+    def _get_run_manifest_entry_path(self, name: str, file_name: str) -> str:
+        """Returns the full path to the entry of a file in a run manifest.
+
+        Args:
+            name: The name of the run manifest.
+            file_name: The name of the YAML file the entry is about.
+        """
+        return os.path.join(self._get_run_manifest_path(name), f"{file_name}.json")
+
+    def _get_latest_run_path(self, name: str) -> str:
+        """Returns the full path to the latest run of a run manifest.
+
+        Args:
+            name: The name of the run manifest.
+        """
+        return os.path.join(self._get_runs_directory(), f"{name}.latest_run.json")
+
+    def _get_watermarks_directory(self) -> str:
+        """Returns the watermarks directory path."""
+        return os.path.join(self.file_system_root_path, "watermarks/")
+
+    def _get_watermark_path(self, name: str) -> str:
+        """Returns the full path to a watermark.
+
+        Args:
+            name: The name of the watermark.
+        """
+        return os.path.join(self._get_watermarks_directory(), f"{name}.watermark.json")
+
     def _get_connections_directory(self) -> str:
         """Returns the connections directory path."""
         if self.file_system == FileSystem.LOCAL:
@@ -13,7 +13,11 @@
 # limitations under the License.
 
 import logging
+import os
+import subprocess
+import sys
 import time
+from typing import List, Tuple
 
 
 def timed_call(log_txt, fn, *args, **kwargs):
@@ -22,3 +26,43 @@ def timed_call(log_txt, fn, *args, **kwargs):
     elapsed = time.time() - t0
     logging.debug(f"{log_txt} elapsed: {round(elapsed,2)}s")
     return result
+
+
+def get_job_index():
+    """Return the task index of a Kubernetes indexed Job or Cloud Run Job, or None."""
+    for name in ("JOB_COMPLETION_INDEX", "CLOUD_RUN_TASK_INDEX"):
+        if name in os.environ:
+            return int(os.environ[name])
+    return None
+
+
+def get_import_times(module_name: str) -> List[Tuple[str, float, float]]:
+    """Return (module, self seconds, cumulative seconds) of each module imported
+    by importing module_name, slowest first.
+
+    The module is imported by a new interpreter with -X importtime, so modules
+    already imported by this process are measured too. Modules imported while
+    the interpreter starts, e.g. by site, are left out.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        import_times.append(
+            (name.strip(), int(self_us) / 1_000_000, int(cumulative_us) / 1_000_000)
+        )
+        # Modules are listed after the modules they import, so a top level
+        # module other than module_name ends the interpreter start up imports.
+        if not name.startswith("  ") and name.strip() != module_name:
+            import_times = []
+    return sorted(import_times, key=lambda t: t[2], reverse=True)
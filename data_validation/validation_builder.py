@@ -184,6 +184,32 @@ class ValidationBuilder(object):
         filter_fields = self.config_manager.filters
         for filter_field in filter_fields:
             self.add_filter(filter_field)
+        self.add_shard_filter()
+
+    def add_shard_filter(self):
+        """Add a filter for the configured shard of rows to row validation queries."""
+        shard = self.config_manager.shard()
+        if not shard:
+            return
+        if self.validation_type != consts.ROW_VALIDATION:
+            raise ValueError(
+                f"Shards are only supported by row validations, not {self.validation_type}"
+            )
+
+        trim = self.config_manager.trim_string_pks()
+        for builder, column_type in [
+            (self.source_builder, consts.CONFIG_SOURCE_COLUMN),
+            (self.target_builder, consts.CONFIG_TARGET_COLUMN),
+        ]:
+            fields = [
+                ComparisonField(
+                    field_name=primary_key[column_type],
+                    cast=primary_key.get(consts.CONFIG_CAST),
+                    trim=trim,
+                )
+                for primary_key in self.config_manager.primary_keys
+            ]
+            builder.add_filter_field(FilterField.shard(fields, *shard))
 
     def add_aggregate(self, aggregate_field):
         """Add Aggregate Field to Queries
@@ -222,6 +248,13 @@ class ValidationBuilder(object):
             threshold=self.config_manager.threshold,
         )
 
+    def pop_aggregates(self):
+        """Remove aggregations from the queries and their validation metadata."""
+        for aggregate_field in self.source_builder.aggregate_fields:
+            self._metadata.pop(aggregate_field.alias, None)
+        self.source_builder.aggregate_fields = []
+        self.target_builder.aggregate_fields = []
+
     def pop_grouped_fields(self):
         """Return grouped fields and reset configs."""
         self.source_builder.grouped_fields = []
@@ -297,6 +330,26 @@ class ValidationBuilder(object):
                 filter_field[consts.CONFIG_FILTER_TARGET_COLUMN],
                 filter_field[consts.CONFIG_FILTER_TARGET_VALUE],
             )
+        elif filter_field[consts.CONFIG_TYPE] == consts.FILTER_TYPE_GREATER_THAN:
+            source_filter = FilterField.greater_than(
+                filter_field[consts.CONFIG_FILTER_SOURCE_COLUMN],
+                filter_field[consts.CONFIG_FILTER_SOURCE_VALUE],
+            )
+            target_filter = FilterField.greater_than(
+                filter_field[consts.CONFIG_FILTER_TARGET_COLUMN],
+                filter_field[consts.CONFIG_FILTER_TARGET_VALUE],
+            )
+        elif (
+            filter_field[consts.CONFIG_TYPE] == consts.FILTER_TYPE_LESS_THAN_OR_EQUAL_TO
+        ):
+            source_filter = FilterField.less_than_or_equal_to(
+                filter_field[consts.CONFIG_FILTER_SOURCE_COLUMN],
+                filter_field[consts.CONFIG_FILTER_SOURCE_VALUE],
+            )
+            target_filter = FilterField.less_than_or_equal_to(
+                filter_field[consts.CONFIG_FILTER_TARGET_COLUMN],
+                filter_field[consts.CONFIG_FILTER_TARGET_VALUE],
+            )
         elif filter_field[consts.CONFIG_TYPE] == consts.FILTER_TYPE_ISIN:
             source_filter = self._construct_isin_filter(
                 self.source_client,
@@ -313,6 +366,49 @@ class ValidationBuilder(object):
         self.source_builder.add_filter_field(source_filter)
         self.target_builder.add_filter_field(target_filter)
 
+    def add_grouped_values_filter(self, grouped_values):
+        """Add a filter to Queries for the rows of any of the given groups
+
+        Sibling groups only differ in the value of the last grouped column, so
+        the values of all siblings are combined into a single isin(...).
+
+        Args:
+            grouped_values (List[Dict]): The group alias to value dicts of the groups
+        """
+        *parent_aliases, alias = self.get_group_aliases()
+        siblings = {}
+        for group in grouped_values:
+            parent = tuple(group[parent_alias] for parent_alias in parent_aliases)
+            siblings.setdefault(parent, []).append(group[alias])
+
+        for builder, client, column_type in [
+            (self.source_builder, self.source_client, consts.CONFIG_SOURCE_COLUMN),
+            (self.target_builder, self.target_client, consts.CONFIG_TARGET_COLUMN),
+        ]:
+            group_filters = []
+            for parent, values in siblings.items():
+                sibling_filters = [
+                    FilterField.equal_to(
+                        self.group_aliases[parent_alias][column_type], value
+                    )
+                    for parent_alias, value in zip(parent_aliases, parent)
+                ]
+                sibling_filters.append(
+                    self._construct_isin_filter(
+                        client, self.group_aliases[alias][column_type], values
+                    )
+                )
+                group_filters.append(
+                    FilterField.and_(sibling_filters)
+                    if len(sibling_filters) > 1
+                    else sibling_filters[0]
+                )
+            builder.add_filter_field(
+                FilterField.or_(group_filters)
+                if len(group_filters) > 1
+                else group_filters[0]
+            )
+
     def add_comparison_field(self, comparison_field):
         """Add ComparionField to Queries
 
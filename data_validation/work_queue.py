@@ -0,0 +1,204 @@
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A work queue of the YAML files of a config directory, shared by many workers.
+
+Workers claim files through lease files stored next to the YAML files, in a
+local or GCS directory. A lease is renewed while its file runs, so the lease
+of a worker which died expires and the file is claimed again by another
+worker. Finished files get a done marker so they are not claimed again.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, List
+
+from data_validation import gcs_helper
+
+LEASE_DIRECTORY = ".leases"
+_LEASE_SUFFIX = ".lease"
+_DONE_SUFFIX = ".done"
+
+
+class WorkQueue(object):
+    def __init__(
+        self,
+        config_dir: str,
+        queue_name: str,
+        lease_seconds: int,
+        poll_seconds: float = None,
+    ):
+        """Build a WorkQueue of the YAML files in a config directory.
+
+        Args:
+            config_dir (String): The local or GCS directory of the YAML files.
+            queue_name (String): The name of the run, leases of other names are ignored.
+            lease_seconds (Int): The seconds a lease lasts without being renewed.
+            poll_seconds (Float): The seconds to wait for files leased by other workers.
+        """
+        self.config_dir = config_dir
+        self.lease_dir = "/".join([config_dir.rstrip("/"), LEASE_DIRECTORY, queue_name])
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds or max(lease_seconds / 10, 1)
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    def run(self, config_file_names: List[str], run_file: Callable[[str], None]):
+        """Claim and run files until all files are done.
+
+        Files which raise an exception are logged and marked as done, in the
+        same way as the serial directory runner skips them.
+
+        Returns:
+            True if any of the files run by this worker raised an exception.
+        """
+        errors = False
+        while True:
+            file_name = self._claim_next(config_file_names)
+            if file_name is None:
+                return errors
+            if file_name is False:
+                # The remaining files are leased by other workers, wait for them
+                # to complete or for their leases to expire.
+                time.sleep(self.poll_seconds)
+                continue
+
+            with self._renewing(file_name):
+                try:
+                    run_file(file_name)
+                except Exception as e:
+                    errors = True
+                    logging.error(
+                        "Error '%s' occurred while running config file %s. Skipping it for now.",
+                        str(e),
+                        file_name,
+                    )
+            self.complete(file_name)
+
+    def _claim_next(self, config_file_names: List[str]):
+        """Claim the next file to run.
+
+        Returns:
+            The claimed file name, None when all files are done or False when the
+            remaining files are leased by other workers.
+        """
+        lease_files = set(gcs_helper.list_directory(self.lease_dir))
+        pending = [
+            file_name
+            for file_name in config_file_names
+            if file_name + _DONE_SUFFIX not in lease_files
+        ]
+        if not pending:
+            return None
+
+        # Files nobody claimed yet come first, then the files of expired leases.
+        pending.sort(key=lambda file_name: file_name + _LEASE_SUFFIX in lease_files)
+        for file_name in pending:
+            if self.claim(file_name):
+                return file_name
+        return False
+
+    def claim(self, file_name: str) -> bool:
+        """Claim a file which is not leased, or whose lease expired."""
+        lease_path = self._lease_path(file_name)
+        stolen = False
+        if not gcs_helper.create_file(lease_path, self._lease()):
+            lease, generation = gcs_helper.read_file_generation(lease_path)
+            lease = _parse_lease(lease)
+            # A lease which cannot be read is held, it may be being written.
+            if lease is None or lease["expires"] > time.time():
+                return False
+            if not gcs_helper.replace_file(lease_path, self._lease(), generation):
+                return False
+            stolen = True
+
+        if gcs_helper.read_file_generation(self._done_path(file_name))[0] is not None:
+            # The file was completed since the lease directory was listed.
+            self._release(file_name)
+            return False
+        if stolen:
+            logging.warning("Claimed YAML file %s from an expired lease", file_name)
+        return True
+
+    def renew(self, file_name: str) -> bool:
+        """Extend the lease of a claimed file, False if the lease was lost."""
+        lease_path = self._lease_path(file_name)
+        lease, generation = gcs_helper.read_file_generation(lease_path)
+        lease = _parse_lease(lease)
+        if lease is None or lease["worker"] != self.worker_id:
+            return False
+        return gcs_helper.replace_file(lease_path, self._lease(), generation)
+
+    def complete(self, file_name: str):
+        """Mark a claimed file as done and release its lease."""
+        gcs_helper.create_file(
+            self._done_path(file_name), json.dumps({"worker": self.worker_id})
+        )
+        self._release(file_name)
+
+    def _release(self, file_name: str):
+        """Delete the lease of a file, unless another worker claimed it since."""
+        lease_path = self._lease_path(file_name)
+        lease, generation = gcs_helper.read_file_generation(lease_path)
+        lease = _parse_lease(lease)
+        if lease is not None and lease["worker"] == self.worker_id:
+            gcs_helper.delete_file(lease_path, generation)
+
+    @contextmanager
+    def _renewing(self, file_name: str):
+        """Renew the lease of a file in the background while it runs."""
+        stopped = threading.Event()
+
+        def renew_lease():
+            while not stopped.wait(self.lease_seconds / 3):
+                if not self.renew(file_name):
+                    logging.warning("Lost the lease of YAML file %s", file_name)
+                    return
+
+        renewer = threading.Thread(target=renew_lease, daemon=True)
+        renewer.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            renewer.join()
+
+    def _lease(self) -> str:
+        return json.dumps(
+            {"worker": self.worker_id, "expires": time.time() + self.lease_seconds}
+        )
+
+    def _lease_path(self, file_name: str) -> str:
+        return f"{self.lease_dir}/{file_name}{_LEASE_SUFFIX}"
+
+    def _done_path(self, file_name: str) -> str:
+        return f"{self.lease_dir}/{file_name}{_DONE_SUFFIX}"
+
+
+def _parse_lease(lease: str) -> dict:
+    """Return the fields of a lease, or None if it is missing or cannot be read."""
+    try:
+        lease = json.loads(lease)
+        if isinstance(lease["worker"], str) and isinstance(
+            lease["expires"], (int, float)
+        ):
+            return lease
+    except (TypeError, ValueError, KeyError):
+        pass
+    return None
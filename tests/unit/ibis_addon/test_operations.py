@@ -11,6 +11,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import subprocess
+import sys
+
 import ibis
 import pandas
 import pytest
@@ -45,3 +48,14 @@ def test_format_raw_sql_expr(module_under_test):
     raw_sql = operations.format_raw_sql(ibis_table.column, raw_sql_column_expr)
 
     assert raw_sql == WHERE_FILTER
+
+
+def test_backend_registered_when_imported():
+    """Backend translators are patched once the backend is imported."""
+    code = (
+        "import sys; from third_party.ibis.ibis_addon import operations; "
+        "assert 'ibis.backends.postgres' not in sys.modules; "
+        "from ibis.backends.postgres.compiler import PostgreSQLExprTranslator as T; "
+        "assert T._registry[operations.RawSQL] is operations.sa_format_raw_sql"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
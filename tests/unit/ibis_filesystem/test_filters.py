@@ -0,0 +1,62 @@
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pandas
+import pytest
+
+from third_party.ibis.ibis_addon import operations
+from third_party.ibis.ibis_filesystem import filters
+from third_party.ibis.ibis_filesystem.api import filesystem_connect
+
+TABLE_DF = pandas.DataFrame(
+    {
+        "id": [1, 2, 3, 4],
+        "Name": ["a", "b", None, "d"],
+        "code": ["x1", "y2", "x3", "y4"],
+        "dt": pandas.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03", None]),
+    }
+)
+
+
+@pytest.fixture
+def table():
+    return filesystem_connect({"table": TABLE_DF}).table("table")
+
+
+@pytest.mark.parametrize(
+    "sql,expected_ids",
+    [
+        ("id > 2", [3, 4]),
+        ("id >= -1 AND NOT id = 2", [1, 3, 4]),
+        ("id IN (1, 4) OR name = 'b'", [1, 2, 4]),
+        ("id BETWEEN 2 AND 3", [2, 3]),
+        ("name IS NULL", [3]),
+        ("(name IS NOT NULL) AND id > 1", [2, 4]),
+        ("code LIKE 'x%'", [1, 3]),
+        ("dt < TIMESTAMP '2024-01-02 12:00:00'", [1, 2]),
+    ],
+)
+def test_to_ibis_predicate(table, sql, expected_ids):
+    predicate = filters.to_ibis_predicate(table, sql)
+    assert table.filter(predicate).execute()["id"].tolist() == expected_ids
+
+
+@pytest.mark.parametrize("sql", ["id >", "missing = 1", "id = LOWER('a')"])
+def test_to_ibis_predicate_rejects_filter(table, sql):
+    with pytest.raises(ValueError, match="filter"):
+        filters.to_ibis_predicate(table, sql)
+
+
+def test_backend_executes_raw_sql_filter(table):
+    expr = table.filter(operations.compile_raw_sql(table, "id <= 2"))
+    assert expr.execute()["id"].tolist() == [1, 2]
@@ -0,0 +1,81 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+
+import ibis
+import pandas
+import pytest
+
+
+@pytest.fixture
+def module_under_test():
+    import third_party.ibis.ibis_addon.operations  # noqa: F401
+    import data_validation.query_builder.hash_bucket_builder
+
+    return data_validation.query_builder.hash_bucket_builder
+
+
+def _sha256(value):
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+@pytest.fixture
+def table():
+    df = pandas.DataFrame({"id": range(100)})
+    df["hash__all"] = df["id"].map(lambda i: _sha256(f"row {i}"))
+    return ibis.pandas.connect({"t": df}).table("t")
+
+
+def test_invalid_bucket_count(module_under_test):
+    with pytest.raises(ValueError, match="power of 16"):
+        module_under_test.HashBucketBuilder(["id"], "hash__all", 100)
+
+
+def test_compile_buckets(module_under_test, table):
+    builder = module_under_test.HashBucketBuilder(["id"], "hash__all", 16)
+
+    result = builder.compile_buckets(table, 1).execute()
+
+    expected = pandas.DataFrame({"id": range(100)})
+    expected["hash_bucket"] = expected["id"].map(lambda i: _sha256(str(i))[0])
+    expected["fingerprint"] = expected["id"].map(
+        lambda i: int(_sha256(f"row {i}")[:7], 16)
+    )
+    expected = expected.groupby("hash_bucket")
+    result = result.set_index("hash_bucket").sort_index()
+    assert list(result["bucket_count"]) == list(expected["id"].count())
+    assert list(result["hash__all"]) == list(expected["fingerprint"].sum())
+
+
+def test_compile_buckets_splits_prefixes(module_under_test, table):
+    builder = module_under_test.HashBucketBuilder(["id"], "hash__all", 16)
+
+    result = builder.compile_buckets(table, 2, prefixes=["3", "a"]).execute()
+
+    assert all(bucket[0] in "3a" for bucket in result["hash_bucket"])
+    assert all(len(bucket) == 2 for bucket in result["hash_bucket"])
+    expected_rows = sum(_sha256(str(i))[0] in "3a" for i in range(100))
+    assert result["bucket_count"].sum() == expected_rows
+
+
+def test_compile_rows(module_under_test, table):
+    builder = module_under_test.HashBucketBuilder(["id"], "hash__all", 256)
+
+    buckets = [_sha256("5")[:2], _sha256("42")[:2]]
+    result = builder.compile_rows(table, 1, buckets, max_in_list_size=1).execute()
+
+    assert list(result.columns) == ["id", "hash__all"]
+    assert {5, 42} <= set(result["id"])
+    assert all(_sha256(str(i))[:2] in buckets for i in result["id"])
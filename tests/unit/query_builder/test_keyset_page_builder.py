@@ -0,0 +1,61 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ibis
+import pandas
+import pytest
+
+
+@pytest.fixture
+def module_under_test():
+    import data_validation.query_builder.keyset_page_builder
+
+    return data_validation.query_builder.keyset_page_builder
+
+
+def test_pages_cover_all_rows_once(module_under_test):
+    df = pandas.DataFrame(
+        {
+            "a": [2, 1, 1, 2, 1, 3, 2],
+            "b": ["y", "z", "x", "x", "y", "x", "z"],
+            "value": range(7),
+        }
+    )
+    table = ibis.pandas.connect({"t": df}).table("t")
+    builder = module_under_test.KeysetPageBuilder(["a", "b"], 3)
+
+    pages = []
+    after = None
+    while True:
+        page = builder.compile(table, after=after).execute()
+        pages.append(list(zip(page["a"], page["b"])))
+        if len(page) < builder.page_size:
+            break
+        after = builder.last_key(page)
+
+    assert pages == [
+        [(1, "x"), (1, "y"), (1, "z")],
+        [(2, "x"), (2, "y"), (2, "z")],
+        [(3, "x")],
+    ]
+
+
+def test_compile_upto_is_inclusive(module_under_test):
+    df = pandas.DataFrame({"id": [1, 2, 3, 4, 5]})
+    table = ibis.pandas.connect({"t": df}).table("t")
+    builder = module_under_test.KeysetPageBuilder(["id"], 2)
+
+    page = builder.compile(table, after=(1,), upto=(4,), limit=False).execute()
+
+    assert list(page["id"]) == [2, 3, 4]
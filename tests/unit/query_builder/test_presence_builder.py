@@ -0,0 +1,83 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ibis
+import pandas
+import pytest
+
+
+@pytest.fixture
+def module_under_test():
+    import data_validation.query_builder.presence_builder
+
+    return data_validation.query_builder.presence_builder
+
+
+@pytest.fixture
+def table():
+    df = pandas.DataFrame(
+        {"a": [1, 1, 2, 2, 3], "b": ["x", "y", "x", "y", "x"], "v": range(5)}
+    )
+    return ibis.pandas.connect({"t": df}).table("t")
+
+
+def test_missing_keys(module_under_test):
+    builder = module_under_test.PresenceBuilder(["a", "b"])
+    source_keys = pandas.DataFrame({"a": [1, 1, 2, None], "b": ["x", "y", "x", "x"]})
+    target_keys = pandas.DataFrame({"a": [1, 2, 3, None], "b": ["x", "y", "x", "y"]})
+
+    source_only, target_only = builder.missing_keys(source_keys, target_keys)
+
+    # Keys with a NULL are never returned as missing.
+    assert source_only.values.tolist() == [[1, "y"], [2, "x"]]
+    assert target_only.values.tolist() == [[2, "y"], [3, "x"]]
+
+
+def test_compile_rows(module_under_test, table):
+    builder = module_under_test.PresenceBuilder(["a", "b"])
+    keys = pandas.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+
+    result = builder.compile_rows(table, keys, max_in_list_size=1).execute()
+
+    # Composite keys are filtered column by column.
+    assert sorted(result["v"]) == [0, 1, 2, 3]
+    result = result[builder.contains(result, keys)]
+    assert sorted(result["v"]) == [0, 3]
+
+
+def test_compile_rows_without_keys(module_under_test, table):
+    builder = module_under_test.PresenceBuilder(["a"])
+
+    result = builder.compile_rows(table, pandas.DataFrame({"a": []})).execute()
+
+    assert result.empty
+
+
+def test_compile_excluding(module_under_test, table):
+    builder = module_under_test.PresenceBuilder(["a"])
+    keys = pandas.DataFrame({"a": [1, 3]})
+
+    result = builder.compile_excluding(table, keys).execute()
+
+    assert sorted(result["v"]) == [2, 3]
+
+
+def test_compile_excluding_composite_keys(module_under_test, table):
+    builder = module_under_test.PresenceBuilder(["a", "b"])
+    keys = pandas.DataFrame({"a": [1], "b": ["x"]})
+
+    result = builder.compile_excluding(table, keys).execute()
+
+    assert len(result) == 5
+    assert sorted(result[~builder.contains(result, keys)]["v"]) == [1, 2, 3, 4]
@@ -34,3 +34,152 @@ def test_get_handler_for_project_sets_user_agent(module_under_test, monkeypatch)
     mock_client.assert_called_once()
     user_agent = mock_client.call_args[1]["client_info"].to_user_agent()
     assert "google-pso-tool/data-validator" in user_agent
+
+
+def _get_result_df(run_id="run-1", rows=2):
+    import pandas
+
+    return pandas.DataFrame(
+        {
+            "run_id": [run_id] * rows,
+            "validation_name": [f"count_{i}" for i in range(rows)],
+            "validation_status": ["success"] * rows,
+        }
+    )
+
+
+def _get_mock_client(field_names=("run_id", "validation_name", "validation_status")):
+    mock_client = mock.create_autospec(bigquery.Client, instance=True)
+    mock_client.get_table.return_value = bigquery.Table(
+        "my-project.dataset.results",
+        schema=[bigquery.SchemaField(name, "STRING") for name in field_names],
+    )
+    mock_client.insert_rows_from_dataframe.return_value = [[]]
+    return mock_client
+
+
+def test_execute_streaming_gets_table_once(module_under_test):
+    mock_client = _get_mock_client()
+    handler = module_under_test.BigQueryResultHandler(mock_client)
+    handler.execute(_get_result_df())
+    handler.execute(_get_result_df())
+
+    mock_client.get_table.assert_called_once()
+    assert mock_client.insert_rows_from_dataframe.call_count == 2
+    mock_client.load_table_from_file.assert_not_called()
+
+
+def test_execute_buffered_writes_one_load_job(module_under_test):
+    import pandas
+
+    mock_client = _get_mock_client()
+    handler = module_under_test.BigQueryResultHandler(mock_client, load_job_rows=100)
+    handler.execute(_get_result_df("run-1"))
+    handler.execute(_get_result_df("run-2"))
+    mock_client.load_table_from_file.assert_not_called()
+
+    handler.flush()
+    handler.flush()
+    mock_client.get_table.assert_called_once()
+    mock_client.insert_rows_from_dataframe.assert_not_called()
+    mock_client.load_table_from_file.assert_called_once()
+
+    parquet_file, table = mock_client.load_table_from_file.call_args[0]
+    job_config = mock_client.load_table_from_file.call_args[1]["job_config"]
+    assert job_config.source_format == bigquery.SourceFormat.PARQUET
+    assert job_config.write_disposition == bigquery.WriteDisposition.WRITE_APPEND
+    loaded_df = pandas.read_parquet(parquet_file)
+    assert loaded_df["run_id"].tolist() == ["run-1", "run-1", "run-2", "run-2"]
+
+
+def test_flush_writes_results_table_schema(module_under_test):
+    import datetime
+
+    import pyarrow
+    import pyarrow.parquet
+
+    field_names = (
+        "run_id",
+        "start_time",
+        "primary_keys",
+        "num_random_rows",
+        "validation_status",
+        "labels",
+    )
+    mock_client = _get_mock_client(field_names=field_names)
+    handler = module_under_test.BigQueryResultHandler(mock_client, load_job_rows=100)
+    result_df = _get_result_df(rows=1)
+    result_df["start_time"] = datetime.datetime(
+        2024, 1, 1, tzinfo=datetime.timezone.utc
+    )
+    result_df["primary_keys"] = [None]
+    result_df["num_random_rows"] = [None]
+    result_df["labels"] = [[("env", "test")]]
+    handler.execute(result_df.drop(columns=["validation_name"]))
+    handler.flush()
+
+    parquet_file = mock_client.load_table_from_file.call_args[0][0]
+    table = pyarrow.parquet.read_table(parquet_file)
+    assert table.schema.names == list(field_names)
+    assert table.schema.field("start_time").type == pyarrow.timestamp("us", tz="UTC")
+    assert table.schema.field("primary_keys").type == pyarrow.string()
+    assert table.schema.field("num_random_rows").type == pyarrow.int64()
+    assert table.schema.field("labels").type == pyarrow.list_(
+        pyarrow.struct([("key", pyarrow.string()), ("value", pyarrow.string())])
+    )
+    assert table.column("labels").to_pylist() == [[{"key": "env", "value": "test"}]]
+
+
+def test_execute_buffered_flushes_at_threshold(module_under_test):
+    mock_client = _get_mock_client()
+    handler = module_under_test.BigQueryResultHandler(mock_client, load_job_rows=3)
+    handler.execute(_get_result_df())
+    mock_client.load_table_from_file.assert_not_called()
+    handler.execute(_get_result_df())
+    mock_client.load_table_from_file.assert_called_once()
+    handler.flush()
+    mock_client.load_table_from_file.assert_called_once()
+
+
+def test_on_flushed_waits_for_buffered_results(module_under_test):
+    mock_client = _get_mock_client()
+    handler = module_under_test.BigQueryResultHandler(mock_client, load_job_rows=100)
+    callback = mock.Mock()
+    handler.on_flushed(callback)
+    callback.assert_called_once_with()
+
+    callback.reset_mock()
+    handler.execute(_get_result_df())
+    handler.on_flushed(callback)
+    callback.assert_not_called()
+    handler.flush()
+    callback.assert_called_once_with()
+
+
+def test_flush_unknown_field(module_under_test):
+    mock_client = _get_mock_client(field_names=("run_id", "validation_name"))
+    handler = module_under_test.BigQueryResultHandler(mock_client, load_job_rows=100)
+    handler.execute(_get_result_df())
+    with pytest.raises(RuntimeError, match="rename_column_schema.sh"):
+        handler.flush()
+    mock_client.load_table_from_file.assert_not_called()
+
+
+def test_get_buffered_handler_is_shared(module_under_test, monkeypatch):
+    mock_client = mock.create_autospec(bigquery.Client)
+    monkeypatch.setattr(bigquery, "Client", value=mock_client)
+    handler = module_under_test.BigQueryResultHandler.get_buffered_handler(
+        "test-project", table_id="dataset.results", load_job_rows=10
+    )
+    assert handler is module_under_test.BigQueryResultHandler.get_buffered_handler(
+        "test-project", table_id="dataset.results", load_job_rows=10
+    )
+    assert handler is not module_under_test.BigQueryResultHandler.get_buffered_handler(
+        "test-project", table_id="dataset.other_results", load_job_rows=10
+    )
+
+    module_under_test.flush_buffered_handlers()
+    assert handler is not module_under_test.BigQueryResultHandler.get_buffered_handler(
+        "test-project", table_id="dataset.results", load_job_rows=10
+    )
+    module_under_test.flush_buffered_handlers()
@@ -0,0 +1,107 @@
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import os
+
+import pandas
+import pytest
+
+START_TIME = datetime.datetime(2024, 1, 31, 12, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture
+def module_under_test():
+    from data_validation.result_handlers import parquet
+
+    return parquet
+
+
+def _get_result_df(run_id, tables=("my_schema.my_table",), status="success"):
+    return pandas.DataFrame(
+        {
+            "run_id": [run_id] * len(tables),
+            "validation_name": ["count"] * len(tables),
+            "validation_type": ["Column"] * len(tables),
+            "start_time": [START_TIME] * len(tables),
+            "end_time": [START_TIME] * len(tables),
+            "source_table_name": list(tables),
+            "target_table_name": list(tables),
+            "source_agg_value": ["10"] * len(tables),
+            "target_agg_value": ["10"] * len(tables),
+            "num_random_rows": [None] * len(tables),
+            "difference": [0.0] * len(tables),
+            "validation_status": [status] * len(tables),
+            "labels": [[("owner", "dvt")]] * len(tables),
+        }
+    )
+
+
+def test_execute_partitions_by_date_and_table(module_under_test, tmp_path):
+    handler = module_under_test.ParquetResultHandler(str(tmp_path))
+    handler.execute(_get_result_df("run-1", tables=("s.t1", "s.t2")))
+    handler.execute(_get_result_df("run-2", tables=("s.t1",)))
+    handler.close()
+
+    table_dirs = sorted(os.listdir(tmp_path / "run_date=2024-01-31"))
+    assert table_dirs == ["source_table_name=s.t1", "source_table_name=s.t2"]
+    # Results of a handler are appended to a single file per partition.
+    assert len(os.listdir(tmp_path / "run_date=2024-01-31" / table_dirs[0])) == 1
+
+    result_df = pandas.read_parquet(tmp_path).sort_values("run_id")
+    assert result_df["run_id"].tolist() == ["run-1", "run-1", "run-2"]
+    assert result_df["source_table_name"].astype(str).tolist() == [
+        "s.t1",
+        "s.t2",
+        "s.t1",
+    ]
+    assert result_df["source_agg_value"].tolist() == ["10", "10", "10"]
+    assert list(result_df["labels"].iloc[0]) == [{"key": "owner", "value": "dvt"}]
+
+
+def test_execute_partitions_by_run_id(module_under_test, tmp_path):
+    handler = module_under_test.ParquetResultHandler(
+        str(tmp_path), status_list=["fail"], partition_by="run_id"
+    )
+    handler.execute(_get_result_df("run-1", tables=("s/t1",), status="fail"))
+    handler.execute(_get_result_df("run-2", tables=("s/t1",)))
+    handler.close()
+
+    assert os.listdir(tmp_path) == ["run_id=run-1"]
+    assert os.listdir(tmp_path / "run_id=run-1") == ["source_table_name=s%2Ft1"]
+    result_df = pandas.read_parquet(tmp_path)
+    assert result_df["run_id"].astype(str).tolist() == ["run-1"]
+    assert result_df["source_table_name"].astype(str).tolist() == ["s/t1"]
+
+
+def test_unknown_partition_by(module_under_test, tmp_path):
+    with pytest.raises(ValueError, match="Unknown Parquet result partitioning"):
+        module_under_test.ParquetResultHandler(str(tmp_path), partition_by="table")
+
+
+def test_shared_handlers(module_under_test, tmp_path):
+    handler = module_under_test.ParquetResultHandler.get_shared_handler(
+        str(tmp_path), status_list=None
+    )
+    assert handler is module_under_test.ParquetResultHandler.get_shared_handler(
+        str(tmp_path), status_list=None
+    )
+    handler.execute(_get_result_df("run-1"))
+
+    module_under_test.close_shared_handlers()
+    assert len(pandas.read_parquet(tmp_path)) == 1
+    assert handler is not module_under_test.ParquetResultHandler.get_shared_handler(
+        str(tmp_path), status_list=None
+    )
+    module_under_test.close_shared_handlers()
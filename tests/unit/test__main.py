@@ -19,6 +19,7 @@ from unittest import mock
 import pytest
 
 from data_validation import cli_tools, exceptions, config_manager, consts
+from data_validation import state_manager
 from data_validation import __main__ as main
 
 
@@ -520,3 +521,301 @@ def test_successful_generate_partitions_with_mocked_partition_builder(
 )
 def test_successful_query_with_mocked_get_data_client(mock_args, mock_run):
     main.main()
+
+
+class MockResultHandler(object):
+    def __init__(self, written):
+        self.written = written
+
+    def execute(self, result_df):
+        self.written.append(result_df)
+        return result_df
+
+
+def test_run_validations_in_parallel_writes_results_in_order():
+    """Validations run concurrently but results are written in submission order."""
+    written = []
+    config_managers = [mock.Mock(full_source_table=f"t{_}") for _ in range(5)]
+
+    def fake_validate(config_manager, verbose=False):
+        validator = mock.Mock(result_handler=MockResultHandler(written))
+        return validator, config_manager.full_source_table
+
+    args = argparse.Namespace(dry_run=False, verbose=False, parallelism=3)
+    with mock.patch(
+        "data_validation.__main__._validate_without_result_handler",
+        side_effect=fake_validate,
+    ) as mock_validate:
+        main.run_validations(args, config_managers)
+    assert mock_validate.call_count == 5
+    assert written == ["t0", "t1", "t2", "t3", "t4"]
+
+
+def test_run_validations_in_parallel_combines_errors(caplog):
+    """One failing validation does not stop the others, an exception is raised at the end."""
+    written = []
+    config_managers = [mock.Mock(full_source_table=f"t{_}") for _ in range(3)]
+
+    def fake_validate(config_manager, verbose=False):
+        if config_manager.full_source_table == "t1":
+            raise ValueError("Boom!")
+        validator = mock.Mock(result_handler=MockResultHandler(written))
+        return validator, config_manager.full_source_table
+
+    args = argparse.Namespace(dry_run=False, verbose=False, parallelism=2)
+    caplog.set_level(logging.ERROR)
+    with mock.patch(
+        "data_validation.__main__._validate_without_result_handler",
+        side_effect=fake_validate,
+    ):
+        with pytest.raises(exceptions.ValidationException):
+            main.run_validations(args, config_managers)
+    assert written == ["t0", "t2"]
+    assert caplog.messages == [
+        "Error 'Boom!' occurred while running validation of table t1."
+    ]
+
+
+class MockTeradataClient(object):
+    _source_type = "Teradata"
+    name = "teradata"
+
+
+@mock.patch("data_validation.__main__.DataValidation")
+def test_get_data_validation_reuses_clients(mock_data_validation):
+    """The clients of a config manager are reused for every backend, in parallel runs
+    only the thread safe ones are.
+    """
+    mgr = config_manager.ConfigManager(
+        VALIDATE_COLUMN_CONFIG, MockIbisClient(), MockTeradataClient(), verbose=False
+    )
+    main._get_data_validation(mgr)
+    _, kwargs = mock_data_validation.call_args
+    assert kwargs["source_client"] is mgr.source_client
+    assert kwargs["target_client"] is mgr.target_client
+
+    main._get_data_validation(mgr, thread_safe_only=True)
+    _, kwargs = mock_data_validation.call_args
+    assert kwargs["source_client"] is mgr.source_client
+    assert kwargs["target_client"] is None
+
+
+@mock.patch("data_validation.__main__.run_validations")
+@mock.patch(
+    "data_validation.__main__.build_config_managers_from_yaml",
+    return_value=["config dict from one file"],
+)
+@mock.patch(
+    "data_validation.cli_tools.list_validations",
+    return_value=["0000.yaml", "0001.yaml"],
+)
+@mock.patch("data_validation.__main__.RunManifest")
+def test_config_runner_record_error(
+    mock_manifest, mock_list, mock_build, mock_run, monkeypatch, tmp_path
+):
+    """A file whose manifest entry can not be stored is not recorded again as failed."""
+    monkeypatch.setenv(consts.ENV_DIRECTORY_VAR, str(tmp_path))
+    mock_manifest.return_value.pending.side_effect = lambda file_names: file_names
+    mock_manifest.return_value.record.side_effect = OSError("Disk full")
+    args = argparse.Namespace(**dict(CONFIG_RUNNER_ARGS_4, config_dir="my_dir"))
+    with pytest.raises(OSError, match="Disk full"):
+        main.config_runner(args)
+    mock_manifest.return_value.record.assert_called_once()
+    assert mock_manifest.return_value.record.call_args.kwargs["error"] is None
+
+
+@mock.patch("data_validation.combiner.shutdown_process_pool")
+@mock.patch("data_validation.result_handlers.parquet.close_shared_handlers")
+@mock.patch("data_validation.result_handlers.bigquery.flush_buffered_handlers")
+@mock.patch("data_validation.__main__.run_validations")
+@mock.patch(
+    "data_validation.__main__.build_config_managers_from_yaml",
+    return_value=["config dict from one file"],
+)
+@mock.patch(
+    "data_validation.cli_tools.list_validations",
+    return_value=["0000.yaml", "0001.yaml", "0002.yaml"],
+)
+def test_config_runner_flushes_once(
+    mock_list,
+    mock_build,
+    mock_run,
+    mock_flush,
+    mock_close,
+    mock_shutdown,
+    monkeypatch,
+    tmp_path,
+):
+    """Shared resources, e.g. buffered results, are released once per command."""
+    monkeypatch.setenv(consts.ENV_DIRECTORY_VAR, str(tmp_path))
+    args = argparse.Namespace(**dict(CONFIG_RUNNER_ARGS_4, config_dir="my_dir"))
+    main.config_runner(args)
+    assert mock_run.call_count == 3
+    mock_flush.assert_called_once_with()
+    mock_close.assert_called_once_with()
+    mock_shutdown.assert_called_once_with()
+
+
+@mock.patch(
+    "data_validation.result_handlers.bigquery.flush_buffered_handlers",
+    side_effect=ValueError("Flush failed"),
+)
+@mock.patch(
+    "data_validation.__main__.run_validations",
+    side_effect=ValueError("Validation failed"),
+)
+@mock.patch(
+    "data_validation.__main__.build_config_managers_from_yaml",
+    return_value=["config dict from one file"],
+)
+def test_config_runner_flush_error(mock_build, mock_run, mock_flush, caplog):
+    """A flush error is only logged when the command already failed."""
+    args = argparse.Namespace(**CONFIG_RUNNER_ARGS_1)
+    with pytest.raises(ValueError, match="Validation failed"):
+        main.config_runner(args)
+    assert any("Flush failed" in message for message in caplog.messages)
+
+    mock_run.side_effect = None
+    with pytest.raises(ValueError, match="Flush failed"):
+        main.config_runner(args)
+
+
+def _fake_run_config_file_in_worker(args, config_file_path):
+    if config_file_path == "0001.yaml":
+        raise ValueError("Boom!")
+
+
+@mock.patch(
+    "data_validation.__main__._run_config_file_in_worker",
+    new=_fake_run_config_file_in_worker,
+)
+@mock.patch(
+    "data_validation.cli_tools.list_validations",
+    return_value=["0000.yaml", "0001.yaml", "0002.yaml", "0003.yaml"],
+)
+def test_config_runner_with_processes(mock_list, caplog, monkeypatch, tmp_path):
+    """Run a config directory on a pool of worker processes, one file raises an exception.
+    Expected Result:
+    1. All 4 files are run, a status is logged for each one.
+    2. Exception from one file is trapped, file skipped and raised at the end.
+    """
+    monkeypatch.setenv(consts.ENV_DIRECTORY_VAR, str(tmp_path))
+    args = argparse.Namespace(
+        **dict(CONFIG_RUNNER_ARGS_4, kube_completions=False, processes=2)
+    )
+    caplog.set_level(logging.INFO)
+    with pytest.raises(exceptions.ValidationException) as e_info:
+        main.config_runner(args)
+    assert e_info.value.args[0] == "Some of the validations raised an exception"
+    assert CONFIG_RUNNER_EXCEPTION_TEXT.format("Boom!", "0001.yaml") in caplog.messages
+    completed = [_ for _ in caplog.messages if _.startswith("Completed the validation")]
+    assert len(completed) == 3
+
+
+@mock.patch(
+    "data_validation.__main__._run_config_file_in_worker",
+    new=_fake_run_config_file_in_worker,
+)
+@mock.patch(
+    "data_validation.cli_tools.list_validations",
+    return_value=["0000.yaml", "0001.yaml", "0002.yaml", "0003.yaml"],
+)
+def test_config_runner_with_work_queue(mock_list, caplog, tmp_path):
+    """Run a config directory claiming files from a work queue, one file raises an exception.
+    Expected Result:
+    1. All 4 files are run and marked as done in the lease directory.
+    2. Exception from one file is trapped, file skipped and raised at the end.
+    """
+    args = argparse.Namespace(
+        **dict(
+            CONFIG_RUNNER_ARGS_4,
+            config_dir=str(tmp_path),
+            work_queue="run1",
+            lease_seconds=60,
+        )
+    )
+    with pytest.raises(exceptions.ValidationException):
+        main.config_runner(args)
+    assert CONFIG_RUNNER_EXCEPTION_TEXT.format("Boom!", "0001.yaml") in caplog.messages
+    assert sorted(os.listdir(tmp_path / ".leases" / "run1")) == [
+        f"000{i}.yaml.done" for i in range(4)
+    ]
+
+
+@mock.patch("data_validation.__main__.run_validations")
+@mock.patch(
+    "data_validation.__main__.build_config_managers_from_yaml",
+    return_value=["config dict from one file"],
+)
+@mock.patch(
+    "data_validation.cli_tools.list_validations",
+    return_value=["0000.yaml", "0001.yaml", "0002.yaml", "0003.yaml"],
+)
+def test_config_runner_resume(mock_list, mock_build, mock_run, monkeypatch, tmp_path):
+    """Resume a config directory run which failed on one file.
+    Expected Result:
+    1. The first run records the status of each file in the run manifest.
+    2. The resumed run only runs the failed file.
+    """
+    monkeypatch.setenv(consts.ENV_DIRECTORY_VAR, str(tmp_path))
+    mock_run.side_effect = [10, ValueError("Boom!"), 12, 10]
+    args = argparse.Namespace(**dict(CONFIG_RUNNER_ARGS_4, config_dir="my_dir"))
+    with pytest.raises(exceptions.ValidationException):
+        main.config_runner(args)
+
+    mock_run.reset_mock(side_effect=True)
+    args = argparse.Namespace(
+        **dict(CONFIG_RUNNER_ARGS_4, config_dir="my_dir", resume=True)
+    )
+    main.config_runner(args)
+
+    assert mock_build.call_args.args[1] == "0001.yaml"
+    assert mock_run.call_count == 1
+    manifest = state_manager.StateManager().get_run_manifest("my_dir")
+    assert {file_name: status["status"] for file_name, status in manifest.items()} == {
+        "0000.yaml": "success",
+        "0001.yaml": "success",
+        "0002.yaml": "success",
+        "0003.yaml": "success",
+    }
+
+
+@mock.patch("data_validation.__main__.run_validations")
+@mock.patch(
+    "data_validation.__main__.build_config_managers_from_yaml",
+    return_value=["config dict from one file"],
+)
+@mock.patch(
+    "data_validation.cli_tools.list_validations",
+    return_value=["0000.yaml", "0001.yaml"],
+)
+def test_config_runner_resume_per_shard(
+    mock_list, mock_build, mock_run, monkeypatch, tmp_path
+):
+    """Runs of other shards of a config directory do not clobber the run manifest.
+    Expected Result:
+    1. Each shard resumes from its own run manifest.
+    2. A new run does not delete the entries of earlier runs.
+    """
+    monkeypatch.setenv(consts.ENV_DIRECTORY_VAR, str(tmp_path))
+
+    def run_shard(shard, resume=False, side_effect=None):
+        mock_build.reset_mock()
+        mock_run.side_effect = side_effect
+        args = argparse.Namespace(
+            **dict(
+                CONFIG_RUNNER_ARGS_4, config_dir="my_dir", shard=shard, resume=resume
+            )
+        )
+        main.config_runner(args)
+        return [call.args[1] for call in mock_build.call_args_list]
+
+    with pytest.raises(exceptions.ValidationException):
+        run_shard("0/2", side_effect=[None, ValueError("Boom!")])
+    assert run_shard("1/2") == ["0000.yaml", "0001.yaml"]
+    assert run_shard("0/2", resume=True) == ["0001.yaml"]
+    assert run_shard("1/2", resume=True) == []
+
+    manifest = main.RunManifest("my_dir", run_args={"shard": "0/2"})
+    assert manifest.pending(["0000.yaml", "0001.yaml"]) == ["0000.yaml", "0001.yaml"]
+    assert len(state_manager.StateManager().get_run_manifest(manifest.name)) == 2
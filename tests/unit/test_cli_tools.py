@@ -474,6 +474,29 @@ def test_get_result_handler_by_conn_file(fs):
     }
 
 
+def test_get_parquet_result_handler():
+    """Test get Parquet result handler config dictionary."""
+    res = cli_tools.get_parquet_result_handler("/results", "run_id")
+    assert res == {
+        "type": "Parquet",
+        consts.RESULT_HANDLER_DIRECTORY: "/results",
+        consts.RESULT_HANDLER_PARTITION_BY: consts.PARTITION_BY_RUN_ID,
+    }
+    res = cli_tools.get_parquet_result_handler("/results")
+    assert res[consts.RESULT_HANDLER_PARTITION_BY] == consts.PARTITION_BY_DATE
+
+
+def test_get_result_handler_with_load_job_rows():
+    """Test get result handler config dictionary for buffered load jobs."""
+    res = cli_tools.get_result_handler("project.dataset.table", None, 5000)
+    assert res == {
+        "type": "BigQuery",
+        consts.PROJECT_ID: "project",
+        consts.TABLE_ID: "dataset.table",
+        consts.LOAD_JOB_ROWS: 5000,
+    }
+
+
 @pytest.mark.parametrize(
     "test_input,expected",
     [
@@ -530,6 +553,25 @@ def test_get_filters_err(test_input):
         cli_tools.get_filters(test_input)
 
 
+@pytest.mark.parametrize(
+    "test_input",
+    ["3/100", "0/1", "16"],
+)
+def test_check_shard(test_input):
+    """Test shards are INDEX/COUNT or COUNT."""
+    assert cli_tools._check_shard(test_input) == test_input
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    ["100/100", "-1/4", "0", "a/4", "1/"],
+)
+def test_check_shard_err(test_input):
+    """Test invalid shards return error."""
+    with pytest.raises(argparse.ArgumentTypeError):
+        cli_tools._check_shard(test_input)
+
+
 @pytest.mark.parametrize(
     "test_input,expected",
     [
@@ -12,15 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import decimal
+import subprocess
+import sys
+import threading
 from unittest import mock
 import pytest
 
 from google.auth import credentials
 import pandas
+import pyarrow
+import pyarrow.parquet
 import ibis.backends.pandas
 from ibis.backends.pandas import BasePandasBackend as PandasBackend
 
 from data_validation import clients, exceptions
+from third_party.ibis import ibis_filesystem
+from third_party.ibis.ibis_addon import operations
 
 
 TABLE_NAME = "my_table"
@@ -64,6 +72,76 @@ def test_get_all_tables():
     assert all_tables == TABLES_RESULT
 
 
+def _get_catalog_client():
+    """Return a mock client with three schemas of two tables."""
+    client = mock.Mock(spec=["name", "list_databases", "list_tables"])
+    client.name = "postgres"
+    client.list_databases.return_value = ["a", "b", "c"]
+    client.list_tables.side_effect = lambda database: [
+        f"{database}_t1",
+        f"{database}_t2",
+    ]
+    return client
+
+
+def test_get_all_tables_lists_each_schema_once():
+    client = _get_catalog_client()
+    all_tables = clients.get_all_tables(client)
+    assert all_tables == [
+        ("a", "a_t1"),
+        ("a", "a_t2"),
+        ("b", "b_t1"),
+        ("b", "b_t2"),
+        ("c", "c_t1"),
+        ("c", "c_t2"),
+    ]
+    assert clients.get_all_tables(client, allowed_schemas=["b"]) == all_tables[2:4]
+    assert clients.get_all_tables(client) == all_tables
+
+    client.list_databases.assert_called_once()
+    assert sorted(
+        call.kwargs["database"] for call in client.list_tables.call_args_list
+    ) == ["a", "b", "c"]
+
+
+def test_get_all_tables_lists_serially_for_thread_unsafe_clients():
+    client = _get_catalog_client()
+    client.name = "teradata"
+    threads = set()
+
+    def list_tables(database):
+        threads.add(threading.get_ident())
+        return [f"{database}_t1"]
+
+    client.list_tables.side_effect = list_tables
+    assert clients.get_all_tables(client) == [
+        ("a", "a_t1"),
+        ("b", "b_t1"),
+        ("c", "c_t1"),
+    ]
+    assert threads == {threading.get_ident()}
+
+
+def test_get_all_tables_lists_schemaless_backend_once():
+    client = _get_catalog_client()
+    client.name = "mssql"
+    client.list_tables.side_effect = lambda: ["t1"]
+    assert clients.get_all_tables(client) == [("a", "t1"), ("b", "t1"), ("c", "t1")]
+    client.list_tables.assert_called_once_with()
+
+
+def test_get_all_tables_skips_failing_schema():
+    client = _get_catalog_client()
+
+    def list_tables(database):
+        if database == "b":
+            raise ValueError("permission denied")
+        return [f"{database}_t1"]
+
+    client.list_tables.side_effect = list_tables
+    assert clients.get_all_tables(client) == [("a", "a_t1"), ("c", "c_t1")]
+
+
 def test_get_bigquery_client_sets_user_agent():
     mock_credentials = mock.create_autospec(credentials.Credentials)
     ibis_client = clients.get_bigquery_client(
@@ -87,9 +165,299 @@ def test_get_oracle_data_client():
         clients.get_data_client(ORACLE_CONN_CONFIG)
 
 
+def test_backends_imported_lazily():
+    """Backends are only imported when a client of their source type is built."""
+    backends = (
+        "google.cloud.bigquery",
+        "google.cloud.spanner",
+        "ibis.backends.bigquery",
+        "ibis.backends.impala",
+        "ibis.backends.mssql",
+        "ibis.backends.postgres",
+        "third_party.ibis.ibis_redshift",
+    )
+    code = (
+        "import sys; import data_validation.__main__; "
+        f"print([m for m in {backends!r} if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
 def test_get_pandas_data_client():
     conn_config = SOURCE_CONN_CONFIG
     _create_table_file(SOURCE_TABLE_FILE_PATH, JSON_DATA)
     ibis_client = clients.get_data_client(conn_config)
 
     assert isinstance(ibis_client, PandasBackend)
+
+
+def _get_parquet_client(tmp_path):
+    """Return a FileSystem client of a Parquet file with one row per row group."""
+    file_path = str(tmp_path / "my_table.parquet")
+    df = pandas.DataFrame(
+        {
+            "id": [1, 2, 3, 4],
+            "name": ["a", "b", "c", "d"],
+            "amount": [1.5, 2.5, None, 4],
+        }
+    )
+    df.to_parquet(file_path, row_group_size=1)
+    return clients.get_data_client(
+        dict(
+            SOURCE_CONN_CONFIG,
+            **{"file_path": file_path, "file_type": "parquet"},
+        )
+    )
+
+
+def test_get_pandas_data_client_reads_parquet_lazily(tmp_path):
+    client = _get_parquet_client(tmp_path)
+    table = clients.get_ibis_table(client, None, TABLE_NAME)
+
+    assert isinstance(client, PandasBackend)
+    assert list(table.schema().names) == ["id", "name", "amount"]
+    assert table.count().execute() == 4
+    assert table.amount.sum().execute() == 8.0
+
+
+def test_parquet_scan_projects_and_filters(tmp_path):
+    client = _get_parquet_client(tmp_path)
+    table = clients.get_ibis_table(client, None, TABLE_NAME)
+    expr = table.filter(table.id >= 3).aggregate(total=table.amount.sum())
+
+    (scanned,) = client._scan_datasets(expr.op()).values()
+    assert list(scanned.columns) == ["id", "amount"]
+    assert list(scanned["id"]) == [3, 4]
+    assert expr.execute()["total"][0] == 4.0
+
+
+def test_parquet_scan_keeps_rows_read_without_filter(tmp_path):
+    client = _get_parquet_client(tmp_path)
+    table = clients.get_ibis_table(client, None, TABLE_NAME)
+    filtered = table.filter(table.name.isin(["a", "d"]))
+    # The table is also read unfiltered, so no rows may be skipped.
+    expr = filtered.count() + table.count()
+
+    (scanned,) = client._scan_datasets(expr.op()).values()
+    assert len(scanned) == 4
+    assert expr.execute() == 6
+    assert filtered[["id"]].execute()["id"].tolist() == [1, 4]
+
+
+def _get_large_parquet_client(tmp_path):
+    """Return a FileSystem client of a Parquet file with 200 rows in 3 groups."""
+    file_path = str(tmp_path / "large_table.parquet")
+    pandas.DataFrame({"id": range(200), "g": [i % 3 for i in range(200)]}).to_parquet(
+        file_path
+    )
+    client = clients.get_data_client(
+        dict(
+            SOURCE_CONN_CONFIG,
+            **{"file_path": file_path, "file_type": "parquet"},
+        )
+    )
+    return client, clients.get_ibis_table(client, None, TABLE_NAME)
+
+
+def test_parquet_filter_and_aggregate(tmp_path):
+    client, table = _get_large_parquet_client(tmp_path)
+    expr = table.filter(table.id < 20).aggregate(count=table.count())
+    assert client.execute(expr)["count"][0] == 20
+
+
+def test_parquet_group_by(tmp_path):
+    client, table = _get_large_parquet_client(tmp_path)
+    expr = table.filter(table.id < 30).group_by("g").aggregate(count=table.count())
+    result = client.execute(expr).sort_values("g")
+    assert result["g"].tolist() == [0, 1, 2]
+    assert result["count"].tolist() == [10, 10, 10]
+
+
+def test_parquet_self_join(tmp_path):
+    client, table = _get_large_parquet_client(tmp_path)
+    expr = table.filter(table.id < 10).join(table, "id").count()
+    assert client.execute(expr) == 10
+
+
+def test_parquet_types_unknown_to_ibis(tmp_path):
+    file_path = str(tmp_path / "typed_table.parquet")
+    pyarrow.parquet.write_table(
+        pyarrow.table(
+            {
+                "amount": pyarrow.array(
+                    [decimal.Decimal("1.50"), decimal.Decimal("2.25")],
+                    pyarrow.decimal128(10, 2),
+                ),
+                "category": pyarrow.array(["a", "b"]).dictionary_encode(),
+                "name": pyarrow.array(["x", "y"], pyarrow.large_string()),
+            }
+        ),
+        file_path,
+    )
+    client = clients.get_data_client(
+        dict(
+            SOURCE_CONN_CONFIG,
+            **{"file_path": file_path, "file_type": "parquet"},
+        )
+    )
+    table = clients.get_ibis_table(client, None, TABLE_NAME)
+    assert table.schema() == ibis.schema(
+        {"amount": "decimal(10, 2)", "category": "string", "name": "string"}
+    )
+    expr = table.filter(table.category == "b")
+    assert client.execute(expr)["name"].tolist() == ["y"]
+    assert client.execute(table.amount.sum()) == decimal.Decimal("3.75")
+
+
+def _write_partitioned_files(tmp_path, file_type):
+    """Write two part files in each of two dt=YYYY-MM-DD directories."""
+    for day in ("2024-01-01", "2024-01-02"):
+        partition_dir = tmp_path / "export" / f"dt={day}"
+        partition_dir.mkdir(parents=True)
+        for part in range(2):
+            df = pandas.DataFrame({"id": [part * 2, part * 2 + 1]})
+            file_path = str(partition_dir / f"part-{part}.{file_type}")
+            if file_type == "json":
+                df.to_json(file_path, orient="records", lines=True)
+            else:
+                df.to_parquet(file_path)
+    return tmp_path / "export"
+
+
+@pytest.mark.parametrize("file_type", ["json", "parquet"])
+def test_get_pandas_data_client_reads_partitioned_directory(tmp_path, file_type):
+    export_dir = _write_partitioned_files(tmp_path, file_type)
+    client = clients.get_data_client(
+        dict(
+            SOURCE_CONN_CONFIG,
+            **{"file_path": str(export_dir), "file_type": file_type},
+        )
+    )
+    table = clients.get_ibis_table(client, None, TABLE_NAME)
+    assert set(table.columns) == {"id", "dt"}
+    assert table.count().execute() == 8
+
+    # Filters given as SQL prune the partition directories when scanning.
+    expr = table.filter(
+        operations.compile_raw_sql(table, "dt = '2024-01-02' AND id > 0")
+    ).count()
+    (scanned,) = client._scan_datasets(
+        ibis_filesystem._replace_raw_sql(expr).op()
+    ).values()
+    assert set(scanned["dt"]) == {"2024-01-02"}
+    assert client.execute(expr) == 3
+
+
+def test_get_pandas_data_client_reads_glob(tmp_path):
+    export_dir = _write_partitioned_files(tmp_path, "parquet")
+    client = clients.get_data_client(
+        dict(
+            SOURCE_CONN_CONFIG,
+            **{
+                "file_path": str(export_dir / "dt=2024-01-0*" / "part-1.parquet"),
+                "file_type": "parquet",
+            },
+        )
+    )
+    table = clients.get_ibis_table(client, None, TABLE_NAME)
+    assert sorted(table.execute()["dt"]) == ["2024-01-01"] * 2 + ["2024-01-02"] * 2
+    assert sorted(table.id.execute()) == [2, 2, 3, 3]
+
+    with pytest.raises(exceptions.DataClientConnectionFailure, match="No files"):
+        clients.get_data_client(
+            dict(
+                SOURCE_CONN_CONFIG,
+                **{"file_path": str(export_dir / "*.orc"), "file_type": "orc"},
+            )
+        )
+
+
+def test_get_pandas_data_client_ignores_partitions_of_single_file(tmp_path):
+    partition_dir = tmp_path / "region=eu" / "dt=2024-01-01"
+    partition_dir.mkdir(parents=True)
+    file_path = str(partition_dir / "part.parquet")
+    pandas.DataFrame({"id": [1, 2], "region": ["x", "y"]}).to_parquet(file_path)
+    client = clients.get_data_client(
+        dict(
+            SOURCE_CONN_CONFIG,
+            **{"file_path": file_path, "file_type": "parquet"},
+        )
+    )
+    table = clients.get_ibis_table(client, None, TABLE_NAME)
+    assert table.columns == ["id", "region"]
+    assert client.execute(table)["region"].tolist() == ["x", "y"]
+
+
+class MockRegistryClient(object):
+    name = "postgres"
+
+    def __init__(self):
+        self.con = mock.Mock()
+
+
+@mock.patch(
+    "data_validation.clients.get_data_client",
+    side_effect=lambda _: MockRegistryClient(),
+)
+def test_shared_data_client_registry(mock_get_client):
+    """Identical connection configs share one client which is only disposed when unreferenced."""
+    conn_a = {"source_type": "Postgres", "host": "a", "port": 5432}
+    conn_b = {"source_type": "Postgres", "host": "b", "port": 5432}
+    client_a1 = clients.get_shared_data_client(conn_a)
+    client_a2 = clients.get_shared_data_client(
+        {"port": 5432, "host": "a", "source_type": "Postgres"}
+    )
+    client_b = clients.get_shared_data_client(conn_b)
+    assert client_a1 is client_a2
+    assert client_a1 is not client_b
+    assert mock_get_client.call_count == 2
+    assert clients.is_shared_data_client(client_a1)
+
+    clients.release_shared_data_client(client_a1)
+    clients.release_shared_data_client(client_b)
+    clients.dispose_shared_data_clients()
+    # client_a still has one reference so is not disposed.
+    client_a1.con.dispose.assert_not_called()
+    client_b.con.dispose.assert_called_once()
+
+    clients.release_shared_data_client(client_a2)
+    clients.dispose_shared_data_clients()
+    client_a1.con.dispose.assert_called_once()
+    assert clients._CLIENT_REGISTRY == {}
+
+
+def test_get_query_slots_shared_by_client():
+    """Validations sharing a client share its cap of concurrent queries."""
+    client, other_client = MockRegistryClient(), MockRegistryClient()
+    query_slots = clients.get_query_slots(client, 2)
+    assert clients.get_query_slots(client, 5) is query_slots
+    assert clients.get_query_slots(other_client, 2) is not query_slots
+
+    assert query_slots.acquire(blocking=False)
+    assert query_slots.acquire(blocking=False)
+    assert not query_slots.acquire(blocking=False)
+
+
+def test_shared_data_client_connects_without_registry_lock():
+    """Connecting does not hold the registry lock, a client connected twice at the
+    same time is disposed of in favour of the first one registered.
+    """
+    first_client, second_client = MockRegistryClient(), MockRegistryClient()
+
+    def connect(_):
+        assert not clients._CLIENT_REGISTRY_LOCK.locked()
+        # Another thread registers the same connection while this one connects.
+        clients._CLIENT_REGISTRY[key] = [first_client, 1]
+        return second_client
+
+    conn = {"source_type": "Postgres", "host": "c", "port": 5432}
+    key = clients._connection_config_key(conn)
+    with mock.patch("data_validation.clients.get_data_client", side_effect=connect):
+        client = clients.get_shared_data_client(conn)
+    assert client is first_client
+    assert clients._CLIENT_REGISTRY[key] == [first_client, 2]
+    second_client.con.dispose.assert_called_once()
+    del clients._CLIENT_REGISTRY[key]
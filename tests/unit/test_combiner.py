@@ -959,3 +959,225 @@ def test_generate_report_with_nan_agg_value(
         .reindex(sorted(expected.columns), axis=1)
     )
     pandas.testing.assert_frame_equal(report, expected)
+
+
+@pytest.mark.parametrize(
+    ("source_df", "target_df", "join_on_fields"),
+    (
+        (
+            pandas.DataFrame(
+                {"count": [2, 4, 8], "sum": [1.5, 2.0, 3.0], "grp": ["a", "b", "c"]}
+            ),
+            pandas.DataFrame(
+                {"count": [2, 5, 9], "sum": [1.5, 2.5, _NAN], "grp": ["a", "b", "d"]}
+            ),
+            ("grp",),
+        ),
+        (
+            # Duplicate join keys fall back to the ibis combiner.
+            pandas.DataFrame({"count": [1, 2], "sum": [1.0, 2.0], "grp": ["a", "a"]}),
+            pandas.DataFrame({"count": [1, 3], "sum": [1.0, 3.0], "grp": ["a", "a"]}),
+            ("grp",),
+        ),
+        (
+            pandas.DataFrame({"count": [1], "sum": [_NAN]}),
+            pandas.DataFrame({"count": [1], "sum": [2.0]}),
+            (),
+        ),
+    ),
+)
+def test_generate_report_from_dataframes_matches_ibis(
+    module_under_test, source_df, target_df, join_on_fields
+):
+    validations = {
+        name: metadata.ValidationMetadata(
+            source_table_name="test_source",
+            source_table_schema="bq-public.source_dataset",
+            source_column_name=name,
+            target_table_name="test_target",
+            target_table_schema="bq-public.target_dataset",
+            target_column_name=name,
+            validation_type="Column",
+            aggregation_type=name,
+            primary_keys=[],
+            num_random_rows=None,
+            threshold=10.0,
+        )
+        for name in ("count", "sum")
+    }
+
+    def run_metadata():
+        return metadata.RunMetadata(
+            validations=validations,
+            start_time=datetime.datetime(1998, 9, 4, 7, 30, 1),
+            labels=[],
+            run_id="test-run",
+        )
+
+    pandas_client = ibis.pandas.connect(
+        {"test_source": source_df, "test_target": target_df}
+    )
+    expected = module_under_test._generate_report_ibis(
+        pandas_client,
+        run_metadata(),
+        pandas_client.table("test_source"),
+        pandas_client.table("test_target"),
+        join_on_fields,
+        False,
+        False,
+    )
+    report = module_under_test.generate_report_from_dataframes(
+        run_metadata(), source_df, target_df, join_on_fields=join_on_fields
+    )
+    sort_by = ["validation_name", "group_by_columns", "source_agg_value"]
+    report = (
+        report.drop(columns=["end_time"])
+        .sort_values(sort_by)
+        .reset_index(drop=True)
+        .reindex(sorted(expected.columns.drop("end_time")), axis=1)
+    )
+    expected = (
+        expected.drop(columns=["end_time"])
+        .sort_values(sort_by)
+        .reset_index(drop=True)
+        .reindex(sorted(expected.columns.drop("end_time")), axis=1)
+    )
+    pandas.testing.assert_frame_equal(report, expected)
+
+
+@pytest.mark.parametrize("in_memory", (True, False))
+def test_generate_report_with_filter_status(module_under_test, in_memory):
+    source_df = pandas.DataFrame(
+        {"count": [2, 4, 8], "sum": [1.5, 2.0, 3.0], "grp": ["a", "b", "c"]}
+    )
+    target_df = pandas.DataFrame(
+        {"count": [2, 5, 9], "sum": [1.5, 2.5, _NAN], "grp": ["a", "b", "d"]}
+    )
+    validations = {
+        name: metadata.ValidationMetadata(
+            source_table_name="test_source",
+            source_table_schema="bq-public.source_dataset",
+            source_column_name=name,
+            target_table_name="test_target",
+            target_table_schema="bq-public.target_dataset",
+            target_column_name=name,
+            validation_type="Column",
+            aggregation_type=name,
+            primary_keys=[],
+            num_random_rows=None,
+            threshold=10.0,
+        )
+        for name in ("count", "sum")
+    }
+
+    def generate_report(filter_status=None):
+        run_metadata = metadata.RunMetadata(
+            validations=validations,
+            start_time=datetime.datetime(1998, 9, 4, 7, 30, 1),
+            labels=[],
+            run_id="test-run",
+        )
+        if in_memory:
+            return module_under_test.generate_report_from_dataframes(
+                run_metadata,
+                source_df,
+                target_df,
+                join_on_fields=("grp",),
+                filter_status=filter_status,
+            )
+        pandas_client = ibis.pandas.connect(
+            {"test_source": source_df, "test_target": target_df}
+        )
+        return module_under_test._generate_report_ibis(
+            pandas_client,
+            run_metadata,
+            pandas_client.table("test_source"),
+            pandas_client.table("test_target"),
+            ("grp",),
+            False,
+            False,
+            filter_status,
+        )
+
+    report = generate_report()
+    expected = report[report.validation_status == consts.VALIDATION_STATUS_FAIL]
+    filtered = generate_report([consts.VALIDATION_STATUS_FAIL])
+    # Rows missing from either side have no status until defaults are filled.
+    assert len(filtered) == len(expected) == 6
+    assert set(filtered.validation_status) == {consts.VALIDATION_STATUS_FAIL}
+
+    sort_by = ["validation_name", "group_by_columns"]
+    columns = sorted(report.columns.drop("end_time"))
+    pandas.testing.assert_frame_equal(
+        filtered.sort_values(sort_by).reset_index(drop=True)[columns],
+        expected.sort_values(sort_by).reset_index(drop=True)[columns],
+    )
+
+
+def _row_validations(*names):
+    return {
+        name: metadata.ValidationMetadata(
+            source_table_name="test_source",
+            source_table_schema="bq-public.source_dataset",
+            source_column_name=name,
+            target_table_name="test_target",
+            target_table_schema="bq-public.target_dataset",
+            target_column_name=name,
+            validation_type="Row",
+            aggregation_type=None,
+            primary_keys=["id"],
+            num_random_rows=None,
+            threshold=0.0,
+        )
+        for name in names
+    }
+
+
+def test_generate_report_from_dataframes_in_processes(module_under_test, monkeypatch):
+    source_df = pandas.DataFrame(
+        {"id": range(100), "hash__all": [f"h{i}" for i in range(100)]}
+    )
+    target_df = pandas.DataFrame(
+        {
+            "id": range(10, 110),
+            "hash__all": [f"h{i}" if i % 7 else "x" for i in range(10, 110)],
+        }
+    )
+    validations = _row_validations("hash__all")
+
+    def generate_report():
+        run_metadata = metadata.RunMetadata(
+            validations=validations,
+            start_time=datetime.datetime(1998, 9, 4, 7, 30, 1),
+            labels=[],
+            run_id="test-run",
+        )
+        return module_under_test.generate_report_from_dataframes(
+            run_metadata, source_df, target_df, join_on_fields=("id",)
+        ).drop(columns=["end_time"])
+
+    expected = generate_report()
+    monkeypatch.setattr(module_under_test, "PARALLEL_MIN_ROWS", 0)
+    module_under_test.set_processes(2)
+    try:
+        report = generate_report()
+    finally:
+        module_under_test.set_processes(1)
+        module_under_test.shutdown_process_pool()
+
+    sort_by = ["validation_name", "group_by_columns"]
+    assert len(report) == 110
+    pandas.testing.assert_frame_equal(
+        report.sort_values(sort_by).reset_index(drop=True),
+        expected.sort_values(sort_by).reset_index(drop=True),
+    )
+
+
+def test_to_arrow_rejects_changed_types(module_under_test):
+    assert module_under_test._to_arrow(pandas.DataFrame({"a": [1, 2]})) is not None
+    # Integers with None would be read back as floats.
+    assert (
+        module_under_test._to_arrow(pandas.DataFrame({"a": [1, None]}, dtype=object))
+        is None
+    )
+    assert module_under_test._to_arrow(pandas.DataFrame({"a": [1, "b"]})) is None
@@ -603,6 +603,42 @@ def test_get_correct_run_id(module_under_test):
     assert config_manager.run_id == SAMPLE_ROW_CONFIG[consts.CONFIG_RUN_ID]
 
 
+@pytest.mark.parametrize(
+    "shard,env,expected",
+    [
+        (None, {}, None),
+        ("3/100", {"CLOUD_RUN_TASK_INDEX": "7"}, (3, 100)),
+        ("100", {"JOB_COMPLETION_INDEX": "7"}, (7, 100)),
+        ("100", {"CLOUD_RUN_TASK_INDEX": "8"}, (8, 100)),
+    ],
+)
+def test_shard(module_under_test, monkeypatch, shard, env, expected):
+    monkeypatch.delenv("JOB_COMPLETION_INDEX", raising=False)
+    monkeypatch.delenv("CLOUD_RUN_TASK_INDEX", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    config_manager = module_under_test.ConfigManager(
+        dict(SAMPLE_ROW_CONFIG, **{consts.CONFIG_SHARD: shard}),
+        MockIbisClient(),
+        MockIbisClient(),
+        verbose=False,
+    )
+    assert config_manager.shard() == expected
+
+
+def test_shard_without_index(module_under_test, monkeypatch):
+    monkeypatch.delenv("JOB_COMPLETION_INDEX", raising=False)
+    monkeypatch.delenv("CLOUD_RUN_TASK_INDEX", raising=False)
+    config_manager = module_under_test.ConfigManager(
+        dict(SAMPLE_ROW_CONFIG, **{consts.CONFIG_SHARD: "100"}),
+        MockIbisClient(),
+        MockIbisClient(),
+        verbose=False,
+    )
+    with pytest.raises(ValueError, match="has no index"):
+        config_manager.shard()
+
+
 def test_get_none_run_id(module_under_test):
     config_manager = module_under_test.ConfigManager(
         SAMPLE_CONFIG, MockIbisClient(), MockIbisClient(), verbose=False
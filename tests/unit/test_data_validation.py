@@ -12,12 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
 import json
 import logging
 import pandas
 import pytest
 import random
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from unittest import mock
 from google.cloud import bigquery
 
@@ -526,6 +527,32 @@ def test_data_validation_client(module_under_test, fs):
     assert int(result_df.source_agg_value[0]) == 2
 
 
+def test_data_validation_only_closes_own_clients(module_under_test, fs):
+    """Clients passed to DataValidation belong to the caller and are not closed on exit."""
+    _create_table_file(TARGET_TABLE_FILE_PATH, JSON_DATA)
+    source_client = mock.Mock()
+    with mock.patch("data_validation.clients.dispose_data_client") as mock_dispose:
+        with module_under_test.DataValidation(
+            SAMPLE_CONFIG, source_client=source_client
+        ) as validator:
+            target_client = validator.config_manager.target_client
+    mock_dispose.assert_called_once_with(target_client)
+
+
+def test_data_validation_shares_query_slots(module_under_test, fs):
+    """Validations sharing a client share its cap of concurrent queries."""
+    source_client, target_client = mock.Mock(), mock.Mock()
+    first, second = [
+        module_under_test.DataValidation(
+            SAMPLE_CONFIG, source_client=source_client, target_client=target_client
+        )
+        for _ in range(2)
+    ]
+    assert first._source_query_slots is second._source_query_slots
+    assert first._target_query_slots is second._target_query_slots
+    assert first._source_query_slots is not first._target_query_slots
+
+
 def test_zero_source_value(module_under_test, fs):
     _create_table_file(SOURCE_TABLE_FILE_PATH, JSON_COLA_ZERO_DATA)
     _create_table_file(TARGET_TABLE_FILE_PATH, JSON_DATA)
@@ -740,6 +767,437 @@ def test_fail_row_level_validation(module_under_test, fs):
     assert len(fail_df) == 5
 
 
+def test_paged_row_level_validation(module_under_test, fs, monkeypatch):
+    mock_bq_client = mock.create_autospec(bigquery.Client)
+    monkeypatch.setattr(bigquery, "Client", value=mock_bq_client)
+    # Source and target only partially overlap so pages include missing rows.
+    source_data = _generate_fake_data(rows=100, second_range=0)
+    target_data = _generate_fake_data(initial_id=5, rows=100, second_range=0)
+    _create_table_file(SOURCE_TABLE_FILE_PATH, _get_fake_json_data(source_data))
+    _create_table_file(TARGET_TABLE_FILE_PATH, _get_fake_json_data(target_data))
+
+    expected_df = module_under_test.DataValidation(SAMPLE_ROW_CONFIG).validate()
+    paged_config = dict(SAMPLE_ROW_CONFIG, **{consts.CONFIG_PAGE_SIZE: 7})
+    result_df = module_under_test.DataValidation(paged_config).validate()
+
+    assert len(result_df) == len(expected_df) == 210
+    columns = ["validation_name", "group_by_columns", "validation_status"]
+    assert sorted(result_df[columns].itertuples(index=False)) == sorted(
+        expected_df[columns].itertuples(index=False)
+    )
+
+
+def test_paged_row_level_validation_writes_each_page(module_under_test, fs):
+    data = _generate_fake_data(rows=20, second_range=0)
+    _create_table_file(SOURCE_TABLE_FILE_PATH, _get_fake_json_data(data))
+    _create_table_file(TARGET_TABLE_FILE_PATH, _get_fake_json_data(data))
+    result_handler = mock.Mock()
+
+    paged_config = dict(SAMPLE_ROW_CONFIG, **{consts.CONFIG_PAGE_SIZE: 8})
+    client = module_under_test.DataValidation(
+        paged_config, result_handler=result_handler
+    )
+    client.execute()
+
+    written = [call.args[0] for call in result_handler.execute.call_args_list]
+    assert [len(result_df) for result_df in written] == [16, 16, 8]
+
+
+def test_paged_row_level_validation_bounds_both_sides(module_under_test, fs):
+    # The target has many rows between two source keys, pages stay bounded.
+    target_data = _generate_fake_data(rows=40, second_range=0)
+    _create_table_file(SOURCE_TABLE_FILE_PATH, _get_fake_json_data(target_data[::10]))
+    _create_table_file(TARGET_TABLE_FILE_PATH, _get_fake_json_data(target_data))
+    result_handler = mock.Mock()
+
+    paged_config = dict(SAMPLE_ROW_CONFIG, **{consts.CONFIG_PAGE_SIZE: 3})
+    client = module_under_test.DataValidation(
+        paged_config, result_handler=result_handler
+    )
+    client.execute()
+
+    written = [call.args[0] for call in result_handler.execute.call_args_list]
+    # Two compared columns per row, at most one page of rows from each side.
+    assert max(len(result_df) for result_df in written) <= 2 * 2 * 3
+    result_df = pandas.concat(written)
+    assert len(result_df) == 80
+    assert (
+        result_df["validation_status"] == consts.VALIDATION_STATUS_SUCCESS
+    ).sum() == 8
+
+
+def test_presence_first_row_level_validation(module_under_test, fs, monkeypatch):
+    mock_bq_client = mock.create_autospec(bigquery.Client)
+    monkeypatch.setattr(bigquery, "Client", value=mock_bq_client)
+    source_data = _generate_fake_data(rows=100, second_range=0)
+    target_data = _generate_fake_data(initial_id=5, rows=100, second_range=0)
+    _create_table_file(SOURCE_TABLE_FILE_PATH, _get_fake_json_data(source_data))
+    _create_table_file(TARGET_TABLE_FILE_PATH, _get_fake_json_data(target_data))
+
+    expected_df = module_under_test.DataValidation(SAMPLE_ROW_CONFIG).validate()
+    presence_config = dict(SAMPLE_ROW_CONFIG, **{consts.CONFIG_PRESENCE_FIRST: True})
+    result_df = module_under_test.DataValidation(presence_config).validate()
+
+    assert len(result_df) == len(expected_df) == 210
+    columns = ["validation_name", "group_by_columns", "validation_status"]
+    assert sorted(result_df[columns].itertuples(index=False)) == sorted(
+        expected_df[columns].itertuples(index=False)
+    )
+
+
+def test_presence_first_row_level_validation_writes_missing_rows_first(
+    module_under_test, fs
+):
+    data = _generate_fake_data(rows=23, second_range=0)
+    _create_table_file(SOURCE_TABLE_FILE_PATH, _get_fake_json_data(data[:20]))
+    _create_table_file(TARGET_TABLE_FILE_PATH, _get_fake_json_data(data[3:]))
+    result_handler = mock.Mock()
+
+    presence_config = dict(SAMPLE_ROW_CONFIG, **{consts.CONFIG_PRESENCE_FIRST: True})
+    client = module_under_test.DataValidation(
+        presence_config, result_handler=result_handler
+    )
+    client.execute()
+
+    missing_df, matched_df = [
+        call.args[0] for call in result_handler.execute.call_args_list
+    ]
+    # Ids 0 to 2 are only in the source, ids 20 to 22 only in the target.
+    assert len(missing_df) == 12
+    assert set(missing_df["validation_status"]) == {consts.VALIDATION_STATUS_FAIL}
+    assert len(matched_df) == 34
+    assert set(matched_df["validation_status"]) == {consts.VALIDATION_STATUS_SUCCESS}
+
+
+def test_presence_first_row_level_validation_filter_status(module_under_test, fs):
+    data = _generate_fake_data(rows=23, second_range=0)
+    _create_table_file(SOURCE_TABLE_FILE_PATH, _get_fake_json_data(data[:20]))
+    _create_table_file(TARGET_TABLE_FILE_PATH, _get_fake_json_data(data[3:]))
+    result_handler = mock.Mock()
+
+    presence_config = dict(
+        SAMPLE_ROW_CONFIG,
+        **{
+            consts.CONFIG_PRESENCE_FIRST: True,
+            consts.CONFIG_FILTER_STATUS: [consts.VALIDATION_STATUS_FAIL],
+        },
+    )
+    client = module_under_test.DataValidation(
+        presence_config, result_handler=result_handler
+    )
+    client.execute()
+
+    missing_df, matched_df = [
+        call.args[0] for call in result_handler.execute.call_args_list
+    ]
+    # Both phases only build the failed rows into their reports.
+    assert len(missing_df) == 12
+    assert matched_df.empty
+
+
+def test_spilled_row_level_validation(module_under_test, tmp_path, monkeypatch):
+    # Spilled rows are written by pyarrow, which does not see a fake file system.
+    monkeypatch.chdir(tmp_path)
+    mock_bq_client = mock.create_autospec(bigquery.Client)
+    monkeypatch.setattr(bigquery, "Client", value=mock_bq_client)
+    source_data = _generate_fake_data(rows=100, second_range=0)
+    target_data = _generate_fake_data(initial_id=5, rows=100, second_range=0)
+    _create_table_file(SOURCE_TABLE_FILE_PATH, _get_fake_json_data(source_data))
+    _create_table_file(TARGET_TABLE_FILE_PATH, _get_fake_json_data(target_data))
+
+    expected_df = module_under_test.DataValidation(SAMPLE_ROW_CONFIG).validate()
+    spill_config = dict(SAMPLE_ROW_CONFIG, **{consts.CONFIG_SPILL_MEMORY_MB: 1})
+    result_df = module_under_test.DataValidation(spill_config).validate()
+
+    assert len(result_df) == len(expected_df) == 210
+    columns = ["validation_name", "group_by_columns", "validation_status"]
+    assert sorted(result_df[columns].itertuples(index=False)) == sorted(
+        expected_df[columns].itertuples(index=False)
+    )
+
+
+def test_sharded_row_level_validation(module_under_test, fs, monkeypatch):
+    mock_bq_client = mock.create_autospec(bigquery.Client)
+    monkeypatch.setattr(bigquery, "Client", value=mock_bq_client)
+    source_data = _generate_fake_data(rows=100, second_range=0)
+    target_data = _generate_fake_data(initial_id=5, rows=100, second_range=0)
+    _create_table_file(SOURCE_TABLE_FILE_PATH, _get_fake_json_data(source_data))
+    _create_table_file(TARGET_TABLE_FILE_PATH, _get_fake_json_data(target_data))
+
+    expected_df = module_under_test.DataValidation(SAMPLE_ROW_CONFIG).validate()
+    shard_dfs = [
+        module_under_test.DataValidation(
+            dict(SAMPLE_ROW_CONFIG, **{consts.CONFIG_SHARD: f"{index}/3"})
+        ).validate()
+        for index in range(3)
+    ]
+
+    # Every row is validated by exactly one shard.
+    assert all(0 < len(shard_df) < len(expected_df) for shard_df in shard_dfs)
+    result_df = pandas.concat(shard_dfs)
+    columns = ["validation_name", "group_by_columns", "validation_status"]
+    assert sorted(result_df[columns].itertuples(index=False)) == sorted(
+        expected_df[columns].itertuples(index=False)
+    )
+
+
+def test_hash_bucket_row_level_validation(module_under_test, fs, monkeypatch):
+    mock_bq_client = mock.create_autospec(bigquery.Client)
+    monkeypatch.setattr(bigquery, "Client", value=mock_bq_client)
+    source_data = _generate_fake_data(rows=200, second_range=0)
+    target_data = _generate_fake_data(initial_id=1, rows=200, second_range=0)
+    for row in source_data + target_data:
+        row["text_value"] = hashlib.sha256(str(row["id"]).encode()).hexdigest()
+    for row in target_data[10:13]:
+        row["text_value"] = hashlib.sha256(b"changed").hexdigest()
+    _create_table_file(SOURCE_TABLE_FILE_PATH, _get_fake_json_data(source_data))
+    _create_table_file(TARGET_TABLE_FILE_PATH, _get_fake_json_data(target_data))
+
+    hash_bucket_config = dict(
+        SAMPLE_ROW_CONFIG,
+        **{
+            consts.CONFIG_COMPARISON_FIELDS: [
+                {
+                    consts.CONFIG_FIELD_ALIAS: "hash__all",
+                    consts.CONFIG_SOURCE_COLUMN: "text_value",
+                    consts.CONFIG_TARGET_COLUMN: "text_value",
+                    consts.CONFIG_CAST: None,
+                },
+            ],
+            consts.CONFIG_HASH_BUCKETS: 16,
+            consts.CONFIG_MAX_RECURSIVE_QUERY_SIZE: 10,
+        },
+    )
+    result_df = module_under_test.DataValidation(hash_bucket_config).validate()
+
+    # Only the rows of mismatched buckets are compared row by row.
+    assert len(result_df) < 200
+    fail_df = result_df[result_df["validation_status"] == consts.VALIDATION_STATUS_FAIL]
+    failed_ids = sorted(
+        json.loads(group_by_columns)["id"]
+        for group_by_columns in fail_df["group_by_columns"]
+    )
+    assert failed_ids == ["0", "11", "12", "13", "200"]
+
+
+def test_hash_bucket_row_level_validation_all_rows_differ(
+    module_under_test, fs, monkeypatch
+):
+    mock_bq_client = mock.create_autospec(bigquery.Client)
+    monkeypatch.setattr(bigquery, "Client", value=mock_bq_client)
+    source_data = _generate_fake_data(rows=200, second_range=0)
+    target_data = _generate_fake_data(rows=200, second_range=0)
+    for row in source_data + target_data:
+        row["text_value"] = hashlib.sha256(str(id(row)).encode()).hexdigest()
+    _create_table_file(SOURCE_TABLE_FILE_PATH, _get_fake_json_data(source_data))
+    _create_table_file(TARGET_TABLE_FILE_PATH, _get_fake_json_data(target_data))
+
+    hash_bucket_config = dict(
+        SAMPLE_ROW_CONFIG,
+        **{
+            consts.CONFIG_COMPARISON_FIELDS: [
+                {
+                    consts.CONFIG_FIELD_ALIAS: "hash__all",
+                    consts.CONFIG_SOURCE_COLUMN: "text_value",
+                    consts.CONFIG_TARGET_COLUMN: "text_value",
+                    consts.CONFIG_CAST: None,
+                },
+            ],
+            consts.CONFIG_HASH_BUCKETS: 16,
+            consts.CONFIG_MAX_RECURSIVE_QUERY_SIZE: 10,
+        },
+    )
+    client = module_under_test.DataValidation(hash_bucket_config)
+    with mock.patch.object(
+        client, "_execute_queries", wraps=client._execute_queries
+    ) as mock_execute:
+        result_df = client.validate()
+
+    # The second level splits no differences away, so rows are compared without
+    # drilling down any further.
+    assert mock_execute.call_count == 3
+    assert len(result_df) == 200
+    assert (result_df["validation_status"] == consts.VALIDATION_STATUS_FAIL).all()
+
+
+def test_hash_bucket_row_level_validation_requires_hash(
+    module_under_test, fs, monkeypatch
+):
+    mock_bq_client = mock.create_autospec(bigquery.Client)
+    monkeypatch.setattr(bigquery, "Client", value=mock_bq_client)
+    data = _generate_fake_data(rows=10, second_range=0)
+    _create_table_file(SOURCE_TABLE_FILE_PATH, _get_fake_json_data(data))
+    _create_table_file(TARGET_TABLE_FILE_PATH, _get_fake_json_data(data))
+
+    hash_bucket_config = dict(SAMPLE_ROW_CONFIG, **{consts.CONFIG_HASH_BUCKETS: 16})
+    with pytest.raises(ValueError, match="require a --hash validation"):
+        module_under_test.DataValidation(hash_bucket_config).validate()
+
+
+def test_incremental_row_level_validation(module_under_test, fs, monkeypatch):
+    mock_bq_client = mock.create_autospec(bigquery.Client)
+    monkeypatch.setattr(bigquery, "Client", value=mock_bq_client)
+    data = _generate_fake_data(rows=10, second_range=0)
+    json_data = _get_fake_json_data(data)
+    _create_table_file(SOURCE_TABLE_FILE_PATH, json_data)
+    _create_table_file(TARGET_TABLE_FILE_PATH, json_data)
+    incremental_config = dict(
+        SAMPLE_ROW_CONFIG, **{consts.CONFIG_WATERMARK_COLUMN: "id"}
+    )
+
+    # The first run validates all rows and stores the max id.
+    client = module_under_test.DataValidation(incremental_config)
+    assert len(client.execute()) == 20
+    assert client.config_manager.get_watermark() == {"column": "id", "value": 9}
+
+    # Later runs only validate the new rows.
+    json_data = _get_fake_json_data(data + _generate_fake_data(initial_id=10, rows=5))
+    _create_table_file(SOURCE_TABLE_FILE_PATH, json_data)
+    _create_table_file(TARGET_TABLE_FILE_PATH, json_data)
+    result_df = module_under_test.DataValidation(incremental_config).execute()
+    assert sorted(set(result_df["group_by_columns"])) == [
+        f'{{"id": "{i}"}}' for i in range(10, 15)
+    ]
+
+    overlap_config = dict(incremental_config, **{consts.CONFIG_WATERMARK_OVERLAP: 2})
+    result_df = module_under_test.DataValidation(overlap_config).validate()
+    assert len(result_df) == 4
+
+
+def test_move_watermark_back(module_under_test):
+    move_back = module_under_test._move_watermark_back
+    assert move_back(10, 2) == 8
+    assert move_back(10, 0) == 10
+    assert move_back(pandas.Timestamp("2024-01-02 00:00:00"), 3600) == pandas.Timestamp(
+        "2024-01-01 23:00:00"
+    )
+    # Dates move back by whole days, even when the overlap is less than a day.
+    assert move_back(date(2024, 1, 2), 3600) == date(2024, 1, 1)
+    assert move_back(date(2024, 1, 3), 86401) == date(2024, 1, 1)
+
+
+def test_incremental_validation_keeps_watermark_on_result_handler_error(
+    module_under_test, fs, monkeypatch
+):
+    mock_bq_client = mock.create_autospec(bigquery.Client)
+    monkeypatch.setattr(bigquery, "Client", value=mock_bq_client)
+    data = _generate_fake_data(rows=10, second_range=0)
+    json_data = _get_fake_json_data(data)
+    _create_table_file(SOURCE_TABLE_FILE_PATH, json_data)
+    _create_table_file(TARGET_TABLE_FILE_PATH, json_data)
+    incremental_config = dict(
+        SAMPLE_ROW_CONFIG, **{consts.CONFIG_WATERMARK_COLUMN: "id"}
+    )
+
+    client = module_under_test.DataValidation(incremental_config)
+    client.result_handler = mock.Mock()
+    client.result_handler.execute.side_effect = RuntimeError("Could not write")
+    with pytest.raises(RuntimeError, match="Could not write"):
+        client.execute()
+    assert client.config_manager.get_watermark() is None
+
+
+def test_incremental_validation_keeps_watermark_on_failure(
+    module_under_test, fs, monkeypatch
+):
+    mock_bq_client = mock.create_autospec(bigquery.Client)
+    monkeypatch.setattr(bigquery, "Client", value=mock_bq_client)
+    data = _generate_fake_data(rows=10, second_range=0)
+    _create_table_file(SOURCE_TABLE_FILE_PATH, _get_fake_json_data(data))
+    _create_table_file(TARGET_TABLE_FILE_PATH, _get_fake_json_data(data[:-1]))
+    incremental_config = dict(
+        SAMPLE_ROW_CONFIG, **{consts.CONFIG_WATERMARK_COLUMN: "id"}
+    )
+
+    client = module_under_test.DataValidation(incremental_config)
+    result_df = client.validate()
+
+    assert (result_df["validation_status"] == consts.VALIDATION_STATUS_FAIL).any()
+    assert client.config_manager.get_watermark() is None
+
+
+def test_grouped_row_level_validation_drills_into_failing_groups(
+    module_under_test, fs, monkeypatch
+):
+    mock_bq_client = mock.create_autospec(bigquery.Client)
+    monkeypatch.setattr(bigquery, "Client", value=mock_bq_client)
+    source_data = _generate_fake_data(rows=40, second_range=0)
+    for row in source_data:
+        row["text_value"] = f"group_{row['id'] % 4}"
+    target_data = [dict(row) for row in source_data]
+    for row in target_data:
+        if row["id"] in (2, 6, 11):
+            row["int_value"] += 1000
+    _create_table_file(SOURCE_TABLE_FILE_PATH, _get_fake_json_data(source_data))
+    _create_table_file(TARGET_TABLE_FILE_PATH, _get_fake_json_data(target_data))
+
+    grouped_config = dict(
+        SAMPLE_ROW_CONFIG,
+        **{
+            consts.CONFIG_RESULT_HANDLER: None,
+            consts.CONFIG_GROUPED_COLUMNS: [
+                {
+                    consts.CONFIG_FIELD_ALIAS: "text_value",
+                    consts.CONFIG_SOURCE_COLUMN: "text_value",
+                    consts.CONFIG_TARGET_COLUMN: "text_value",
+                    consts.CONFIG_CAST: None,
+                },
+            ],
+            consts.CONFIG_AGGREGATES: [
+                {
+                    consts.CONFIG_SOURCE_COLUMN: "int_value",
+                    consts.CONFIG_TARGET_COLUMN: "int_value",
+                    consts.CONFIG_FIELD_ALIAS: "sum_int_value",
+                    consts.CONFIG_TYPE: "sum",
+                },
+            ],
+        },
+    )
+    results = []
+    # One query pair for the groups, then one for the rows of the failing groups
+    # or, with in-lists of one value, one per failing group run concurrently.
+    for max_concurrent_queries, in_list_size, query_pairs in ((1, None, 2), (3, 1, 3)):
+        monkeypatch.setattr(
+            module_under_test.clients,
+            "get_max_in_list_size",
+            lambda client, **kwargs: in_list_size,
+        )
+        monkeypatch.setattr(
+            "data_validation.validation_builder.get_max_in_list_size",
+            lambda client, **kwargs: in_list_size,
+        )
+        config = dict(
+            grouped_config,
+            **{consts.CONFIG_MAX_CONCURRENT_QUERIES: max_concurrent_queries},
+        )
+        client = module_under_test.DataValidation(config)
+        with mock.patch.object(
+            client, "_execute_queries", wraps=client._execute_queries
+        ) as execute_queries:
+            results.append(client.validate())
+        assert execute_queries.call_count == query_pairs
+
+    for result_df in results:
+        # The 2 matching groups are reported by their aggregates, while the 10
+        # rows of each of the 2 failing groups are compared row by row.
+        group_by_columns = result_df["group_by_columns"]
+        assert sorted(
+            group_by_columns[group_by_columns.str.contains("group_")].unique()
+        ) == [
+            '{"text_value": "group_0"}',
+            '{"text_value": "group_1"}',
+        ]
+        assert len(result_df) == 2 * 2 + 2 * 10 * 2
+        fail_df = result_df[
+            result_df["validation_status"] == consts.VALIDATION_STATUS_FAIL
+        ]
+        assert sorted(fail_df["group_by_columns"]) == [
+            '{"id": "11"}',
+            '{"id": "2"}',
+            '{"id": "6"}',
+        ]
+
+
 def test_bad_join_row_level_validation(module_under_test, fs, caplog, monkeypatch):
     # Mock the big query client
     mock_bq_client = mock.create_autospec(bigquery.Client)
@@ -890,3 +1348,63 @@ def test_console_data_shown_for_matching_validation_with_result_written_to_bq_in
     caplog_messages = [_.message for _ in caplog.records]
     assert "No results to write to BigQuery" in caplog_messages
     assert any([_ for _ in caplog_messages if _.startswith("Empty DataFrame")])
+
+
+def test_row_validation_results_written_to_parquet(
+    module_under_test, tmp_path, monkeypatch
+):
+    # Parquet files are written by pyarrow, which does not see a fake file system.
+    monkeypatch.chdir(tmp_path)
+    data = _generate_fake_data(rows=10, second_range=0)
+    _create_table_file(SOURCE_TABLE_FILE_PATH, _get_fake_json_data(data))
+    _create_table_file(TARGET_TABLE_FILE_PATH, _get_fake_json_data(data[2:]))
+    config = dict(
+        SAMPLE_ROW_CONFIG,
+        **{
+            consts.CONFIG_RESULT_HANDLER: {
+                consts.CONFIG_TYPE: "Parquet",
+                consts.RESULT_HANDLER_DIRECTORY: "results",
+                consts.RESULT_HANDLER_PARTITION_BY: consts.PARTITION_BY_RUN_ID,
+            },
+            consts.CONFIG_FILTER_STATUS: [consts.VALIDATION_STATUS_FAIL],
+        },
+    )
+    client = module_under_test.DataValidation(config)
+    result_df = client.execute()
+    client.result_handler.close()
+
+    parquet_df = pandas.read_parquet("results")
+    # Two missing rows with two comparison fields each.
+    assert len(parquet_df) == len(result_df) == 4
+    assert set(parquet_df["validation_status"]) == {consts.VALIDATION_STATUS_FAIL}
+    assert set(parquet_df["run_id"].astype(str)) == {client.run_metadata.run_id}
+
+
+def test_row_validation_filter_status_keeps_watermark_logic(module_under_test, fs):
+    data = _generate_fake_data(rows=10, second_range=0)
+    _create_table_file(SOURCE_TABLE_FILE_PATH, _get_fake_json_data(data))
+    _create_table_file(TARGET_TABLE_FILE_PATH, _get_fake_json_data(data[1:]))
+
+    config = dict(
+        SAMPLE_ROW_CONFIG,
+        **{
+            consts.CONFIG_RESULT_HANDLER: None,
+            consts.CONFIG_FILTER_STATUS: [consts.VALIDATION_STATUS_FAIL],
+        },
+    )
+    client = module_under_test.DataValidation(config)
+    assert client._report_filter_status() == [consts.VALIDATION_STATUS_FAIL]
+    result_df = client.validate()
+    # Only the missing row is built into the report, once per comparison field.
+    assert len(result_df) == 2
+    assert set(result_df.validation_status) == {consts.VALIDATION_STATUS_FAIL}
+
+    config[consts.CONFIG_FILTER_STATUS] = [consts.VALIDATION_STATUS_SUCCESS]
+    client = module_under_test.DataValidation(config)
+    assert client._report_filter_status() == [consts.VALIDATION_STATUS_SUCCESS]
+
+    # Failures are still needed to decide on watermarks, so are not filtered out.
+    config[consts.CONFIG_WATERMARK_COLUMN] = "id"
+    client = module_under_test.DataValidation(config)
+    client._add_watermark_filter()
+    assert client._report_filter_status() is None
@@ -158,3 +158,27 @@ def test_expand_tables_of_asterisk(
             tables_list, mock.Mock(), mock.Mock()
         )
         assert result == expected_result
+
+
+def test_expand_tables_of_asterisk_lists_catalogs_once(module_under_test):
+    def get_client(schemas):
+        client = mock.Mock(spec=["name", "list_databases", "list_tables"])
+        client.name = "postgres"
+        client.list_databases.return_value = schemas
+        client.list_tables.side_effect = lambda database: ["t1", "t2"]
+        return client
+
+    source_client = get_client(["a", "b", "c"])
+    target_client = get_client(["a", "b", "c", "d"])
+    tables_list = [
+        {"schema_name": schema_name, "table_name": "*"} for schema_name in "abc"
+    ]
+    result = module_under_test.expand_tables_of_asterisk(
+        tables_list, source_client, target_client
+    )
+    assert len(result) == 6
+
+    source_client.list_databases.assert_called_once()
+    target_client.list_databases.assert_called_once()
+    assert source_client.list_tables.call_count == 3
+    assert target_client.list_tables.call_count == 4
@@ -0,0 +1,64 @@
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+
+import pytest
+
+TABLE_WORDS = ["orders", "order_items", "customers", "cust_addr", "sales", "dim_date"]
+
+
+@pytest.fixture
+def module_under_test():
+    from data_validation import jellyfish_distance
+
+    return jellyfish_distance
+
+
+def _random_table_name(rng):
+    return (
+        rng.choice(["dbo", "public", "hr"])
+        + "."
+        + rng.choice(TABLE_WORDS)
+        + rng.choice(["", "_v2", "_old", str(rng.randint(0, 99))])
+    )
+
+
+@pytest.mark.parametrize("score_cutoff", (0, 0.5, 0.8, 0.9, 1))
+def test_closest_match_index_matches_extract_closest_match(
+    module_under_test, score_cutoff
+):
+    rng = random.Random(42)
+    targets = sorted({_random_table_name(rng) for _ in range(300)})
+    search_keys = [
+        _random_table_name(rng) + rng.choice(["", "x", "_new"]) for _ in range(100)
+    ] + ["", "zzz"]
+
+    index = module_under_test.ClosestMatchIndex(targets)
+    for search_key in search_keys:
+        assert index.extract_closest_match(
+            search_key, score_cutoff=score_cutoff
+        ) == module_under_test.extract_closest_match(
+            search_key, targets, score_cutoff=score_cutoff
+        )
+
+
+def test_closest_match_index_ties_resolve_to_last_target(module_under_test):
+    targets = ["ab", "ba", "abc"]
+    index = module_under_test.ClosestMatchIndex(targets)
+    assert index.extract_closest_match("abx") == (
+        module_under_test.extract_closest_match("abx", targets)
+    )
+    assert index.extract_closest_match("abc") == "abc"
+    assert module_under_test.ClosestMatchIndex([]).extract_closest_match("a") is None
@@ -0,0 +1,93 @@
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+import ibis
+import pytest
+
+from data_validation import consts
+
+SCHEMA = ibis.schema(
+    [("id", "!int64"), ("amount", "decimal(38, 9)"), ("ts", "timestamp('UTC')")]
+)
+
+
+class FakeClient(object):
+    def __init__(self, connection_key=None):
+        self._connection_key = connection_key
+
+
+@pytest.fixture
+def module_under_test(monkeypatch, tmp_path):
+    from data_validation import metadata_cache
+
+    monkeypatch.setenv(consts.ENV_DIRECTORY_VAR, str(tmp_path))
+    monkeypatch.setattr(metadata_cache, "_TTL_SECONDS", None)
+    return metadata_cache
+
+
+def test_metadata_cached_per_client(module_under_test):
+    loader = mock.Mock(return_value=SCHEMA)
+    client = FakeClient("conn")
+    for _ in range(3):
+        assert module_under_test.get_table_schema(client, "s", "t", loader) == SCHEMA
+    loader.assert_called_once()
+
+    # Without a TTL nothing is stored, other clients load again.
+    module_under_test.get_table_schema(FakeClient("conn"), "s", "t", loader)
+    assert loader.call_count == 2
+
+
+def test_table_schema_uses_cached_table(module_under_test):
+    client = FakeClient()
+    table = ibis.table(SCHEMA, name="t")
+    table_loader = mock.Mock(return_value=table)
+    assert module_under_test.get_table(client, "s", "t", table_loader) is table
+    assert module_under_test.get_table(client, "s", "t", table_loader) is table
+    table_loader.assert_called_once()
+
+    schema_loader = mock.Mock()
+    assert module_under_test.get_table_schema(client, "s", "t", schema_loader) == SCHEMA
+    schema_loader.assert_not_called()
+
+
+def test_metadata_stored_with_ttl(module_under_test, monkeypatch):
+    module_under_test.set_ttl(60)
+    schema_loader = mock.Mock(return_value=SCHEMA)
+    pk_loader = mock.Mock(return_value=("id",))
+    module_under_test.get_table_schema(FakeClient("conn"), "s", "t", schema_loader)
+    module_under_test.get_primary_keys(FakeClient("conn"), "s", "t", pk_loader)
+
+    # A later run with the same connection reuses the stored metadata.
+    assert (
+        module_under_test.get_table_schema(FakeClient("conn"), "s", "t", schema_loader)
+        == SCHEMA
+    )
+    assert module_under_test.get_primary_keys(
+        FakeClient("conn"), "s", "t", pk_loader
+    ) == ["id"]
+    schema_loader.assert_called_once()
+    pk_loader.assert_called_once()
+
+    # Other connections and tables are not shared.
+    module_under_test.get_table_schema(FakeClient("other"), "s", "t", schema_loader)
+    module_under_test.get_table_schema(FakeClient("conn"), "s", "t2", schema_loader)
+    assert schema_loader.call_count == 3
+
+    # Expired metadata is loaded again.
+    now = module_under_test.time.time()
+    monkeypatch.setattr(module_under_test.time, "time", lambda: now + 61)
+    module_under_test.get_table_schema(FakeClient("conn"), "s", "t", schema_loader)
+    assert schema_loader.call_count == 4
@@ -19,10 +19,16 @@ import json
 import random
 import math
 from datetime import datetime, timedelta
+from unittest import mock
+
+import ibis
+import numpy
+import pandas
 
 from data_validation import cli_tools
 from data_validation import consts
 from data_validation.config_manager import ConfigManager
+from data_validation.query_builder.random_row_builder import RANDOM_SORT_SUPPORTS
 
 SOURCE_TABLE_FILE_PATH = "source_table_data.json"
 TARGET_TABLE_FILE_PATH = "target_table_data.json"
@@ -711,3 +717,91 @@ def test_create_partition_query_yaml(module_under_test):
     assert len(yaml_configs_list[0]["yaml_files"][0]["yaml_config"]["validations"]) == 5
     # 4 validations in the second file
     assert len(yaml_configs_list[0]["yaml_files"][1]["yaml_config"]["validations"]) == 4
+
+
+def test_get_sampled_first_keys(module_under_test):
+    """Estimate the first key of each partition from a sample of keys"""
+    config_manager = _generate_config_manager("test_table")
+    parser = cli_tools.configure_arg_parser()
+    mock_args = parser.parse_args(TABLE_PART_ARGS + ["--partition-sample-size", "200"])
+    builder = module_under_test.PartitionBuilder([config_manager], mock_args)
+
+    df = pandas.DataFrame({"id": list(range(99, -1, -1)) + [None]})
+    client = ibis.pandas.connect({"keys": df})
+
+    first_keys = builder._get_sampled_first_keys(client, client.table("keys"), ["id"])
+
+    # The sample is larger than the table so every key is part of the sample.
+    assert first_keys[:, 0].tolist() == [0, 11, 22, 33, 44, 55, 66, 77, 88]
+
+
+def test_get_partition_key_filters_without_random_sort(
+    module_under_test, monkeypatch, tmp_path, caplog
+):
+    """Engines without a random sort number every row rather than sampling keys"""
+    monkeypatch.chdir(tmp_path)
+    data = [{"id": 7, "int_value": 1, "text_value": "a"}]
+    _create_table_file(SOURCE_TABLE_FILE_PATH, json.dumps(data))
+    _create_table_file(TARGET_TABLE_FILE_PATH, json.dumps(data))
+    config_manager = _generate_config_manager("my_table")
+    assert config_manager.source_client.name not in RANDOM_SORT_SUPPORTS
+    parser = cli_tools.configure_arg_parser()
+    mock_args = parser.parse_args(TABLE_PART_ARGS + ["--partition-sample-size", "50"])
+    builder = module_under_test.PartitionBuilder([config_manager], mock_args)
+
+    # The pandas backend can not number rows or compile SQL, both are faked.
+    monkeypatch.setattr(
+        builder, "_get_first_keys", mock.Mock(return_value=numpy.array([[7]]))
+    )
+    monkeypatch.setattr(builder, "_get_sampled_first_keys", mock.Mock())
+    monkeypatch.setattr(
+        builder,
+        "_extract_where",
+        lambda table_expr, client: table_expr.execute()["id"].tolist(),
+    )
+    assert builder._get_partition_key_filters() == [[[[7]], [[7]]]]
+    builder._get_first_keys.assert_called_once()
+    builder._get_sampled_first_keys.assert_not_called()
+    assert any("does not support random sort" in _ for _ in caplog.messages)
+
+
+def test_get_sampled_first_keys_few_keys(module_under_test):
+    """Generate fewer partitions than requested when the sample has fewer keys"""
+    config_manager = _generate_config_manager("test_table")
+    parser = cli_tools.configure_arg_parser()
+    mock_args = parser.parse_args(TABLE_PART_ARGS + ["--partition-sample-size", "50"])
+    builder = module_under_test.PartitionBuilder([config_manager], mock_args)
+
+    df = pandas.DataFrame({"id": ["c", "a", "b", "a"]})
+    client = ibis.pandas.connect({"keys": df})
+
+    first_keys = builder._get_sampled_first_keys(client, client.table("keys"), ["id"])
+
+    assert first_keys[:, 0].tolist() == ["a", "b", "c"]
+
+
+def test_get_partition_key_filters_single_key(module_under_test, monkeypatch, tmp_path):
+    """A table with a single distinct key gets a single partition holding every row"""
+    monkeypatch.chdir(tmp_path)
+    data = [{"id": 7, "int_value": 1, "text_value": "a"}]
+    _create_table_file(SOURCE_TABLE_FILE_PATH, json.dumps(data))
+    _create_table_file(TARGET_TABLE_FILE_PATH, json.dumps(data + data))
+    config_manager = _generate_config_manager("my_table")
+    parser = cli_tools.configure_arg_parser()
+    mock_args = parser.parse_args(TABLE_PART_ARGS + ["--partition-sample-size", "50"])
+    builder = module_under_test.PartitionBuilder([config_manager], mock_args)
+
+    # The pandas backend has no random sort, the sample is the first keys instead.
+    monkeypatch.setattr(module_under_test, "RANDOM_SORT_SUPPORTS", ["pandas"])
+    monkeypatch.setattr(
+        module_under_test.RandomRowBuilder,
+        "maybe_add_random_sort",
+        lambda self, client, table: table[self.primary_keys].limit(self.batch_size),
+    )
+    # The pandas backend can not compile SQL, the filters are applied instead.
+    monkeypatch.setattr(
+        builder,
+        "_extract_where",
+        lambda table_expr, client: table_expr.execute()["id"].tolist(),
+    )
+    assert builder._get_partition_key_filters() == [[[[7]], [[7, 7]]]]
@@ -0,0 +1,94 @@
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import decimal
+import os
+
+import ibis
+import pandas
+
+from data_validation import spill
+
+
+def _frame(ids, value="a"):
+    return pandas.DataFrame({"id": ids, "value": [value] * len(ids)})
+
+
+def test_partition_ids_match_equal_keys_of_different_types():
+    ids = [1, 2, 3, None]
+    int_ids = spill.partition_ids(pandas.DataFrame({"id": ids}), ["id"], 64)
+    decimal_ids = spill.partition_ids(
+        pandas.DataFrame(
+            {"id": [decimal.Decimal(1), decimal.Decimal("2.0"), 3.0, None]}
+        ),
+        ["id"],
+        64,
+    )
+    assert list(int_ids) == list(decimal_ids)
+    assert list(spill.partition_ids(pandas.DataFrame({"id": ids}), ["id"], 64, 1)) != (
+        list(int_ids)
+    )
+
+
+def test_spilled_results_group_partitions_within_budget(tmp_path):
+    source_df = _frame(list(range(1000)))
+    target_df = _frame(list(range(500, 1500)), value="b")
+    budget = int(source_df.memory_usage(deep=True).sum()) // 2
+
+    with spill.SpilledResults(["id"], budget, directory=str(tmp_path)) as spilled:
+        for start in range(0, 1000, 100):
+            spilled.add(spill.SOURCE, source_df.iloc[start : start + 100])
+            spilled.add(spill.TARGET, target_df.iloc[start : start + 100])
+        groups = list(spilled.partitions())
+
+    assert len(groups) > 2
+    for group_source_df, group_target_df in groups:
+        # Each key is in the same group on both sides.
+        assert list(group_source_df.columns) == ["id", "value"]
+        common = set(group_source_df["id"]) & set(target_df["id"])
+        assert common <= set(group_target_df["id"])
+    assert sorted(pandas.concat(g[0] for g in groups)["id"]) == list(range(1000))
+    assert sorted(pandas.concat(g[1] for g in groups)["id"]) == list(range(500, 1500))
+
+
+def test_spilled_results_split_oversized_partitions(tmp_path, monkeypatch):
+    monkeypatch.setattr(spill, "PARTITIONS", 2)
+    source_df = _frame(list(range(400)))
+    budget = int(source_df.memory_usage(deep=True).sum()) // 8
+
+    with spill.SpilledResults(["id"], budget, directory=str(tmp_path)) as spilled:
+        spilled.add(spill.SOURCE, source_df)
+        spilled.add(spill.TARGET, source_df.iloc[:0])
+        groups = list(spilled.partitions())
+        assert any(name.startswith("split-") for name in os.listdir(tmp_path))
+
+    # Two partitions split twice more give up to eight groups.
+    assert 4 < len(groups) <= 8
+    assert sorted(pandas.concat(g[0] for g in groups)["id"]) == list(range(400))
+    assert all(g[1].empty and "id" in g[1] for g in groups)
+
+
+def test_spilled_results_without_rows_yield_empty_frames():
+    with spill.SpilledResults(["id"], 1024) as spilled:
+        spilled.add(spill.SOURCE, _frame([]))
+        spilled.add(spill.TARGET, _frame([]))
+        ((source_df, target_df),) = list(spilled.partitions())
+    assert source_df.empty and list(target_df.columns) == ["id", "value"]
+
+
+def test_iter_query_batches():
+    client = ibis.pandas.connect({"t": _frame(list(range(25)))})
+    batches = list(spill.iter_query_batches(client, client.table("t"), batch_rows=10))
+    assert [len(df) for df in batches] == [10, 10, 5]
+    assert list(pandas.concat(batches)["id"]) == list(range(25))
@@ -49,3 +49,49 @@ def test_create_unknown_filepath(capsys, fs):
     file_path = manager._get_connection_path(TEST_CONN_NAME)
     expected_file_path = files_directory + f"{TEST_CONN_NAME}.connection.json"
     assert file_path == expected_file_path
+
+
+def test_create_and_get_watermark(capsys, fs):
+    manager = state_manager.StateManager()
+    assert manager.get_watermark("my_table") is None
+
+    manager.create_watermark("my_table", {"column": "id", "value": 100})
+
+    assert manager.get_watermark("my_table") == {"column": "id", "value": 100}
+    assert manager.get_watermark("other_table") is None
+
+
+def test_create_and_get_run_manifest(capsys, fs):
+    manager = state_manager.StateManager()
+    assert manager.get_run_manifest("my_dir") is None
+
+    manager.create_run_manifest_entry("my_dir", "0000.yaml", {"status": "success"})
+    manager.create_run_manifest_entry("my_dir", "0001.yaml", {"status": "failed"})
+
+    assert manager.get_run_manifest("my_dir") == {
+        "0000.yaml": {"status": "success"},
+        "0001.yaml": {"status": "failed"},
+    }
+    assert manager.get_run_manifest("other_dir") is None
+
+
+def test_create_and_get_latest_run(capsys, fs):
+    manager = state_manager.StateManager()
+    assert manager.get_latest_run("my_dir") is None
+
+    manager.create_latest_run("my_dir", {"run_id": "run_1"})
+    manager.create_latest_run("my_dir", {"run_id": "run_2"})
+
+    assert manager.get_latest_run("my_dir") == {"run_id": "run_2"}
+    assert manager.get_latest_run("other_dir") is None
+
+
+def test_create_and_get_metadata_cache_entry(capsys, fs):
+    manager = state_manager.StateManager()
+    assert manager.get_metadata_cache_entry("abc") is None
+
+    entry = {"cached_at": 1.5, "value": [["id", "int64"]]}
+    manager.create_metadata_cache_entry("abc", entry)
+
+    assert manager.get_metadata_cache_entry("abc") == entry
+    assert manager.get_metadata_cache_entry("def") is None
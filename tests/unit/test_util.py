@@ -60,3 +60,13 @@ def test_timed_call_fn_cwargs(module_under_test, caplog):
 
     assert fn_cwargs(3) == module_under_test.timed_call("cwargs fn", fn_cwargs, c1=3)
     assert any(_ for _ in caplog.messages if "cwargs fn" in _)
+
+
+def test_get_import_times(module_under_test):
+    import_times = module_under_test.get_import_times("json")
+    names = [name for name, _, _ in import_times]
+    assert names[0] == "json"
+    assert "json.decoder" in names
+    cumulative = [t for _, _, t in import_times]
+    assert cumulative == sorted(cumulative, reverse=True)
+    assert all(self_time <= t for _, self_time, t in import_times)
@@ -13,12 +13,20 @@
 # limitations under the License.
 
 from copy import deepcopy
+import decimal
+import hashlib
 
+import ibis
 import pandas
 import pytest
 
 from data_validation import consts
 from data_validation.config_manager import ConfigManager
+from data_validation.query_builder.query_builder import (
+    ComparisonField,
+    FilterField,
+    QueryBuilder,
+)
 
 
 COLUMN_VALIDATION_CONFIG = {
@@ -285,6 +293,144 @@ def test_validation_add_filter(module_under_test, filter_field: dict):
     builder.add_filter(filter_field)
 
 
+def test_validation_add_grouped_values_filter(module_under_test):
+    mock_config_manager = ConfigManager(
+        dict(COLUMN_VALIDATION_CONFIG, **{consts.CONFIG_GROUPED_COLUMNS: []}),
+        MockIbisClient(),
+        MockIbisClient(),
+        verbose=False,
+    )
+    builder = module_under_test.ValidationBuilder(mock_config_manager)
+    for column in ["a", "b"]:
+        builder.add_query_group(
+            {
+                consts.CONFIG_FIELD_ALIAS: column,
+                consts.CONFIG_SOURCE_COLUMN: column,
+                consts.CONFIG_TARGET_COLUMN: column,
+                consts.CONFIG_CAST: None,
+            }
+        )
+
+    builder.add_grouped_values_filter(
+        [{"a": "x", "b": "1"}, {"a": "x", "b": "3"}, {"a": "y", "b": "2"}]
+    )
+
+    df = pandas.DataFrame({"a": list("xxxyyy"), "b": list("123123")})
+    table = ibis.pandas.connect({"t": df}).table("t")
+    for filter_field in [
+        builder.source_builder.filters[-1],
+        builder.target_builder.filters[-1],
+    ]:
+        result = table.filter(filter_field.compile(table)).execute()
+        assert list(zip(result["a"], result["b"])) == [
+            ("x", "1"),
+            ("x", "3"),
+            ("y", "2"),
+        ]
+
+
+def test_validation_add_shard_filter(module_under_test):
+    mock_config_manager = ConfigManager(
+        dict(
+            COLUMN_VALIDATION_CONFIG,
+            **{
+                consts.CONFIG_TYPE: consts.ROW_VALIDATION,
+                consts.CONFIG_GROUPED_COLUMNS: [],
+                consts.CONFIG_FILTERS: [],
+                consts.CONFIG_PRIMARY_KEYS: [
+                    {
+                        consts.CONFIG_FIELD_ALIAS: "id",
+                        consts.CONFIG_SOURCE_COLUMN: "id",
+                        consts.CONFIG_TARGET_COLUMN: "target_id",
+                        consts.CONFIG_CAST: None,
+                    }
+                ],
+                consts.CONFIG_COMPARISON_FIELDS: [],
+                consts.CONFIG_SHARD: "1/4",
+            },
+        ),
+        MockIbisClient(),
+        MockIbisClient(),
+        verbose=False,
+    )
+    builder = module_under_test.ValidationBuilder(mock_config_manager)
+
+    df = pandas.DataFrame({"id": range(100), "target_id": range(100)})
+    table = ibis.pandas.connect({"t": df}).table("t")
+    source_rows = table.filter(builder.source_builder.filters[-1].compile(table))
+    target_rows = table.filter(builder.target_builder.filters[-1].compile(table))
+
+    expected = [
+        i
+        for i in range(100)
+        if int(hashlib.sha256(str(i).encode()).hexdigest()[:7], 16) % 4 == 1
+    ]
+    assert list(source_rows.execute()["id"]) == expected
+    assert list(target_rows.execute()["target_id"]) == expected
+
+
+def _get_shard_config_manager(validation_type):
+    return ConfigManager(
+        dict(
+            COLUMN_VALIDATION_CONFIG,
+            **{
+                consts.CONFIG_TYPE: validation_type,
+                consts.CONFIG_GROUPED_COLUMNS: [],
+                consts.CONFIG_FILTERS: [],
+                consts.CONFIG_PRIMARY_KEYS: [
+                    {
+                        consts.CONFIG_FIELD_ALIAS: "id",
+                        consts.CONFIG_SOURCE_COLUMN: "id",
+                        consts.CONFIG_TARGET_COLUMN: "id",
+                        consts.CONFIG_CAST: None,
+                    }
+                ],
+                consts.CONFIG_COMPARISON_FIELDS: [],
+                consts.CONFIG_SHARD: "1/4",
+            },
+        ),
+        MockIbisClient(),
+        MockIbisClient(),
+        verbose=False,
+    )
+
+
+def test_validation_add_shard_filter_hashes_once():
+    """The dry run SQL of a sharded query computes the key hash once per row."""
+    builder = QueryBuilder.build_count_validator()
+    builder.add_filter_field(FilterField.shard([ComparisonField("id")], 1, 4))
+    builder.add_comparison_field(ComparisonField("id"))
+    table = ibis.table([("id", "int64"), ("value", "string")], name="t")
+    query = builder.compile(consts.ROW_VALIDATION, table)
+    sql = str(ibis.to_sql(query, dialect="postgres"))
+    assert sql.count("SHA256(") == 1
+
+
+def test_validation_add_shard_filter_column_validation(module_under_test):
+    with pytest.raises(ValueError, match="only supported by row validations"):
+        module_under_test.ValidationBuilder(
+            _get_shard_config_manager(consts.COLUMN_VALIDATION)
+        )
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        pandas.to_datetime(["2024-01-01", "2024-01-02"]),
+        [1.5, 2.5],
+        [decimal.Decimal("1.5"), decimal.Decimal("2.5")],
+    ],
+)
+def test_validation_add_shard_filter_key_types(module_under_test, values):
+    """Keys cast to strings differently by each engine can not be sharded."""
+    builder = module_under_test.ValidationBuilder(
+        _get_shard_config_manager(consts.ROW_VALIDATION)
+    )
+    table = ibis.pandas.connect({"t": pandas.DataFrame({"id": values})}).table("t")
+    with pytest.raises(ValueError, match="integer or string primary keys"):
+        builder.source_builder.filters[-1].compile(table)
+
+
 @pytest.mark.parametrize(
     "input_list,max_length,expected_result",
     [
@@ -0,0 +1,152 @@
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import threading
+
+import pytest
+
+CONFIG_FILES = [f"{i:04d}.yaml" for i in range(6)]
+
+
+@pytest.fixture
+def module_under_test():
+    from data_validation import work_queue
+
+    return work_queue
+
+
+def test_claim_is_exclusive(module_under_test, tmp_path):
+    first = module_under_test.WorkQueue(str(tmp_path), "run1", 60)
+    second = module_under_test.WorkQueue(str(tmp_path), "run1", 60)
+    other_run = module_under_test.WorkQueue(str(tmp_path), "run2", 60)
+
+    assert first.claim("0000.yaml")
+    assert not second.claim("0000.yaml")
+    assert other_run.claim("0000.yaml")
+    assert first.renew("0000.yaml")
+    assert not second.renew("0000.yaml")
+
+
+def test_claim_expired_lease(module_under_test, tmp_path):
+    dead = module_under_test.WorkQueue(str(tmp_path), "run", 60)
+    alive = module_under_test.WorkQueue(str(tmp_path), "run", 60)
+    assert dead.claim("0000.yaml")
+
+    lease_path = dead._lease_path("0000.yaml")
+    with open(lease_path, "w") as f:
+        f.write(json.dumps({"worker": dead.worker_id, "expires": 0}))
+
+    assert alive.claim("0000.yaml")
+    # The dead worker lost its lease, so can not renew it anymore.
+    assert not dead.renew("0000.yaml")
+    assert alive.renew("0000.yaml")
+
+
+def test_completed_file_is_not_claimed(module_under_test, tmp_path):
+    first = module_under_test.WorkQueue(str(tmp_path), "run", 60)
+    second = module_under_test.WorkQueue(str(tmp_path), "run", 60)
+    assert first.claim("0000.yaml")
+    first.complete("0000.yaml")
+
+    assert not second.claim("0000.yaml")
+
+
+def test_workers_run_each_file_once(module_under_test, tmp_path):
+    runs = []
+    lock = threading.Lock()
+
+    def run_file(file_name):
+        with lock:
+            runs.append(file_name)
+        if file_name == "0003.yaml":
+            raise ValueError("Failed validation")
+
+    results = []
+
+    def worker():
+        queue = module_under_test.WorkQueue(str(tmp_path), "run", 60, 0.01)
+        results.append(queue.run(CONFIG_FILES, run_file))
+
+    workers = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    assert sorted(runs) == CONFIG_FILES
+    # Only the worker which ran the failing file reports errors.
+    assert sorted(results) == [False, False, True]
+
+
+def test_worker_waits_for_leased_files(module_under_test, tmp_path):
+    other = module_under_test.WorkQueue(str(tmp_path), "run", 60)
+    assert other.claim("0000.yaml")
+    queue = module_under_test.WorkQueue(str(tmp_path), "run", 60, 0.01)
+
+    runs = []
+    timer = threading.Timer(0.2, other.complete, args=["0000.yaml"])
+    timer.start()
+    assert not queue.run(["0000.yaml", "0001.yaml"], runs.append)
+    timer.join()
+
+    assert runs == ["0001.yaml"]
+
+
+@pytest.mark.parametrize("lease", ["", "{", json.dumps({"worker": "other"})])
+def test_unreadable_lease_is_held(module_under_test, tmp_path, lease):
+    queue = module_under_test.WorkQueue(str(tmp_path), "run", 60)
+    lease_path = queue._lease_path("0000.yaml")
+    tmp_path.joinpath(".leases", "run").mkdir(parents=True)
+    with open(lease_path, "w") as f:
+        f.write(lease)
+
+    assert not queue.claim("0000.yaml")
+    assert not queue.renew("0000.yaml")
+
+
+def test_expired_lease_is_claimed_by_one_worker(module_under_test, tmp_path):
+    dead = module_under_test.WorkQueue(str(tmp_path), "run", 60)
+    assert dead.claim("0000.yaml")
+    with open(dead._lease_path("0000.yaml"), "w") as f:
+        f.write(json.dumps({"worker": dead.worker_id, "expires": 0}))
+
+    claims = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        queue = module_under_test.WorkQueue(str(tmp_path), "run", 60)
+        barrier.wait()
+        claims.append(queue.claim("0000.yaml"))
+
+    workers = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    assert sorted(claims) == [False] * 7 + [True]
+
+
+def test_complete_keeps_lease_of_other_worker(module_under_test, tmp_path):
+    dead = module_under_test.WorkQueue(str(tmp_path), "run", 60)
+    alive = module_under_test.WorkQueue(str(tmp_path), "run", 60)
+    assert dead.claim("0000.yaml")
+    with open(dead._lease_path("0000.yaml"), "w") as f:
+        f.write(json.dumps({"worker": dead.worker_id, "expires": 0}))
+    assert alive.claim("0000.yaml")
+
+    dead.complete("0000.yaml")
+
+    assert alive.renew("0000.yaml")
@@ -23,8 +23,11 @@ Ibis as an override, though it would not apply for Pandas and other
 non-textual languages.
 """
 import datetime
+import hashlib
+import importlib.abc
+import importlib.util
+import sys
 
-import google.cloud.bigquery as bq
 import ibis
 import ibis.expr.datatypes as dt
 import ibis.expr.operations as ops
@@ -39,21 +42,8 @@ from ibis.backends.base.sql.registry import (
     fixed_arity,
     type_to_sql_string as base_type_to_sql_string,
 )
-from ibis.backends.bigquery.client import (
-    _DTYPE_TO_IBIS_TYPE as _BQ_DTYPE_TO_IBIS_TYPE,
-    _LEGACY_TO_STANDARD as _BQ_LEGACY_TO_STANDARD,
-)
-from ibis.backends.bigquery.compiler import BigQueryExprTranslator
-from ibis.backends.bigquery.registry import (
-    STRFTIME_FORMAT_FUNCTIONS as BQ_STRFTIME_FORMAT_FUNCTIONS,
-    bigquery_cast,
-)
-from ibis.backends.impala.compiler import ImpalaExprTranslator
-from ibis.backends.mssql.compiler import MsSqlExprTranslator
-from ibis.backends.mysql.compiler import MySQLExprTranslator
 from ibis.backends.pandas.dispatch import execute_node
 from ibis.backends.pandas.execution.temporal import execute_epoch_seconds
-from ibis.backends.postgres.compiler import PostgreSQLExprTranslator
 from ibis.expr.operations import (
     Cast,
     Comparison,
@@ -68,38 +58,58 @@ from ibis.expr.operations import (
 )
 from ibis.expr.types import BinaryValue, NumericValue, TemporalValue
 
-# Do not remove these lines, they trigger patching of Ibis code.
-import third_party.ibis.ibis_biquery.api  # noqa
-import third_party.ibis.ibis_mysql.compiler  # noqa
-from third_party.ibis.ibis_mssql.registry import mssql_table_column
-import third_party.ibis.ibis_postgres.client  # noqa
+# Registrations waiting for the module they patch to be imported:
+# {module name: [registration]}
+_PENDING_REGISTRATIONS = {}
 
-from third_party.ibis.ibis_cloud_spanner.compiler import SpannerExprTranslator
-from third_party.ibis.ibis_redshift.compiler import RedShiftExprTranslator
 
-# DB2 requires ibm_db_dbi
-try:
-    from third_party.ibis.ibis_db2.compiler import Db2ExprTranslator
-except Exception:
-    Db2ExprTranslator = None
+class _RegistrationFinder(importlib.abc.MetaPathFinder):
+    """Run the pending registrations of a module once it has been imported.
 
-# Oracle requires cx_Oracle
-try:
-    from third_party.ibis.ibis_oracle.compiler import OracleExprTranslator
-except Exception:
-    OracleExprTranslator = None
+    Each backend is patched when its module is first imported, by DVT or any
+    other caller, so importing this module does not import every backend.
+    """
 
-# TD requires teradatasql
-try:
-    from third_party.ibis.ibis_teradata.compiler import TeradataExprTranslator
-except Exception:
-    TeradataExprTranslator = None
+    def __init__(self):
+        self._finding = set()
 
-# Snowflake requires snowflake-connector-python and snowflake-sqlalchemy
-try:
-    from ibis.backends.snowflake import SnowflakeExprTranslator
-except Exception:
-    SnowflakeExprTranslator = None
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in _PENDING_REGISTRATIONS or fullname in self._finding:
+            return None
+        # Let the other finders locate the module.
+        self._finding.add(fullname)
+        try:
+            spec = importlib.util.find_spec(fullname)
+        finally:
+            self._finding.discard(fullname)
+        if spec is None or spec.loader is None:
+            return spec
+
+        exec_module = spec.loader.exec_module
+
+        def exec_and_register(module):
+            exec_module(module)
+            for register in _PENDING_REGISTRATIONS.pop(fullname, []):
+                register()
+
+        spec.loader.exec_module = exec_and_register
+        return spec
+
+
+sys.meta_path.insert(0, _RegistrationFinder())
+
+
+def _register_when_imported(module_name):
+    """Run the decorated function once module_name has been imported."""
+
+    def decorator(register):
+        if module_name in sys.modules:
+            register()
+        else:
+            _PENDING_REGISTRATIONS.setdefault(module_name, []).append(register)
+        return register
+
+    return decorator
 
 
 class BinaryLength(Value):
@@ -122,6 +132,18 @@ class ToChar(Value):
     output_type = rlz.shape_like("arg")
 
 
+class HashString(Value):
+    """The result of a DVT hash function as a string.
+
+    The DVT HashBytes formatters already return hex digests, so this only
+    changes the Ibis type and leaves the SQL untouched.
+    """
+
+    arg = rlz.one_of([rlz.value(dt.Binary)])
+    output_dtype = dt.string
+    output_shape = rlz.shape_like("arg")
+
+
 class RawSQL(Comparison):
     pass
 
@@ -134,13 +156,19 @@ def compile_to_char(numeric_value, fmt):
     return ToChar(numeric_value, fmt=fmt).to_expr()
 
 
-@bigquery_cast.register(str, dt.Binary, dt.String)
+def compile_hash_string(binary_value):
+    return HashString(binary_value).to_expr()
+
+
+def format_hash_string(translator, op):
+    return translator.translate(op.arg)
+
+
 def bigquery_cast_from_binary_generate(compiled_arg, from_, to):
     """Cast of binary to string should be hex conversion."""
     return f"TO_HEX({compiled_arg})"
 
 
-@bigquery_cast.register(str, dt.String, dt.Binary)
 def bigquery_cast_to_binary_generate(compiled_arg, from_, to):
     """Cast of binary to string should be hex conversion."""
     return f"FROM_HEX({compiled_arg})"
@@ -178,6 +206,10 @@ def format_hashbytes_teradata(translator, op):
 
 def strftime_bigquery(translator, op):
     """Timestamp formatting."""
+    from ibis.backends.bigquery.registry import (
+        STRFTIME_FORMAT_FUNCTIONS as BQ_STRFTIME_FORMAT_FUNCTIONS,
+    )
+
     arg = op.arg
     format_str = op.format_str
     arg_type = arg.output_dtype
@@ -544,15 +576,16 @@ def sa_format_random(t, op):
     return sa.func.RANDOM()
 
 
-_BQ_DTYPE_TO_IBIS_TYPE["TIMESTAMP"] = dt.Timestamp(timezone="UTC")
-
-
-@dt.dtype.register(bq.schema.SchemaField)
 def _bigquery_field_to_ibis_dtype(field):
     """Convert BigQuery `field` to an ibis type.
     Taken from ibis.backends.bigquery.client.py for issue:
         https://github.com/GoogleCloudPlatform/professional-services-data-validator/issues/926
     """
+    from ibis.backends.bigquery.client import (
+        _DTYPE_TO_IBIS_TYPE as _BQ_DTYPE_TO_IBIS_TYPE,
+        _LEGACY_TO_STANDARD as _BQ_LEGACY_TO_STANDARD,
+    )
+
     typ = field.field_type
     if typ == "RECORD":
         fields = field.fields
@@ -620,78 +653,190 @@ def execute_epoch_seconds_new(op, data, **kwargs):
 
 execute_epoch_seconds = execute_epoch_seconds_new
 
+
+@execute_node.register(HashBytes, pd.Series)
+def execute_hashbytes(op, data, **kwargs):
+    """Hash strings to a lower case hex digest, matching the SQL engine formatters."""
+    return data.map(
+        lambda value: None
+        if value is None
+        else hashlib.new(op.how, value.encode("utf-8")).hexdigest()
+    )
+
+
+@execute_node.register(HashString, pd.Series)
+def execute_hash_string(op, data, **kwargs):
+    return data
+
+
 BinaryValue.byte_length = compile_binary_length
+BinaryValue.hash_string = compile_hash_string
 
 NumericValue.to_char = compile_to_char
 TemporalValue.to_char = compile_to_char
 
-BigQueryExprTranslator._registry[HashBytes] = format_hashbytes_bigquery
-BigQueryExprTranslator._registry[RawSQL] = format_raw_sql
-BigQueryExprTranslator._registry[Strftime] = strftime_bigquery
-BigQueryExprTranslator._registry[BinaryLength] = sa_format_binary_length
 
-AlchemyExprTranslator._registry[RawSQL] = format_raw_sql
-AlchemyExprTranslator._registry[HashBytes] = format_hashbytes_alchemy
-ExprTranslator._registry[RawSQL] = format_raw_sql
-ExprTranslator._registry[HashBytes] = format_hashbytes_base
+@_register_when_imported("ibis.backends.base.sql.compiler")
+def _register_base():
+    ExprTranslator._registry[RawSQL] = format_raw_sql
+    ExprTranslator._registry[HashBytes] = format_hashbytes_base
+    ExprTranslator._registry[HashString] = format_hash_string
 
-ImpalaExprTranslator._registry[Cast] = sa_cast_hive
-ImpalaExprTranslator._registry[RawSQL] = format_raw_sql
-ImpalaExprTranslator._registry[HashBytes] = format_hashbytes_hive
-ImpalaExprTranslator._registry[RandomScalar] = fixed_arity("RAND", 0)
-ImpalaExprTranslator._registry[Strftime] = strftime_impala
-ImpalaExprTranslator._registry[BinaryLength] = sa_format_binary_length
 
-if OracleExprTranslator:
+@_register_when_imported("ibis.backends.base.sql.alchemy")
+def _register_alchemy():
+    AlchemyExprTranslator._registry[RawSQL] = format_raw_sql
+    AlchemyExprTranslator._registry[HashBytes] = format_hashbytes_alchemy
+    AlchemyExprTranslator._registry[HashString] = format_hash_string
+
+
+@_register_when_imported("ibis.backends.bigquery")
+def _register_bigquery():
+    import google.cloud.bigquery as bq
+    from ibis.backends.bigquery.client import (
+        _DTYPE_TO_IBIS_TYPE as _BQ_DTYPE_TO_IBIS_TYPE,
+    )
+    from ibis.backends.bigquery.compiler import BigQueryExprTranslator
+    from ibis.backends.bigquery.registry import bigquery_cast
+
+    import third_party.ibis.ibis_biquery.api  # noqa
+
+    bigquery_cast.register(str, dt.Binary, dt.String)(
+        bigquery_cast_from_binary_generate
+    )
+    bigquery_cast.register(str, dt.String, dt.Binary)(bigquery_cast_to_binary_generate)
+    _BQ_DTYPE_TO_IBIS_TYPE["TIMESTAMP"] = dt.Timestamp(timezone="UTC")
+    dt.dtype.register(bq.schema.SchemaField)(_bigquery_field_to_ibis_dtype)
+
+    BigQueryExprTranslator._registry[HashBytes] = format_hashbytes_bigquery
+    BigQueryExprTranslator._registry[HashString] = format_hash_string
+    BigQueryExprTranslator._registry[RawSQL] = format_raw_sql
+    BigQueryExprTranslator._registry[Strftime] = strftime_bigquery
+    BigQueryExprTranslator._registry[BinaryLength] = sa_format_binary_length
+
+
+@_register_when_imported("ibis.backends.impala")
+def _register_impala():
+    from ibis.backends.impala.compiler import ImpalaExprTranslator
+
+    ImpalaExprTranslator._registry[Cast] = sa_cast_hive
+    ImpalaExprTranslator._registry[RawSQL] = format_raw_sql
+    ImpalaExprTranslator._registry[HashBytes] = format_hashbytes_hive
+    ImpalaExprTranslator._registry[HashString] = format_hash_string
+    ImpalaExprTranslator._registry[RandomScalar] = fixed_arity("RAND", 0)
+    ImpalaExprTranslator._registry[Strftime] = strftime_impala
+    ImpalaExprTranslator._registry[BinaryLength] = sa_format_binary_length
+
+
+# Oracle requires cx_Oracle
+@_register_when_imported("third_party.ibis.ibis_oracle.compiler")
+def _register_oracle():
+    from third_party.ibis.ibis_oracle.compiler import OracleExprTranslator
+
     OracleExprTranslator._registry[RawSQL] = sa_format_raw_sql
     OracleExprTranslator._registry[HashBytes] = sa_format_hashbytes_oracle
+    OracleExprTranslator._registry[HashString] = format_hash_string
     OracleExprTranslator._registry[ToChar] = sa_format_to_char
     OracleExprTranslator._registry[BinaryLength] = sa_format_binary_length_oracle
 
-PostgreSQLExprTranslator._registry[HashBytes] = sa_format_hashbytes_postgres
-PostgreSQLExprTranslator._registry[RawSQL] = sa_format_raw_sql
-PostgreSQLExprTranslator._registry[ToChar] = sa_format_to_char
-PostgreSQLExprTranslator._registry[Cast] = sa_cast_postgres
-PostgreSQLExprTranslator._registry[BinaryLength] = sa_format_binary_length
-
-MsSqlExprTranslator._registry[HashBytes] = sa_format_hashbytes_mssql
-MsSqlExprTranslator._registry[RawSQL] = sa_format_raw_sql
-MsSqlExprTranslator._registry[IfNull] = sa_fixed_arity(sa.func.isnull, 2)
-MsSqlExprTranslator._registry[StringJoin] = _sa_string_join
-MsSqlExprTranslator._registry[RandomScalar] = sa_format_new_id
-MsSqlExprTranslator._registry[Strftime] = strftime_mssql
-MsSqlExprTranslator._registry[Cast] = sa_cast_mssql
-MsSqlExprTranslator._registry[BinaryLength] = sa_format_binary_length_mssql
-MsSqlExprTranslator._registry[TableColumn] = mssql_table_column
-
-MySQLExprTranslator._registry[Cast] = sa_cast_mysql
-MySQLExprTranslator._registry[RawSQL] = sa_format_raw_sql
-MySQLExprTranslator._registry[HashBytes] = sa_format_hashbytes_mysql
-MySQLExprTranslator._registry[Strftime] = strftime_mysql
-MySQLExprTranslator._registry[BinaryLength] = sa_format_binary_length
-
-RedShiftExprTranslator._registry[HashBytes] = sa_format_hashbytes_redshift
-RedShiftExprTranslator._registry[RawSQL] = sa_format_raw_sql
-RedShiftExprTranslator._registry[BinaryLength] = sa_format_binary_length
-
-if Db2ExprTranslator:
+
+@_register_when_imported("ibis.backends.postgres")
+def _register_postgres():
+    from ibis.backends.postgres.compiler import PostgreSQLExprTranslator
+
+    import third_party.ibis.ibis_postgres.client  # noqa
+
+    PostgreSQLExprTranslator._registry[HashBytes] = sa_format_hashbytes_postgres
+    PostgreSQLExprTranslator._registry[HashString] = format_hash_string
+    PostgreSQLExprTranslator._registry[RawSQL] = sa_format_raw_sql
+    PostgreSQLExprTranslator._registry[ToChar] = sa_format_to_char
+    PostgreSQLExprTranslator._registry[Cast] = sa_cast_postgres
+    PostgreSQLExprTranslator._registry[BinaryLength] = sa_format_binary_length
+
+
+@_register_when_imported("ibis.backends.mssql")
+def _register_mssql():
+    from ibis.backends.mssql.compiler import MsSqlExprTranslator
+
+    from third_party.ibis.ibis_mssql.registry import mssql_table_column
+
+    MsSqlExprTranslator._registry[HashBytes] = sa_format_hashbytes_mssql
+    MsSqlExprTranslator._registry[HashString] = format_hash_string
+    MsSqlExprTranslator._registry[RawSQL] = sa_format_raw_sql
+    MsSqlExprTranslator._registry[IfNull] = sa_fixed_arity(sa.func.isnull, 2)
+    MsSqlExprTranslator._registry[StringJoin] = _sa_string_join
+    MsSqlExprTranslator._registry[RandomScalar] = sa_format_new_id
+    MsSqlExprTranslator._registry[Strftime] = strftime_mssql
+    MsSqlExprTranslator._registry[Cast] = sa_cast_mssql
+    MsSqlExprTranslator._registry[BinaryLength] = sa_format_binary_length_mssql
+    MsSqlExprTranslator._registry[TableColumn] = mssql_table_column
+
+
+@_register_when_imported("ibis.backends.mysql")
+def _register_mysql():
+    from ibis.backends.mysql.compiler import MySQLExprTranslator
+
+    import third_party.ibis.ibis_mysql.compiler  # noqa
+
+    MySQLExprTranslator._registry[Cast] = sa_cast_mysql
+    MySQLExprTranslator._registry[RawSQL] = sa_format_raw_sql
+    MySQLExprTranslator._registry[HashBytes] = sa_format_hashbytes_mysql
+    MySQLExprTranslator._registry[HashString] = format_hash_string
+    MySQLExprTranslator._registry[Strftime] = strftime_mysql
+    MySQLExprTranslator._registry[BinaryLength] = sa_format_binary_length
+
+
+@_register_when_imported("third_party.ibis.ibis_redshift.compiler")
+def _register_redshift():
+    from third_party.ibis.ibis_redshift.compiler import RedShiftExprTranslator
+
+    RedShiftExprTranslator._registry[HashBytes] = sa_format_hashbytes_redshift
+    RedShiftExprTranslator._registry[HashString] = format_hash_string
+    RedShiftExprTranslator._registry[RawSQL] = sa_format_raw_sql
+    RedShiftExprTranslator._registry[BinaryLength] = sa_format_binary_length
+
+
+# DB2 requires ibm_db_dbi
+@_register_when_imported("third_party.ibis.ibis_db2.compiler")
+def _register_db2():
+    from third_party.ibis.ibis_db2.compiler import Db2ExprTranslator
+
     Db2ExprTranslator._registry[HashBytes] = sa_format_hashbytes_db2
+    Db2ExprTranslator._registry[HashString] = format_hash_string
     Db2ExprTranslator._registry[RawSQL] = sa_format_raw_sql
     Db2ExprTranslator._registry[BinaryLength] = sa_format_binary_length
     Db2ExprTranslator._registry[Strftime] = strftime_db2
 
-SpannerExprTranslator._registry[RawSQL] = format_raw_sql
-SpannerExprTranslator._registry[HashBytes] = format_hashbytes_bigquery
-SpannerExprTranslator._registry[BinaryLength] = sa_format_binary_length
 
-if TeradataExprTranslator:
+@_register_when_imported("third_party.ibis.ibis_cloud_spanner.compiler")
+def _register_spanner():
+    from third_party.ibis.ibis_cloud_spanner.compiler import SpannerExprTranslator
+
+    SpannerExprTranslator._registry[RawSQL] = format_raw_sql
+    SpannerExprTranslator._registry[HashBytes] = format_hashbytes_bigquery
+    SpannerExprTranslator._registry[HashString] = format_hash_string
+    SpannerExprTranslator._registry[BinaryLength] = sa_format_binary_length
+
+
+# TD requires teradatasql
+@_register_when_imported("third_party.ibis.ibis_teradata.compiler")
+def _register_teradata():
+    from third_party.ibis.ibis_teradata.compiler import TeradataExprTranslator
+
     TeradataExprTranslator._registry[RawSQL] = format_raw_sql
     TeradataExprTranslator._registry[HashBytes] = format_hashbytes_teradata
+    TeradataExprTranslator._registry[HashString] = format_hash_string
     TeradataExprTranslator._registry[BinaryLength] = sa_format_binary_length
 
-if SnowflakeExprTranslator:
+
+# Snowflake requires snowflake-connector-python and snowflake-sqlalchemy
+@_register_when_imported("ibis.backends.snowflake")
+def _register_snowflake():
+    from ibis.backends.snowflake import SnowflakeExprTranslator
+
     SnowflakeExprTranslator._registry[Cast] = sa_cast_snowflake
     SnowflakeExprTranslator._registry[HashBytes] = sa_format_hashbytes_snowflake
+    SnowflakeExprTranslator._registry[HashString] = format_hash_string
     SnowflakeExprTranslator._registry[RawSQL] = sa_format_raw_sql
     SnowflakeExprTranslator._registry[IfNull] = sa_fixed_arity(sa.func.ifnull, 2)
     SnowflakeExprTranslator._registry[ExtractEpochSeconds] = sa_epoch_time_snowflake
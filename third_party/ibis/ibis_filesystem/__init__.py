@@ -0,0 +1,321 @@
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A pandas backend which reads Arrow datasets lazily.
+
+Tables registered as pyarrow datasets are not read when the client is created.
+Each time an expression is executed only the columns it references are read,
+and filters applied directly to a table are pushed into the dataset scan, where
+Parquet statistics and partitioning prune row groups and files. The pandas
+backend then executes the whole expression, including the filters, on the rows
+that were read.
+
+Custom SQL filters are translated into Ibis predicates, see filters.py, so they
+can be executed by pandas and pushed into the scans. Tables registered as pandas
+DataFrames otherwise behave as with the pandas backend.
+"""
+import logging
+import operator
+
+import ibis
+
+# Registers the conversion of Arrow types to Ibis types with dt.dtype.
+import ibis.backends.pyarrow.datatypes  # noqa: F401
+import ibis.expr.datatypes as dt
+import ibis.expr.operations as ops
+import ibis.expr.schema as sch
+import ibis.expr.types as ir
+import pyarrow
+import pyarrow.dataset
+from ibis.backends.pandas import Backend as PandasBackend
+from ibis.common.graph import Graph
+
+from third_party.ibis.ibis_addon.operations import RawSQL
+from third_party.ibis.ibis_filesystem import filters
+
+_COMPARISONS = {
+    ops.Equals: operator.eq,
+    ops.NotEquals: operator.ne,
+    ops.Greater: operator.gt,
+    ops.GreaterEqual: operator.ge,
+    ops.Less: operator.lt,
+    ops.LessEqual: operator.le,
+}
+
+
+class Backend(PandasBackend):
+    """Pandas backend whose tables are DataFrames or pyarrow datasets."""
+
+    def table(self, name: str, schema: sch.Schema = None):
+        dataset = self.dictionary[name]
+        if not isinstance(dataset, pyarrow.dataset.Dataset):
+            return super().table(name, schema=schema)
+        schema = schema or self.schemas.get(name) or _dataset_schema(dataset)
+        return self.table_class(name, schema, self).to_expr()
+
+    def get_schema(self, table_name, database=None):
+        dataset = self.dictionary[table_name]
+        if not isinstance(dataset, pyarrow.dataset.Dataset):
+            return super().get_schema(table_name, database=database)
+        if table_name not in self.schemas:
+            self.schemas[table_name] = _dataset_schema(dataset)
+        return self.schemas[table_name]
+
+    def execute(self, query, params=None, limit="default", **kwargs):
+        if isinstance(query, ir.Expr):
+            query = _replace_raw_sql(query)
+            scanned = self._scan_datasets(query.op())
+            if scanned:
+                # The dataset tables are replaced by in-memory tables of the rows
+                # read, so the expression is executed as written on those rows.
+                query = (
+                    query.op()
+                    .replace(
+                        {
+                            table: _in_memory_table(table, df)
+                            for table, df in scanned.items()
+                        }
+                    )
+                    .to_expr()
+                )
+        return super().execute(query, params=params, limit=limit, **kwargs)
+
+    def _scan_datasets(self, node: ops.Node) -> dict:
+        """Return the DataFrame read for each dataset table of the expression."""
+        graph = Graph.from_bfs(node)
+        tables = [
+            table
+            for table in graph
+            if isinstance(table, ops.DatabaseTable)
+            and table.source is self
+            and isinstance(self.dictionary.get(table.name), pyarrow.dataset.Dataset)
+        ]
+        if not tables:
+            return {}
+
+        referenced = _referenced_columns(node, graph)
+        scanned = {}
+        for table in tables:
+            dataset = self.dictionary[table.name]
+            columns = [name for name in table.schema.names if name in referenced]
+            arrow_filter = _pushdown_filter(node, graph, table)
+            scanned[table] = _read_dataset(dataset, columns, arrow_filter)
+        return scanned
+
+
+def _in_memory_table(table: ops.DatabaseTable, df) -> ops.InMemoryTable:
+    """Return an in-memory table of the columns of table read into df."""
+    schema = sch.Schema({name: table.schema[name] for name in df.columns})
+    return ibis.memtable(df, schema=schema, name=table.name).op()
+
+
+def _replace_raw_sql(query: ir.Expr) -> ir.Expr:
+    """Return the query with custom SQL filters rebuilt as Ibis predicates."""
+    node = query.op()
+    subs = {}
+    for raw_sql in node.find(RawSQL):
+        (column,) = raw_sql.left.find(ops.TableColumn)
+        subs[raw_sql] = filters.to_ibis_predicate(
+            column.table.to_expr(), raw_sql.right.value
+        ).op()
+    if not subs:
+        return query
+    return node.replace(subs).to_expr()
+
+
+def _dataset_schema(dataset: pyarrow.dataset.Dataset) -> sch.Schema:
+    """Return the Ibis schema of a dataset, without any stored pandas index."""
+    arrow_schema = dataset.schema
+    index_columns = (arrow_schema.pandas_metadata or {}).get("index_columns", [])
+    for name in index_columns:
+        if isinstance(name, str) and name in arrow_schema.names:
+            arrow_schema = arrow_schema.remove(arrow_schema.get_field_index(name))
+    return sch.Schema(
+        {
+            field.name: _to_ibis_type(field.type, field.nullable)
+            for field in arrow_schema
+        }
+    )
+
+
+def _to_ibis_type(arrow_type: pyarrow.DataType, nullable: bool = True) -> dt.DataType:
+    """Return the Ibis type of an Arrow type, including the types Ibis does not map."""
+    if pyarrow.types.is_decimal(arrow_type):
+        return dt.Decimal(arrow_type.precision, arrow_type.scale, nullable=nullable)
+    elif pyarrow.types.is_dictionary(arrow_type):
+        return _to_ibis_type(arrow_type.value_type, nullable)
+    elif pyarrow.types.is_large_string(arrow_type):
+        return dt.String(nullable=nullable)
+    elif pyarrow.types.is_large_binary(arrow_type):
+        return dt.Binary(nullable=nullable)
+    elif pyarrow.types.is_list(arrow_type) or pyarrow.types.is_large_list(arrow_type):
+        return dt.Array(_to_ibis_type(arrow_type.value_type), nullable=nullable)
+    elif pyarrow.types.is_struct(arrow_type):
+        return dt.Struct.from_tuples(
+            [(field.name, _to_ibis_type(field.type)) for field in arrow_type],
+            nullable=nullable,
+        )
+    return dt.dtype(arrow_type, nullable=nullable)
+
+
+def _referenced_columns(node: ops.Node, graph: Graph) -> set:
+    """Return the names of all columns the expression may read.
+
+    Columns are matched by name across tables, which can only read extra columns.
+    Tables used other than through their columns, for example by a SELECT * or
+    DISTINCT, have all of their columns read.
+    """
+    referenced = {n.name for n in graph if isinstance(n, ops.TableColumn)}
+    if isinstance(node, ops.TableNode):
+        referenced.update(node.schema.names)
+    for parent, children in graph.items():
+        for child in children:
+            if isinstance(child, ops.TableNode) and not _uses_columns_only(
+                parent, child
+            ):
+                referenced.update(child.schema.names)
+    return referenced
+
+
+def _uses_columns_only(parent: ops.Node, table: ops.TableNode) -> bool:
+    """Return True if parent only reads the columns of table it references."""
+    if isinstance(parent, (ops.TableColumn, ops.CountStar, ops.SelfReference)):
+        return True
+    if isinstance(parent, (ops.Selection, ops.Aggregation, ops.Limit)):
+        return parent.table == table
+    if isinstance(parent, ops.Join):
+        return table in (parent.left, parent.right)
+    return False
+
+
+def _pushdown_filter(node: ops.Node, graph: Graph, table: ops.DatabaseTable):
+    """Return a pyarrow filter implied by the predicates applied to table.
+
+    Rows can only be filtered when the table is exclusively read through
+    selections or aggregations sharing the same predicates. The filter may keep
+    more rows than the predicates, which are still applied by the pandas backend.
+    """
+    consumers = {
+        parent
+        for parent, children in graph.items()
+        if table in children
+        and not (isinstance(parent, ops.TableColumn) and parent.table == table)
+    }
+    if not consumers or not all(
+        isinstance(consumer, (ops.Selection, ops.Aggregation))
+        and consumer.table == table
+        for consumer in consumers
+    ):
+        return None
+    predicates = {consumer.predicates for consumer in consumers}
+    if len(predicates) != 1:
+        return None
+
+    # The table, or its columns, must not be reachable other than via consumers.
+    seen = set()
+    queue = [node]
+    while queue:
+        current = queue.pop()
+        if current in seen or current in consumers:
+            continue
+        seen.add(current)
+        if current == table or (
+            isinstance(current, ops.TableColumn) and current.table == table
+        ):
+            return None
+        queue.extend(graph[current])
+
+    return _to_arrow_filter(ops.And, predicates.pop(), table)
+
+
+def _to_arrow_filter(op_type, predicates, table):
+    filters = [_predicate_filter(predicate, table) for predicate in predicates]
+    if op_type is ops.And:
+        filters = [f for f in filters if f is not None]
+        combine = operator.and_
+    elif any(f is None for f in filters):
+        # A disjunction can only be pushed down when all of its terms are.
+        return None
+    else:
+        combine = operator.or_
+    if not filters:
+        return None
+    result = filters[0]
+    for arrow_filter in filters[1:]:
+        result = combine(result, arrow_filter)
+    return result
+
+
+def _predicate_filter(predicate: ops.Node, table: ops.DatabaseTable):
+    """Return a pyarrow filter implied by an Ibis predicate, None if unsupported."""
+    if isinstance(predicate, (ops.And, ops.Or)):
+        return _to_arrow_filter(
+            type(predicate), (predicate.left, predicate.right), table
+        )
+    elif type(predicate) in _COMPARISONS:
+        left, right = predicate.left, predicate.right
+        compare = _COMPARISONS[type(predicate)]
+        if _is_column_of(right, table) and isinstance(left, ops.Literal):
+            # Swap the operands: literal < column becomes column > literal.
+            left, right = right, left
+            compare = {
+                operator.gt: operator.lt,
+                operator.ge: operator.le,
+                operator.lt: operator.gt,
+                operator.le: operator.ge,
+            }.get(compare, compare)
+        if _is_column_of(left, table) and _is_literal(right):
+            return compare(pyarrow.dataset.field(left.name), right.value)
+    elif isinstance(predicate, ops.Between):
+        if (
+            _is_column_of(predicate.arg, table)
+            and _is_literal(predicate.lower_bound)
+            and _is_literal(predicate.upper_bound)
+        ):
+            field = pyarrow.dataset.field(predicate.arg.name)
+            return (field >= predicate.lower_bound.value) & (
+                field <= predicate.upper_bound.value
+            )
+    elif isinstance(predicate, ops.Contains):
+        if (
+            _is_column_of(predicate.value, table)
+            and isinstance(predicate.options, tuple)
+            and all(_is_literal(option) for option in predicate.options)
+        ):
+            return pyarrow.dataset.field(predicate.value.name).isin(
+                [option.value for option in predicate.options]
+            )
+    elif isinstance(predicate, ops.NotNull):
+        if _is_column_of(predicate.arg, table):
+            # pandas treats NaN as null.
+            return ~pyarrow.dataset.field(predicate.arg.name).is_null(nan_is_null=True)
+    return None
+
+
+def _is_column_of(node: ops.Node, table: ops.DatabaseTable) -> bool:
+    return isinstance(node, ops.TableColumn) and node.table == table
+
+
+def _is_literal(node: ops.Node) -> bool:
+    return isinstance(node, ops.Literal) and node.value is not None
+
+
+def _read_dataset(dataset: pyarrow.dataset.Dataset, columns: list, arrow_filter):
+    """Read the columns of the rows matching the filter into a DataFrame."""
+    if arrow_filter is not None:
+        try:
+            return dataset.to_table(columns=columns, filter=arrow_filter).to_pandas()
+        except (pyarrow.ArrowException, TypeError, ValueError) as e:
+            # For example a literal that cannot be compared with the column type.
+            logging.debug("Unable to push filter %s into scan: %s", arrow_filter, e)
+    return dataset.to_table(columns=columns).to_pandas()
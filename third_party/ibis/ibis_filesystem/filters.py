@@ -0,0 +1,126 @@
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Translate custom SQL filters, as given to --filters, into Ibis predicates.
+
+The pandas backend cannot execute SQL, so the filters of FileSystem tables are
+parsed with sqlglot and rebuilt as Ibis expressions. The rebuilt predicates are
+executed by pandas and can be pushed into dataset scans, for example to prune
+Hive partition directories.
+"""
+import operator
+
+import ibis
+import ibis.expr.types as ir
+import sqlglot
+from sqlglot import exp
+
+_COMPARISONS = {
+    exp.EQ: operator.eq,
+    exp.NEQ: operator.ne,
+    exp.GT: operator.gt,
+    exp.GTE: operator.ge,
+    exp.LT: operator.lt,
+    exp.LTE: operator.le,
+}
+
+_TEMPORAL_LITERALS = {
+    exp.DataType.Type.DATE: ibis.date,
+    exp.DataType.Type.DATETIME: ibis.timestamp,
+    exp.DataType.Type.TIMESTAMP: ibis.timestamp,
+}
+
+
+def to_ibis_predicate(table: ir.Table, sql: str) -> ir.BooleanValue:
+    """Return the Ibis predicate of a SQL condition on the columns of table."""
+    try:
+        condition = sqlglot.condition(sql)
+    except sqlglot.errors.ParseError as e:
+        raise ValueError(f"Unable to parse filter: {sql}") from e
+    return _translate(table, condition, sql)
+
+
+def _translate(table: ir.Table, node: exp.Expression, sql: str):
+    if isinstance(node, exp.Paren):
+        return _translate(table, node.this, sql)
+    elif isinstance(node, exp.And):
+        return _translate(table, node.this, sql) & _translate(
+            table, node.expression, sql
+        )
+    elif isinstance(node, exp.Or):
+        return _translate(table, node.this, sql) | _translate(
+            table, node.expression, sql
+        )
+    elif isinstance(node, exp.Not):
+        if isinstance(node.this, exp.Is):
+            return _translate(table, node.this.this, sql).notnull()
+        return ~_translate(table, node.this, sql)
+    elif type(node) in _COMPARISONS:
+        return _COMPARISONS[type(node)](
+            _translate(table, node.this, sql),
+            _translate(table, node.expression, sql),
+        )
+    elif isinstance(node, exp.Is) and isinstance(node.expression, exp.Null):
+        return _translate(table, node.this, sql).isnull()
+    elif isinstance(node, exp.In):
+        return _translate(table, node.this, sql).isin(
+            [_translate(table, value, sql) for value in node.expressions]
+        )
+    elif isinstance(node, exp.Between):
+        return _translate(table, node.this, sql).between(
+            _translate(table, node.args["low"], sql),
+            _translate(table, node.args["high"], sql),
+        )
+    elif isinstance(node, exp.Like):
+        return _translate(table, node.this, sql).like(
+            _translate(table, node.expression, sql)
+        )
+    elif isinstance(node, exp.Column):
+        return table[_get_column_name(table, node.name, sql)]
+    elif isinstance(node, exp.Literal):
+        if node.is_string:
+            return ibis.literal(node.this)
+        return ibis.literal(_to_number(node.this))
+    elif (
+        isinstance(node, exp.Neg)
+        and isinstance(node.this, exp.Literal)
+        and not node.this.is_string
+    ):
+        # Kept a literal, rather than a negation, so it can be pushed down.
+        return ibis.literal(-_to_number(node.this.this))
+    elif isinstance(node, exp.Boolean):
+        return ibis.literal(node.this)
+    elif (
+        isinstance(node, exp.Cast)
+        and isinstance(node.this, exp.Literal)
+        and node.to.this in _TEMPORAL_LITERALS
+    ):
+        return _TEMPORAL_LITERALS[node.to.this](node.this.this)
+    raise ValueError(f"Unsupported expression {node.sql()} in filter: {sql}")
+
+
+def _to_number(text: str):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _get_column_name(table: ir.Table, name: str, sql: str) -> str:
+    """Return the column matching name, case insensitively if not found as is."""
+    if name in table.columns:
+        return name
+    matches = [column for column in table.columns if column.lower() == name.lower()]
+    if len(matches) != 1:
+        raise ValueError(f"Unknown column {name} in filter: {sql}")
+    return matches[0]